@@ -1,8 +1,33 @@
 """Lightweight scraping toolkit for external master rankings."""
 
-from .html_adapter import HtmlTableAdapter
-from .models import LeaderboardPayload, RankingEntry
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .html_adapter import HtmlTableAdapter
+    from .models import LeaderboardPayload, RankingEntry
+
+# Public names resolved on first access, so importing the package (or running
+# a CLI with --help) does not pay for parser or HTTP dependencies up front.
+_LAZY_EXPORTS = {
+    "HtmlTableAdapter": ".html_adapter",
+    "LeaderboardPayload": ".models",
+    "RankingEntry": ".models",
+}
 
 __all__ = ["HtmlTableAdapter", "LeaderboardPayload", "RankingEntry"]
 
 
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted([*globals(), *_LAZY_EXPORTS])
+
+
@@ -0,0 +1 @@
+# Benchmarks for rankings_scraper hot paths (run as modules, not collected by pytest).
@@ -0,0 +1,95 @@
+"""
+Measure batch scrape throughput offline against a replayed cassette.
+
+Builds a cassette of synthetic ranking pages spread over a few hosts,
+serves it from a local `ReplayServer` with the given latency, error rate
+and bandwidth cap, and runs `run_batch` over it once per --workers value.
+Pass --cassette to replay a recorded cassette instead (one config per URL).
+
+Usage:
+    PYTHONPATH=. python3 -m scripts.rankings_scraper.benchmarks.fetch --pages 40 --latency 0.05 --workers 1 4 8
+    PYTHONPATH=. python3 -m scripts.rankings_scraper.benchmarks.fetch --cassette cassettes/ft-2025 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+from ..http_client import build_session
+from ..main import ScrapeConfig, run_batch
+from ..replay import Cassette, ReplayServer
+from .suite import synthetic_html
+
+
+def synthetic_cassette(directory: Path, pages: int, rows: int, hosts: int = 4) -> List[str]:
+    """Fill a cassette with `pages` ranking pages over `hosts` hosts; returns their URLs."""
+    cassette = Cassette(directory)
+    urls = []
+    for index in range(pages):
+        url = f"https://ranking-{index % hosts}.example.com/ranking/{index}"
+        cassette.add(
+            url,
+            synthetic_html(rows, seed=index).encode("utf-8"),
+            headers={"Content-Type": "text/html; charset=utf-8", "ETag": f'"page-{index}"'},
+        )
+        urls.append(url)
+    return urls
+
+
+def _configs(urls: Sequence[str], output_dir: Path) -> List[ScrapeConfig]:
+    return [
+        ScrapeConfig(
+            url=url,
+            master_type="mim",
+            year=2025,
+            source="Benchmark",
+            category="Master in Management",
+            output_path=str(output_dir / f"page-{index}.json"),
+        )
+        for index, url in enumerate(urls)
+    ]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark batch scraping against a local replay server.")
+    parser.add_argument("--cassette", default=None, help="Recorded cassette to replay (default: synthetic pages).")
+    parser.add_argument("--pages", type=int, default=40, help="Synthetic pages (default: 40).")
+    parser.add_argument("--rows", type=int, default=200, help="Rows per synthetic page (default: 200).")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds added to every response (default: 0.05).")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered 503 (default: 0).")
+    parser.add_argument("--bandwidth-kb", type=float, default=None, help="Per-response KB/s cap (default: unlimited).")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8], help="Worker counts to compare.")
+    parser.add_argument("--per-host", type=int, default=2, help="Concurrent scrapes per host (default: 2).")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmpdir = Path(tmp)
+        if args.cassette:
+            cassette = Cassette(Path(args.cassette))
+            urls = cassette.urls()
+        else:
+            urls = synthetic_cassette(tmpdir / "cassette", args.pages, args.rows)
+            cassette = Cassette(tmpdir / "cassette")
+        configs = _configs(urls, tmpdir / "out")
+        print(f"{len(urls)} pages, latency {args.latency * 1000:.0f} ms, error rate {args.error_rate:.0%}")
+        for workers in args.workers:
+            bandwidth = int(args.bandwidth_kb * 1024) if args.bandwidth_kb else None
+            with ReplayServer(cassette, latency=args.latency, error_rate=args.error_rate, bandwidth=bandwidth) as server:
+                with build_session(pool_connections=workers, pool_maxsize=args.per_host, backoff_factor=0.0) as session:
+                    server.attach(session)
+                    started = time.perf_counter()
+                    results = run_batch(configs, timeout=10.0, workers=workers, per_host=args.per_host, session=session)
+                    elapsed = time.perf_counter() - started
+            failed = sum(1 for result in results if not result.ok)
+            print(
+                f"workers={workers:<3} {elapsed:7.2f} s  {len(results) / elapsed:7.1f} pages/s  "
+                f"{failed} failed  ({server.summary()})"
+            )
+
+
+if __name__ == "__main__":
+    main()
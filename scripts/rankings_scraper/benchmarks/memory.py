@@ -0,0 +1,98 @@
+"""
+Compare the memory held by leaderboards as entry lists vs column-oriented containers.
+
+Usage:
+    PYTHONPATH=. python3 -m scripts.rankings_scraper.benchmarks.memory --rows 5000 --boards 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from ..columnar import ColumnarLeaderboard
+from ..models import LeaderboardPayload, RankingEntry
+
+COUNTRIES = ["France", "United Kingdom", "Spain", "Germany", "Italy", "Switzerland", "Netherlands", "China"]
+CITIES = ["Paris", "London", "Madrid", "Berlin", "Milan", "St Gallen", "Rotterdam", "Shanghai"]
+
+
+@dataclass
+class _DictEntry:
+    """RankingEntry as it was before slots: one __dict__ per instance."""
+
+    rank: int
+    school_name: str
+    program_name: Optional[str] = None
+    country: Optional[str] = None
+    city: Optional[str] = None
+    score: Optional[float] = None
+    notes: Optional[str] = None
+    link: Optional[str] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+def _rows(rows: int, board: int) -> List[Dict[str, Any]]:
+    # Strings are rebuilt per row, like parser output, so duplicates are distinct objects.
+    return [
+        {
+            "rank": index + 1,
+            "school_name": f"Business School {board}-{index}",
+            "program_name": "".join(["Master in ", "Management"]),
+            "country": "".join(COUNTRIES[index % len(COUNTRIES)]),
+            "city": "".join(CITIES[index % len(CITIES)]),
+            "score": 100.0 - index / rows,
+            "link": f"https://example.com/schools/{board}/{index}",
+        }
+        for index in range(rows)
+    ]
+
+
+def _payload(entry_cls: Callable[..., Any], rows: int, board: int) -> LeaderboardPayload:
+    return LeaderboardPayload(
+        master_type="mim",
+        source="Financial Times",
+        category="Master in Management",
+        year=2000 + board,
+        source_url="https://rankings.ft.com",
+        entries=[entry_cls(**row) for row in _rows(rows, board)],
+    )
+
+
+def _retained(build: Callable[[], Any]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    value = build()
+    gc.collect()
+    size, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del value
+    return size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark leaderboard memory footprint.")
+    parser.add_argument("--rows", type=int, default=5000, help="Entries per leaderboard.")
+    parser.add_argument("--boards", type=int, default=20, help="Leaderboards held at once.")
+    args = parser.parse_args()
+
+    variants = {
+        "dataclass entries (__dict__)": lambda: [_payload(_DictEntry, args.rows, b) for b in range(args.boards)],
+        "slotted RankingEntry": lambda: [_payload(RankingEntry, args.rows, b) for b in range(args.boards)],
+        "ColumnarLeaderboard": lambda: [
+            ColumnarLeaderboard.from_payload(_payload(RankingEntry, args.rows, b)) for b in range(args.boards)
+        ],
+    }
+    baseline = None
+    print(f"{args.boards} leaderboards x {args.rows} rows")
+    for label, build in variants.items():
+        size = _retained(build)
+        baseline = baseline or size
+        print(f"{label:30s}: {size / (1024 * 1024):8.1f} MB  ({size / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
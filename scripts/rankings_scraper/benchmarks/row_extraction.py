@@ -0,0 +1,36 @@
+"""
+Compare the single-pass html.parser engine with the BeautifulSoup tree backend.
+
+Usage:
+    PYTHONPATH=. python3 -m scripts.rankings_scraper.benchmarks.row_extraction --rows 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from ..html_adapter import HtmlTableAdapter
+from .table_parsing import _best_of, build_page
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark row extraction in HtmlTableAdapter._parse_table.")
+    parser.add_argument("--rows", type=int, default=5000, help="Ranking rows in the synthetic table.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per backend; the best time is reported.")
+    args = parser.parse_args()
+
+    html = build_page(args.rows, noise_kb=0)
+    tree = HtmlTableAdapter(parser="bs4")
+    engine = HtmlTableAdapter(parser="html.parser")
+    if tree._parse_table(html) != engine._parse_table(html):
+        raise SystemExit("single-pass engine returned different entries")
+
+    tree_s = _best_of(lambda: tree._parse_table(html), args.repeat)
+    engine_s = _best_of(lambda: engine._parse_table(html), args.repeat)
+    print(f"{args.rows} rows")
+    print(f"bs4 tree + per-cell queries: {tree_s * 1000:8.1f} ms")
+    print(f"single-pass engine         : {engine_s * 1000:8.1f} ms  ({tree_s / engine_s:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
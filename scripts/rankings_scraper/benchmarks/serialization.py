@@ -0,0 +1,68 @@
+"""
+Compare json.dumps(payload.to_dict()) with the streaming payload encoder.
+
+Usage:
+    PYTHONPATH=. python3 -m scripts.rankings_scraper.benchmarks.serialization --rows 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Callable
+
+from ..models import LeaderboardPayload, RankingEntry
+from ..serialization import orjson, payload_json
+
+
+def _best_of(fn: Callable[[], str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark leaderboard JSON serialization.")
+    parser.add_argument("--rows", type=int, default=200_000, help="Entries in the synthetic leaderboard.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per encoder; the best time is reported.")
+    args = parser.parse_args()
+
+    payload = LeaderboardPayload(
+        master_type="mim",
+        source="Financial Times",
+        category="Master in Management",
+        year=2024,
+        source_url="https://rankings.ft.com",
+        entries=[
+            RankingEntry(
+                rank=index + 1,
+                school_name=f"Business School {index}",
+                program_name="Master in Management",
+                country="France",
+                city="Paris",
+                score=100.0 - index / args.rows,
+                link=f"https://example.com/schools/{index}",
+            )
+            for index in range(args.rows)
+        ],
+    )
+    expected = json.dumps(payload.to_dict(), indent=2, ensure_ascii=False)
+    if payload_json(payload) != expected or payload_json(payload, accelerated=False) != expected:
+        raise SystemExit("streaming encoder output differs from json.dumps")
+
+    baseline = _best_of(lambda: json.dumps(payload.to_dict(), indent=2, ensure_ascii=False), args.repeat)
+    stdlib = _best_of(lambda: payload_json(payload, accelerated=False), args.repeat)
+    print(f"{args.rows} entries")
+    print(f"json.dumps(to_dict())  : {baseline * 1000:8.1f} ms")
+    print(f"streaming, stdlib      : {stdlib * 1000:8.1f} ms  ({baseline / stdlib:.1f}x faster)")
+    if orjson is not None:
+        accelerated = _best_of(lambda: payload_json(payload), args.repeat)
+        print(f"streaming, orjson      : {accelerated * 1000:8.1f} ms  ({baseline / accelerated:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,393 @@
+"""
+Benchmark suite for the parse, validate and serialise hot paths.
+
+Generates synthetic HTML tables and XLSX workbooks (varied headers, links,
+messy whitespace), times each stage separately (best of --repeat) and
+records its peak traced memory. Results are written as JSON; `compare`
+flags cases that got slower or hungrier between two result files.
+
+Usage:
+    PYTHONPATH=. python3 -m scripts.rankings_scraper.benchmarks.suite run --rows 100 10000 200000 --output base.json
+    PYTHONPATH=. python3 -m scripts.rankings_scraper.benchmarks.suite compare base.json head.json --threshold 0.15
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import gc
+import json
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import zipfile
+from datetime import datetime, timezone
+from html import escape
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from xml.sax.saxutils import escape as xml_escape
+
+from .. import ft_xlsx_converter
+from ..html_adapter import HtmlTableAdapter
+from ..models import LeaderboardPayload, RankingEntry
+from ..serialization import payload_json
+
+DEFAULT_ROWS = (100, 10_000, 200_000)
+# openpyxl's full-mode load needs several GB at 200k rows; _parse_rows is only timed up to this size.
+DEFAULT_MAX_OPENPYXL_ROWS = 10_000
+
+HEADER_VARIANTS: Dict[str, Sequence[str]] = {
+    "rank": ("Rank", "Rank 2024", "#", "Position"),
+    "school_name": ("School", "Business school", "Institution name", "University"),
+    "program_name": ("Programme", "Program name", "Degree", "Course"),
+    "country": ("Country", "Location"),
+    "city": ("City", "Campus"),
+    "score": ("Score", "Index points", "Points"),
+    "link": ("Website", "URL", "Link"),
+}
+COUNTRIES = ("France", "United Kingdom", "Spain", "Germany", "Italy", "Switzerland", "China", "Côte d'Ivoire")
+CITIES = ("Paris", "London", "Madrid", "Berlin", "Milan", "St Gallen", "Shanghai", "Abidjan")
+PROGRAMMES = ("Master in Management", "MSc in Finance", "Grande École", "MiM")
+
+
+def _messy(rng: random.Random, text: str) -> str:
+    """Surround and split text with the whitespace noise ranking pages carry."""
+    pads = ("", " ", "  ", "\n    ", "\t", " ")
+    words = text.split(" ")
+    return rng.choice(pads) + "".join(word + rng.choice((" ", "  ", "\n ", " \t")) for word in words).rstrip() + rng.choice(pads)
+
+
+def synthetic_rows(rows: int, seed: int = 0) -> Tuple[List[Tuple[str, str]], List[Dict[str, Any]]]:
+    """(field, header) columns, one header variant per field in shuffled order, and row records."""
+    rng = random.Random(seed)
+    fields = list(HEADER_VARIANTS)
+    rng.shuffle(fields)
+    fields.remove("rank")
+    fields.insert(0, "rank")
+    headers = [rng.choice(HEADER_VARIANTS[field]) for field in fields]
+    records: List[Dict[str, Any]] = []
+    for index in range(rows):
+        rank = index + 1
+        tie = rng.random() < 0.05
+        records.append(
+            {
+                "rank": f"{rank} (tie)" if tie else str(rank),
+                "school_name": _messy(rng, f"Business School {rank} {rng.choice(CITIES)}"),
+                "school_href": f"https://school{rank}.example.com/programme?id={rank}&lang=en" if rng.random() < 0.6 else None,
+                "program_name": _messy(rng, rng.choice(PROGRAMMES)),
+                "country": rng.choice(COUNTRIES),
+                "city": _messy(rng, rng.choice(CITIES)),
+                "score": f"{100 - index / max(rows, 1) * 60:.1f}".replace(".", "," if rng.random() < 0.1 else "."),
+                "link": f"https://example.com/rankings/{rank}" if rng.random() < 0.8 else "",
+            }
+        )
+    return list(zip(fields, headers)), records
+
+
+def synthetic_html(rows: int, seed: int = 0) -> str:
+    columns, records = synthetic_rows(rows, seed)
+    head = "".join(f"<th>{escape(header)}</th>" for _field, header in columns)
+    body: List[str] = []
+    for record in records:
+        cells: List[str] = []
+        for field, _header in columns:
+            value = escape(record[field])
+            if field == "school_name" and record["school_href"]:
+                value = f'<a href="{escape(record["school_href"])}"><span>{value}</span></a>'
+            elif field == "link" and record["link"]:
+                value = f'<a href="{escape(record["link"])}">Visit</a>'
+            cells.append(f"<td>{value}</td>")
+        body.append("<tr>" + "".join(cells) + "</tr>\n")
+    return (
+        "<html><head><title>Ranking</title><script>var x = '<table><th>fake</th></table>';</script></head><body>"
+        f"<table><thead><tr>{head}</tr></thead><tbody>\n{''.join(body)}</tbody></table></body></html>"
+    )
+
+
+_SHEET_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"><sheetData>'
+)
+_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_DOC_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
+
+def _column_letter(index: int) -> str:
+    letters = ""
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def synthetic_xlsx(rows: int, path: Path, seed: int = 0) -> Path:
+    """
+    Write an FT-like workbook (title row, header row, data) straight as XML.
+
+    openpyxl's write-only mode cannot store hyperlinks and its normal mode is
+    too slow at 200k rows, so the parts are emitted directly.
+    """
+    columns, records = synthetic_rows(rows, seed)
+    sheet: List[str] = [_SHEET_HEAD]
+
+    def inline(ref: str, text: str) -> str:
+        return f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{xml_escape(text)}</t></is></c>'
+
+    sheet.append(f'<row r="1">{inline("A1", "Financial Times ranking export")}</row>')
+    sheet.append('<row r="2">' + "".join(inline(f"{_column_letter(i + 1)}2", h) for i, (_f, h) in enumerate(columns)) + "</row>")
+    links: List[Tuple[str, str]] = []
+    for offset, record in enumerate(records):
+        row_number = offset + 3
+        cells: List[str] = []
+        for index, (field, _header) in enumerate(columns):
+            ref = f"{_column_letter(index + 1)}{row_number}"
+            value = record[field]
+            if field == "rank" and value.isdigit():
+                cells.append(f'<c r="{ref}"><v>{value}</v></c>')
+                continue
+            if field == "school_name" and record["school_href"]:
+                links.append((ref, record["school_href"]))
+            if value:
+                cells.append(inline(ref, value))
+        sheet.append(f'<row r="{row_number}">' + "".join(cells) + "</row>")
+    sheet.append("</sheetData>")
+    if links:
+        sheet.append("<hyperlinks>")
+        sheet.extend(f'<hyperlink ref="{ref}" r:id="rId{i + 1}"/>' for i, (ref, _target) in enumerate(links))
+        sheet.append("</hyperlinks>")
+    sheet.append("</worksheet>")
+    sheet_rels = "".join(
+        f'<Relationship Id="rId{i + 1}" Type="{_DOC_REL}/hyperlink" Target="{xml_escape(target)}" TargetMode="External"/>'
+        for i, (_ref, target) in enumerate(links)
+    )
+
+    parts = {
+        "[Content_Types].xml": (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/worksheets/sheet1.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            "</Types>"
+        ),
+        "_rels/.rels": (
+            f'<Relationships xmlns="{_REL_NS}">'
+            f'<Relationship Id="rId1" Type="{_DOC_REL}/officeDocument" Target="xl/workbook.xml"/></Relationships>'
+        ),
+        "xl/workbook.xml": (
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            f'xmlns:r="{_DOC_REL}"><sheets><sheet name="Ranking" sheetId="1" r:id="rId1"/></sheets></workbook>'
+        ),
+        "xl/_rels/workbook.xml.rels": (
+            f'<Relationships xmlns="{_REL_NS}">'
+            f'<Relationship Id="rId1" Type="{_DOC_REL}/worksheet" Target="worksheets/sheet1.xml"/></Relationships>'
+        ),
+        "xl/worksheets/sheet1.xml": "".join(sheet),
+        "xl/worksheets/_rels/sheet1.xml.rels": f'<Relationships xmlns="{_REL_NS}">{sheet_rels}</Relationships>',
+    }
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, content in parts.items():
+            archive.writestr(name, content)
+    return path
+
+
+def _measure(fn: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Best wall time over `repeat` runs, then peak traced memory over one extra run."""
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": best, "peak_bytes": peak}
+
+
+def _payload(entries: List[RankingEntry]) -> LeaderboardPayload:
+    return LeaderboardPayload(
+        master_type="mim",
+        source="Financial Times",
+        category="Master in Management",
+        year=2024,
+        source_url="https://rankings.ft.com",
+        entries=entries,
+        scraped_at="2024-01-01T00:00:00Z",
+    )
+
+
+def run_suite(
+    rows: Sequence[int] = DEFAULT_ROWS,
+    *,
+    repeat: int = 3,
+    max_openpyxl_rows: int = DEFAULT_MAX_OPENPYXL_ROWS,
+    only: Optional[Sequence[str]] = None,
+    log: Callable[[str], None] = print,
+) -> Dict[str, Any]:
+    """Run every case at every size; returns the results document written by `run`."""
+    adapter = HtmlTableAdapter()
+    results: Dict[str, Dict[str, float]] = {}
+
+    def record(case: str, size: int, fn: Callable[[], Any]) -> None:
+        if only and not any(case.startswith(prefix) for prefix in only):
+            return
+        key = f"{case}/{size}"
+        results[key] = _measure(fn, repeat)
+        log(f"{key:38s} {results[key]['seconds'] * 1000:10.1f} ms {results[key]['peak_bytes'] / 1024 / 1024:9.1f} MB")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in rows:
+            html = synthetic_html(size)
+            record("html_parse_table", size, functools.partial(adapter._parse_table, html))
+            entries = adapter._parse_table(html)
+            del html
+
+            workbook = synthetic_xlsx(size, Path(tmp) / f"ranking-{size}.xlsx")
+            record(
+                "xlsx_read_entries",
+                size,
+                lambda: ft_xlsx_converter._read_entries(workbook, ft_xlsx_converter.HEADER_INDEX),
+            )
+            if size <= max_openpyxl_rows and (not only or any("xlsx_parse_rows".startswith(p) for p in only)):
+                from openpyxl import load_workbook
+
+                ws = load_workbook(workbook).active
+                header_map = ft_xlsx_converter.HEADER_INDEX.build_header_map([str(cell.value) for cell in ws[2]])
+                record("xlsx_parse_rows", size, functools.partial(ft_xlsx_converter._parse_rows, ws, 2, header_map))
+                del ws
+
+            payload = _payload(entries)
+            record("validate", size, payload.validate)
+            record(
+                "serialize_json_dumps",
+                size,
+                lambda payload=payload: json.dumps(payload.to_dict(), indent=2, ensure_ascii=False),
+            )
+            record("serialize_stream", size, functools.partial(payload_json, payload))
+            del payload, entries
+
+    return {"meta": _environment(repeat), "results": results}
+
+
+def _environment(repeat: int) -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "commit": commit,
+        "repeat": repeat,
+    }
+
+
+def compare_results(
+    base: Dict[str, Any],
+    head: Dict[str, Any],
+    *,
+    threshold: float = 0.15,
+    memory_threshold: float = 0.15,
+    min_seconds: float = 0.001,
+) -> List[Dict[str, Any]]:
+    """
+    Pair the cases present in both documents and flag regressions.
+
+    A case regresses when it is more than `threshold` slower (and slower by
+    at least `min_seconds`, to ignore timer noise on tiny inputs) or uses
+    more than `memory_threshold` extra peak memory.
+    """
+    rows: List[Dict[str, Any]] = []
+    for key in sorted(set(base["results"]) & set(head["results"]), key=_case_order):
+        old, new = base["results"][key], head["results"][key]
+        time_ratio = new["seconds"] / old["seconds"] if old["seconds"] else 1.0
+        memory_ratio = new["peak_bytes"] / old["peak_bytes"] if old["peak_bytes"] else 1.0
+        slower = time_ratio > 1 + threshold and new["seconds"] - old["seconds"] >= min_seconds
+        hungrier = memory_ratio > 1 + memory_threshold
+        rows.append(
+            {
+                "case": key,
+                "base_seconds": old["seconds"],
+                "head_seconds": new["seconds"],
+                "time_ratio": time_ratio,
+                "memory_ratio": memory_ratio,
+                "regression": slower or hungrier,
+            }
+        )
+    return rows
+
+
+def _case_order(key: str) -> Tuple[str, int]:
+    case, _, size = key.rpartition("/")
+    return case, int(size) if size.isdigit() else 0
+
+
+def _print_comparison(rows: Sequence[Dict[str, Any]]) -> None:
+    print(f"{'CASE':38s} {'BASE ms':>10s} {'HEAD ms':>10s} {'TIME':>7s} {'MEMORY':>7s}")
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(
+            f"{row['case']:38s} {row['base_seconds'] * 1000:10.1f} {row['head_seconds'] * 1000:10.1f} "
+            f"{row['time_ratio']:6.2f}x {row['memory_ratio']:6.2f}x{flag}"
+        )
+    regressions = sum(1 for row in rows if row["regression"])
+    print(f"{len(rows)} cases compared, {regressions} regressions")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark parse, validate and serialise hot paths.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run the suite and write results to JSON.")
+    run.add_argument("--rows", type=int, nargs="+", default=list(DEFAULT_ROWS), help="Table sizes to generate.")
+    run.add_argument("--repeat", type=int, default=3, help="Timed runs per case; the best time is kept.")
+    run.add_argument(
+        "--max-openpyxl-rows",
+        type=int,
+        default=DEFAULT_MAX_OPENPYXL_ROWS,
+        help="Largest size for which the openpyxl _parse_rows path is timed.",
+    )
+    run.add_argument("--only", nargs="+", default=None, help="Case name prefixes to run (e.g. html_ serialize_).")
+    run.add_argument("--output", default="benchmark-results.json", help="Where to write the results JSON.")
+
+    compare = commands.add_parser("compare", help="Compare two result files and flag regressions.")
+    compare.add_argument("base", help="Baseline results JSON.")
+    compare.add_argument("head", help="New results JSON.")
+    compare.add_argument("--threshold", type=float, default=0.15, help="Allowed slowdown ratio (default: 0.15).")
+    compare.add_argument(
+        "--memory-threshold", type=float, default=0.15, help="Allowed peak memory growth ratio (default: 0.15)."
+    )
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        document = run_suite(args.rows, repeat=args.repeat, max_openpyxl_rows=args.max_openpyxl_rows, only=args.only)
+        Path(args.output).write_text(json.dumps(document, indent=2), encoding="utf-8")
+        print(f"Wrote {args.output}")
+        return
+
+    base = json.loads(Path(args.base).read_text(encoding="utf-8"))
+    head = json.loads(Path(args.head).read_text(encoding="utf-8"))
+    rows = compare_results(base, head, threshold=args.threshold, memory_threshold=args.memory_threshold)
+    _print_comparison(rows)
+    if any(row["regression"] for row in rows):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Compare full-page and table-only parsing in HtmlTableAdapter._parse_table.
+
+Usage:
+    PYTHONPATH=. python3 -m scripts.rankings_scraper.benchmarks.table_parsing --rows 200 --noise-kb 400
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Callable, List
+
+from ..html_adapter import HtmlTableAdapter
+from ..models import RankingEntry
+
+
+def build_page(rows: int, noise_kb: int) -> str:
+    """Synthetic ranking page: nav, inline scripts and footer around one table."""
+    block = (
+        '<div class="nav"><ul>' + "".join(f'<li><a href="/section/{i}">Section {i}</a></li>' for i in range(20)) + "</ul></div>"
+        '<script>var cfg = {"tpl": "<table><th>fake</th></table>"};</script>'
+        "<!-- <table><th>commented</th></table> -->"
+        '<p class="teaser">Lorem ipsum dolor sit amet, <b>consectetur</b> adipiscing elit.</p>'
+    )
+    repeats = max(1, (noise_kb * 1024 // 2) // len(block))
+    noise = block * repeats
+    body_rows = "".join(
+        f'<tr><td>{rank}</td><td><a href="https://school{rank}.example.com">School {rank}</a></td>'
+        f"<td>Master in Management</td><td>France</td><td>{100 - rank / 10:.1f}</td></tr>"
+        for rank in range(1, rows + 1)
+    )
+    table = (
+        "<table><thead><tr><th>Rank</th><th>School</th><th>Program</th><th>Country</th><th>Score</th></tr></thead>"
+        f"<tbody>{body_rows}</tbody></table>"
+    )
+    return f"<html><head><title>Ranking</title></head><body>{noise}{table}<footer>{noise}</footer></body></html>"
+
+
+def _best_of(fn: Callable[[], List[RankingEntry]], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark table-only vs full-page HTML parsing.")
+    parser.add_argument("--rows", type=int, default=200, help="Ranking rows in the synthetic table.")
+    parser.add_argument("--noise-kb", type=int, default=400, help="Approximate size of non-table markup in KB.")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per mode; the best time is reported.")
+    args = parser.parse_args()
+
+    html = build_page(args.rows, args.noise_kb)
+    full = HtmlTableAdapter(table_only=False)
+    partial = HtmlTableAdapter(table_only=True)
+    if full._parse_table(html) != partial._parse_table(html):
+        raise SystemExit("table-only parsing returned different entries")
+
+    full_s = _best_of(lambda: full._parse_table(html), args.repeat)
+    partial_s = _best_of(lambda: partial._parse_table(html), args.repeat)
+    print(f"page: {len(html) / 1024:.0f} KB, {args.rows} rows")
+    print(f"full page : {full_s * 1000:8.1f} ms")
+    print(f"table only: {partial_s * 1000:8.1f} ms  ({full_s / partial_s:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
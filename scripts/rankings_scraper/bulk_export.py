@@ -0,0 +1,237 @@
+r"""
+Pre-resolved bulk-load bundle for PostgreSQL.
+
+`apps/api/src/scripts/ingest-rankings.ts` resolves every entry with
+`school.findFirst`, `program.findFirst` and a `findUnique` loop for program
+slugs: hundreds of round trips per leaderboard. This module does that
+resolution once, in memory: leaderboards, schools and programs are
+deduplicated, slugs are computed with the same rules as the TS `slugify`
+and `uniqueProgramSlug`, and entries reference schools and programs by
+their natural keys.
+
+The bundle is four CSV files in the PostgreSQL COPY layout (header row,
+NULL as an unquoted empty field, arrays as `{"a","b"}` literals):
+
+    leaderboards.csv  slug, name, source, category, region, year, url, description
+    schools.csv       name, country, city, website
+    programs.csv      school_name, name, slug_base, slug, type, domain, description, campuses
+    entries.csv       leaderboard_slug, rank, score, notes, school_name, program_name
+
+They stage with one statement each, e.g.
+
+    \copy stage_entry (leaderboard_slug, rank, score, notes, school_name, program_name)
+        FROM 'entries.csv' WITH (FORMAT csv, HEADER true)
+
+Applying the staged rows to the Prisma tables is left to the caller: no
+SQL for that ships here, since none is exercised against a database.
+`ingest-rankings.ts` stays the supported ingest path.
+
+Usage:
+    PYTHONPATH=. python3 -m scripts.rankings_scraper.bulk_export data/rankings --out data/bulk
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .history import leaderboard_files
+from .models import RankingEntry, load_leaderboard
+
+LEADERBOARD_COLUMNS = ("slug", "name", "source", "category", "region", "year", "url", "description")
+SCHOOL_COLUMNS = ("name", "country", "city", "website")
+PROGRAM_COLUMNS = ("school_name", "name", "slug_base", "slug", "type", "domain", "description", "campuses")
+ENTRY_COLUMNS = ("leaderboard_slug", "rank", "score", "notes", "school_name", "program_name")
+
+_COMBINING_RE = re.compile("[\u0300-\u036f]")
+_NON_SLUG_RE = re.compile("[^a-z0-9]+")
+_EDGE_DASH_RE = re.compile("(^-|-$)")
+
+
+def slugify(value: str) -> str:
+    """
+    Same slug as the TS `slugify` in ingest-rankings.ts.
+
+    Example:
+        slugify("Master in Management-mim") == "master-in-management-mim"
+    """
+    text = _COMBINING_RE.sub("", unicodedata.normalize("NFD", value)).lower()
+    return _EDGE_DASH_RE.sub("", _NON_SLUG_RE.sub("-", text))
+
+
+def program_type(master_type: str) -> str:
+    """`ProgramType` enum value for a master type, as `programTypeFrom` in ingest-rankings.ts."""
+    normalized = master_type.strip().lower()
+    if "mba" in normalized and "executive" in normalized:
+        return "emba"
+    if normalized == "mba":
+        return "mba"
+    if normalized in ("mim", "master in management", "pge"):
+        return "master"
+    if "finance" in normalized:
+        return "msc"
+    if "analytics" in normalized or "data" in normalized:
+        return "specialized_msc"
+    if "msc" in normalized:
+        return "msc"
+    return "other"
+
+
+def pg_array(values: Sequence[str]) -> str:
+    """PostgreSQL array literal (`{"Paris","Lyon"}`) for a COPY column."""
+    items = ('"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"' for value in values)
+    return "{" + ",".join(items) + "}"
+
+
+def _blank_to_none(value: Optional[str]) -> Optional[str]:
+    # Unquoted empty CSV fields load as NULL, like the optional fields the TS ingest leaves unset.
+    return value if value else None
+
+
+@dataclass
+class _Program:
+    school_name: str
+    name: str
+    slug_base: str
+    slug: str
+    type: str
+    domain: str
+    description: Optional[str]
+    campuses: List[str]
+
+
+@dataclass
+class BulkBundle:
+    """
+    Leaderboards, schools, programs and entries resolved for a set-based load.
+
+    Schools are keyed by exact name and programs by (school name, program
+    name), as the TS ingest looks them up; the first entry that mentions a
+    school or program supplies its details. Program slugs are unique within
+    the bundle (`base`, `base-1`, ...); slugs already taken in the database
+    are not known here and must be checked when loading. Adding a leaderboard
+    whose slug is already in the bundle replaces it, as re-ingesting does.
+
+    Example:
+        bundle = BulkBundle()
+        bundle.add(load_leaderboard(Path("data/rankings/ft-mim-2025.json")))
+        bundle.write(Path("data/bulk"))
+    """
+
+    leaderboards: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    schools: Dict[str, Dict[str, Optional[str]]] = field(default_factory=dict)
+    programs: Dict[Tuple[str, str], _Program] = field(default_factory=dict)
+    entries: Dict[str, List[Tuple[Any, ...]]] = field(default_factory=dict)
+    _slugs: Dict[str, int] = field(default_factory=dict, init=False, repr=False)
+    _taken: Set[str] = field(default_factory=set, init=False, repr=False)
+
+    def add(self, leaderboard: Any) -> int:
+        """Resolve a leaderboard (payload, columnar or stream); returns its entry count."""
+        slug = slugify(f"{leaderboard.source}-{leaderboard.category}-{leaderboard.year}-{leaderboard.master_type}")
+        self.leaderboards[slug] = {
+            "slug": slug,
+            "name": f"{leaderboard.category} - {leaderboard.source}",
+            "source": leaderboard.source,
+            "category": leaderboard.category,
+            "region": _blank_to_none(leaderboard.region),
+            "year": leaderboard.year,
+            "url": leaderboard.source_url,
+            "description": f"Scraped {leaderboard.master_type} {leaderboard.year}",
+        }
+        rows = []
+        for entry in leaderboard.entries:
+            self._resolve(entry, leaderboard.master_type, leaderboard.category)
+            rows.append(
+                (slug, entry.rank, entry.score, _blank_to_none(entry.notes), entry.school_name, _blank_to_none(entry.program_name))
+            )
+        self.entries[slug] = rows
+        return len(rows)
+
+    def _resolve(self, entry: RankingEntry, master_type: str, category: str) -> None:
+        if entry.school_name not in self.schools:
+            self.schools[entry.school_name] = {
+                "name": entry.school_name,
+                "country": _blank_to_none(entry.country),
+                "city": _blank_to_none(entry.city),
+                "website": _blank_to_none(entry.link),
+            }
+        if not entry.program_name or (entry.school_name, entry.program_name) in self.programs:
+            return
+        base = slugify(f"{entry.program_name}-{master_type}")
+        slug = base
+        suffix = self._slugs.get(base, 0)
+        while slug in self._taken:
+            suffix += 1
+            slug = f"{base}-{suffix}"
+        self._slugs[base] = suffix
+        self._taken.add(slug)
+        self.programs[(entry.school_name, entry.program_name)] = _Program(
+            school_name=entry.school_name,
+            name=entry.program_name,
+            slug_base=base,
+            slug=slug,
+            type=program_type(master_type),
+            domain=category,
+            description=_blank_to_none(entry.notes),
+            campuses=[entry.city] if entry.city else [],
+        )
+
+    def write(self, directory: Path) -> List[Path]:
+        """Write the four CSV files to `directory`; returns their paths."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        programs = (
+            (p.school_name, p.name, p.slug_base, p.slug, p.type, p.domain, p.description, pg_array(p.campuses))
+            for p in self.programs.values()
+        )
+        tables: Sequence[Tuple[str, Sequence[str], Iterable[Sequence[Any]]]] = (
+            ("leaderboards.csv", LEADERBOARD_COLUMNS, (tuple(row.values()) for row in self.leaderboards.values())),
+            ("schools.csv", SCHOOL_COLUMNS, (tuple(row.values()) for row in self.schools.values())),
+            ("programs.csv", PROGRAM_COLUMNS, programs),
+            ("entries.csv", ENTRY_COLUMNS, (row for rows in self.entries.values() for row in rows)),
+        )
+        written = []
+        for name, columns, rows in tables:
+            path = directory / name
+            with path.open("w", encoding="utf-8", newline="") as handle:
+                writer = csv.writer(handle, lineterminator="\n")
+                writer.writerow(columns)
+                writer.writerows(rows)
+            written.append(path)
+        return written
+
+    def summary(self) -> str:
+        return (
+            f"{len(self.leaderboards)} leaderboards, {len(self.schools)} schools, "
+            f"{len(self.programs)} programs, {sum(len(rows) for rows in self.entries.values())} entries"
+        )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Write PostgreSQL COPY CSV files from leaderboard files.")
+    parser.add_argument("inputs", nargs="+", help="Leaderboard files (JSON or NDJSON) or directories of them.")
+    parser.add_argument("--out", required=True, help="Bundle directory for the CSV files.")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = build_parser().parse_args(argv)
+    bundle = BulkBundle()
+    for raw in args.inputs:
+        path = Path(raw)
+        for file_path in leaderboard_files(path) if path.is_dir() else [path]:
+            try:
+                bundle.add(load_leaderboard(file_path))
+            except (OSError, ValueError, KeyError, TypeError) as exc:
+                raise SystemExit(f"Cannot read leaderboard {file_path}: {exc}") from exc
+    bundle.write(Path(args.out))
+    print(f"Bundle written to {args.out}: {bundle.summary()}")
+
+
+if __name__ == "__main__":
+    main()
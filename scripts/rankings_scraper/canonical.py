@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import heapq
+import json
+import re
+import threading
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+from .models import RankingEntry
+
+CANONICAL_ID_KEY = "canonical_school_id"
+
+_NON_ALNUM_RE = re.compile(r"[^0-9a-z]+")
+# Spelling variants folded onto one token so "Université X" and "X University" agree.
+_SYNONYMS = {
+    "universite": "university",
+    "universitat": "university",
+    "universidad": "university",
+    "universita": "university",
+    "universiteit": "university",
+    "univ": "university",
+    "ecole": "school",
+    "escuela": "school",
+    "scuola": "school",
+    "institut": "institute",
+    "intl": "international",
+}
+_STOP_TOKENS = frozenset({"the", "of", "de", "du", "des", "la", "le", "les", "d", "l", "and", "et", "y", "di", "in", "for"})
+# Dropped when they qualify "school" ("X Business School", "Ecole de Management X").
+_SCHOOL_QUALIFIERS = frozenset({"school", "business", "management", "graduate"})
+
+
+def school_key(name: str) -> str:
+    """
+    Normalised matching key of a school name.
+
+    Accents, case, punctuation and stop words are dropped, spelling
+    variants folded, and generic "business school" wording removed; tokens
+    are sorted so word order does not matter.
+
+    Example:
+        school_key("HEC Paris Business School") == school_key("HEC - Paris") == "hec paris"
+    """
+    text = unicodedata.normalize("NFKD", name)
+    text = "".join(char for char in text if not unicodedata.combining(char)).casefold().replace("&", " and ")
+    tokens = [_SYNONYMS.get(token, token) for token in _NON_ALNUM_RE.split(text) if token]
+    tokens = [token for token in tokens if token not in _STOP_TOKENS]
+    if "school" in tokens:
+        specific = [token for token in tokens if token not in _SCHOOL_QUALIFIERS]
+        if specific:
+            tokens = specific
+    return " ".join(sorted(tokens))
+
+
+def _ngrams(key: str, size: int) -> FrozenSet[str]:
+    padded = f" {key} "
+    if len(padded) <= size:
+        return frozenset({padded})
+    return frozenset(padded[index : index + size] for index in range(len(padded) - size + 1))
+
+
+@dataclass(frozen=True)
+class School:
+    """A known school: the id to write on entries, its display name and alternative names."""
+
+    id: str
+    name: str
+    aliases: Tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class SchoolMatch:
+    school_id: str
+    name: str
+    score: float
+
+
+class SchoolCatalogue:
+    """
+    Index of known schools for canonicalising scraped school names.
+
+    Every name and alias is reduced to a `school_key`; keys shared by two
+    different schools are ambiguous and never matched exactly. A lookup
+    first tries the exact key, then fuzzy matching: an inverted index of
+    character n-grams picks the `max_candidates` keys with the most
+    n-grams in common relative to their size (n-grams present in more
+    than `max_posting` keys are skipped as uninformative), and only those
+    are scored with the Dice coefficient of their n-gram sets. The best
+    school wins if it scores at least `threshold` and beats the runner-up
+    by `margin`. Results are cached per key, so repeated names across
+    rankings are scored once; matching N entries costs about N candidate
+    lookups instead of N x M comparisons.
+
+    Example:
+        catalogue = SchoolCatalogue.from_file(Path("schools.json"))
+        catalogue.match("HEC - Paris")           # SchoolMatch(school_id="hec", ...)
+        stream.tap(catalogue.canonicalize)       # sets metadata["canonical_school_id"]
+    """
+
+    def __init__(
+        self,
+        schools: Iterable[School],
+        *,
+        threshold: float = 0.8,
+        margin: float = 0.05,
+        ngram: int = 3,
+        max_candidates: int = 20,
+        max_posting: int = 500,
+    ) -> None:
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("threshold must be in (0, 1]")
+        self.threshold = threshold
+        self.margin = margin
+        self.ngram = ngram
+        self.max_candidates = max_candidates
+        self.max_posting = max_posting
+        self.schools: Dict[str, School] = {}
+        self._exact: Dict[str, Optional[str]] = {}
+        self._keys: List[str] = []
+        self._key_school: List[str] = []
+        self._key_grams: List[FrozenSet[str]] = []
+        self._postings: Dict[str, List[int]] = {}
+        self._cache: Dict[str, Optional[SchoolMatch]] = {}
+        self._lock = threading.Lock()
+        for school in schools:
+            self._add(school)
+
+    @classmethod
+    def from_file(cls, path: Path, **options: Any) -> "SchoolCatalogue":
+        """
+        Load a JSON array of `{"id": ..., "name": ..., "aliases": [...]}` objects.
+
+        Example:
+            [{"id": "ckv1hec", "name": "HEC Paris", "aliases": ["HEC School of Management"]}]
+        """
+        try:
+            data = json.loads(Path(path).read_text(encoding="utf-8"))
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"Invalid school catalogue {path}: {exc}") from exc
+        if not isinstance(data, list):
+            raise ValueError("School catalogue must be a JSON array of schools")
+        schools = []
+        for index, raw in enumerate(data):
+            if not isinstance(raw, dict) or not raw.get("id") or not raw.get("name"):
+                raise ValueError(f"School #{index} must be an object with 'id' and 'name'")
+            aliases = raw.get("aliases") or []
+            if not isinstance(aliases, list) or not all(isinstance(alias, str) for alias in aliases):
+                raise ValueError(f"School #{index}: aliases must be a list of strings")
+            schools.append(School(id=str(raw["id"]), name=str(raw["name"]), aliases=tuple(aliases)))
+        return cls(schools, **options)
+
+    def __len__(self) -> int:
+        return len(self.schools)
+
+    def _add(self, school: School) -> None:
+        if school.id in self.schools:
+            raise ValueError(f"Duplicate school id '{school.id}' in catalogue")
+        self.schools[school.id] = school
+        for name in (school.name, *school.aliases):
+            key = school_key(name)
+            if not key:
+                continue
+            if key in self._exact:
+                if self._exact[key] == school.id:
+                    continue  # alias reducing to a key this school already has
+                # A key claimed by two schools is ambiguous: keep it out of exact matching.
+                self._exact[key] = None
+            else:
+                self._exact[key] = school.id
+            grams = _ngrams(key, self.ngram)
+            index = len(self._keys)
+            self._keys.append(key)
+            self._key_school.append(school.id)
+            self._key_grams.append(grams)
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(index)
+
+    def match(self, name: str) -> Optional[SchoolMatch]:
+        """Best catalogue school for `name`, or None when nothing is close or the best is ambiguous."""
+        key = school_key(name)
+        if not key:
+            return None
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+        result = self._match_key(key)
+        with self._lock:
+            self._cache[key] = result
+        return result
+
+    def _match_key(self, key: str) -> Optional[SchoolMatch]:
+        if key in self._exact:
+            school_id = self._exact[key]
+            if school_id is None:
+                return None
+            return SchoolMatch(school_id=school_id, name=self.schools[school_id].name, score=1.0)
+
+        grams = _ngrams(key, self.ngram)
+        shared: Counter = Counter()
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if posting is not None and len(posting) <= self.max_posting:
+                shared.update(posting)
+
+        # Rank candidates by the Dice score their shared count implies (exact
+        # unless a skipped posting was involved), ties by index, so the cut-off
+        # does not depend on set iteration order.
+        size = len(grams)
+        candidates = heapq.nlargest(
+            self.max_candidates,
+            shared.items(),
+            key=lambda item: (item[1] / (size + len(self._key_grams[item[0]])), -item[0]),
+        )
+        best: Dict[str, float] = {}
+        for index, _count in candidates:
+            other = self._key_grams[index]
+            score = 2.0 * len(grams & other) / (len(grams) + len(other))
+            school_id = self._key_school[index]
+            if score > best.get(school_id, 0.0):
+                best[school_id] = score
+        if not best:
+            return None
+        ranked = sorted(best.items(), key=lambda item: -item[1])
+        school_id, score = ranked[0]
+        runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+        if score < self.threshold or score - runner_up < self.margin:
+            return None
+        return SchoolMatch(school_id=school_id, name=self.schools[school_id].name, score=round(score, 4))
+
+    def canonicalize(self, entry: RankingEntry) -> None:
+        """Set `metadata["canonical_school_id"]` on `entry` when its school is matched."""
+        found = self.match(entry.school_name)
+        if found is not None:
+            entry.metadata[CANONICAL_ID_KEY] = found.school_id
+
+    def canonicalize_all(self, entries: Sequence[RankingEntry]) -> int:
+        """Canonicalise `entries` in place; returns how many were matched."""
+        matched = 0
+        for entry in entries:
+            self.canonicalize(entry)
+            matched += CANONICAL_ID_KEY in entry.metadata
+        return matched
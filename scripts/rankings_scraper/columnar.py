@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import copy
+import sys
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union, overload
+
+from .models import (
+    LeaderboardPayload,
+    RankingEntry,
+    _utcnow_iso,
+    validate_entry_fields,
+    validate_leaderboard_fields,
+)
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if value is not None else None
+
+
+class EntryView:
+    """
+    Read-only view of one row of a ColumnarLeaderboard.
+
+    Exposes the RankingEntry attributes without materializing an object per
+    row; `to_entry()` builds a standalone RankingEntry when one is needed.
+    """
+
+    __slots__ = ("_board", "_index")
+
+    def __init__(self, board: "ColumnarLeaderboard", index: int) -> None:
+        self._board = board
+        self._index = index
+
+    @property
+    def rank(self) -> int:
+        return self._board._ranks[self._index]
+
+    @property
+    def school_name(self) -> str:
+        return self._board._school_names[self._index]
+
+    @property
+    def program_name(self) -> Optional[str]:
+        return self._board._program_names[self._index]
+
+    @property
+    def country(self) -> Optional[str]:
+        return self._board._countries[self._index]
+
+    @property
+    def city(self) -> Optional[str]:
+        return self._board._cities[self._index]
+
+    @property
+    def score(self) -> Optional[float]:
+        board = self._board
+        return board._scores[self._index] if board._has_score[self._index] else None
+
+    @property
+    def notes(self) -> Optional[str]:
+        return self._board._notes[self._index]
+
+    @property
+    def link(self) -> Optional[str]:
+        return self._board._links[self._index]
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        return self._board._metadata.get(self._index, {})
+
+    def validate(self) -> None:
+        validate_entry_fields(self.rank, self.school_name)
+
+    def to_entry(self) -> RankingEntry:
+        return RankingEntry(
+            rank=self.rank,
+            school_name=self.school_name,
+            program_name=self.program_name,
+            country=self.country,
+            city=self.city,
+            score=self.score,
+            notes=self.notes,
+            link=self.link,
+            metadata=copy.deepcopy(self.metadata),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self._board._row_dict(self._index)
+
+    def __repr__(self) -> str:
+        return f"EntryView(rank={self.rank!r}, school_name={self.school_name!r})"
+
+
+class ColumnarLeaderboard:
+    """
+    Column-oriented leaderboard for holding many rankings in memory.
+
+    Ranks and scores live in typed arrays (with a presence mask for missing
+    scores). Country, city and programme strings are interned so repeated
+    values share one object. Metadata is kept only for rows that have some.
+    Rows are exposed as lazy `EntryView`s, and `validate()` / `to_dict()`
+    behave exactly like LeaderboardPayload's.
+
+    Example:
+        board = ColumnarLeaderboard.from_payload(payload)
+        top = board[0].school_name
+        board.validate()
+        assert board.to_dict() == payload.to_dict()
+    """
+
+    def __init__(
+        self,
+        master_type: str,
+        source: str,
+        category: str,
+        year: int,
+        source_url: str,
+        region: Optional[str] = None,
+        entries: Iterable[RankingEntry] = (),
+        scraped_at: Optional[str] = None,
+    ) -> None:
+        self.master_type = master_type
+        self.source = source
+        self.category = category
+        self.year = year
+        self.source_url = source_url
+        self.region = region
+        self.scraped_at = scraped_at or _utcnow_iso()
+        self._ranks = array("q")
+        self._scores = array("d")
+        self._has_score = bytearray()
+        self._school_names: List[str] = []
+        self._program_names: List[Optional[str]] = []
+        self._countries: List[Optional[str]] = []
+        self._cities: List[Optional[str]] = []
+        self._notes: List[Optional[str]] = []
+        self._links: List[Optional[str]] = []
+        self._metadata: Dict[int, Dict[str, Any]] = {}
+        for entry in entries:
+            self.append(entry)
+
+    @classmethod
+    def from_payload(cls, payload: LeaderboardPayload) -> "ColumnarLeaderboard":
+        return cls(
+            master_type=payload.master_type,
+            source=payload.source,
+            category=payload.category,
+            year=payload.year,
+            source_url=payload.source_url,
+            region=payload.region,
+            entries=payload.entries,
+            scraped_at=payload.scraped_at,
+        )
+
+    def to_payload(self) -> LeaderboardPayload:
+        return LeaderboardPayload(
+            master_type=self.master_type,
+            source=self.source,
+            category=self.category,
+            year=self.year,
+            source_url=self.source_url,
+            region=self.region,
+            entries=[view.to_entry() for view in self],
+            scraped_at=self.scraped_at,
+        )
+
+    def append(self, entry: RankingEntry) -> None:
+        index = len(self._ranks)
+        self._ranks.append(entry.rank)
+        self._scores.append(entry.score if entry.score is not None else 0.0)
+        self._has_score.append(entry.score is not None)
+        self._school_names.append(entry.school_name)
+        self._program_names.append(_intern(entry.program_name))
+        self._countries.append(_intern(entry.country))
+        self._cities.append(_intern(entry.city))
+        self._notes.append(entry.notes)
+        self._links.append(entry.link)
+        if entry.metadata:
+            self._metadata[index] = copy.deepcopy(entry.metadata)  # like to_dict(): later edits to the entry do not leak in
+
+    def __len__(self) -> int:
+        return len(self._ranks)
+
+    @overload
+    def __getitem__(self, index: int) -> EntryView: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[EntryView]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[EntryView, List[EntryView]]:
+        if isinstance(index, slice):
+            return [EntryView(self, position) for position in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("leaderboard index out of range")
+        return EntryView(self, index)
+
+    def __iter__(self) -> Iterator[EntryView]:
+        for index in range(len(self)):
+            yield EntryView(self, index)
+
+    @property
+    def entries(self) -> "ColumnarLeaderboard":
+        """Lazy row views, for code written against LeaderboardPayload.entries."""
+        return self
+
+    def validate(self) -> None:
+        """Validate the leaderboard and every row."""
+        validate_leaderboard_fields(self.master_type, self.source, self.category, self.year, self.source_url, len(self))
+        for rank, school_name in zip(self._ranks, self._school_names):
+            validate_entry_fields(rank, school_name)
+
+    def _row_dict(self, index: int) -> Dict[str, Any]:
+        metadata = self._metadata.get(index)
+        return {
+            "rank": self._ranks[index],
+            "school_name": self._school_names[index],
+            "program_name": self._program_names[index],
+            "country": self._countries[index],
+            "city": self._cities[index],
+            "score": self._scores[index] if self._has_score[index] else None,
+            "notes": self._notes[index],
+            "link": self._links[index],
+            "metadata": copy.deepcopy(metadata) if metadata else {},
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the same JSON-serializable dict as LeaderboardPayload.to_dict()."""
+        return {
+            "master_type": self.master_type,
+            "source": self.source,
+            "category": self.category,
+            "year": self.year,
+            "source_url": self.source_url,
+            "region": self.region,
+            "entries": [self._row_dict(index) for index in range(len(self))],
+            "scraped_at": self.scraped_at,
+        }
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .fileio import atomic_write
+
+MANIFEST_NAME = ".ft-manifest.json"
+_HASH_CHUNK = 1 << 20
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(_HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ConversionManifest:
+    """
+    Records which workbook produced which JSON output, to skip unchanged inputs.
+
+    Each source (keyed by resolved path) stores its size, mtime, sha256 and
+    output path; the manifest as a whole stores a `fingerprint` of the
+    converter version and header aliases. A source is current when the
+    fingerprint matches, its output still exists and either its stat is
+    unchanged or, if it was touched, its content hash is. A fingerprint
+    change invalidates every entry.
+
+    Example:
+        manifest = ConversionManifest.load(output_dir, fingerprint)
+        if not manifest.is_current(path):
+            manifest.record(path, convert_file(path, output_dir))
+        manifest.prune(discovered_files)
+        manifest.save()
+    """
+
+    def __init__(self, path: Path, fingerprint: str, entries: Optional[Dict[str, Dict[str, object]]] = None) -> None:
+        self.path = Path(path)
+        self.fingerprint = fingerprint
+        self.entries: Dict[str, Dict[str, object]] = entries or {}
+        self._hashes: Dict[Tuple[str, int, int], str] = {}
+
+    @classmethod
+    def load(cls, output_dir: Path, fingerprint: str) -> "ConversionManifest":
+        path = Path(output_dir) / MANIFEST_NAME
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return cls(path, fingerprint)
+        entries = data.get("files") if isinstance(data, dict) else None
+        if not isinstance(entries, dict):
+            return cls(path, fingerprint)
+        if data.get("fingerprint") != fingerprint:
+            # Keep the sources so outputs can still be pruned, but force a rebuild.
+            entries = {key: {"output": value.get("output")} for key, value in entries.items() if isinstance(value, dict)}
+        return cls(path, fingerprint, entries)
+
+    @staticmethod
+    def _key(source: Path) -> str:
+        return str(Path(source).resolve())
+
+    def _hash(self, source: Path, stat: os.stat_result) -> str:
+        # Memoized per stat so a file checked then recorded is hashed only once.
+        key = (self._key(source), stat.st_size, stat.st_mtime_ns)
+        if key not in self._hashes:
+            self._hashes[key] = file_sha256(source)
+        return self._hashes[key]
+
+    def is_current(self, source: Path) -> bool:
+        """True if `source` was converted with this fingerprint and has not changed since."""
+        entry = self.entries.get(self._key(source))
+        if not entry or "sha256" not in entry:
+            return False
+        output = entry.get("output")
+        if not isinstance(output, str) or not Path(output).exists():
+            return False
+        stat = source.stat()
+        if entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns:
+            return True
+        if entry.get("size") != stat.st_size or self._hash(source, stat) != entry["sha256"]:
+            return False
+        # Touched but identical: refresh the stat so the next run skips the hash.
+        entry["mtime_ns"] = stat.st_mtime_ns
+        return True
+
+    def record(self, source: Path, output_path: Path) -> None:
+        stat = source.stat()
+        self.entries[self._key(source)] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": self._hash(source, stat),
+            "output": str(Path(output_path).resolve()),
+        }
+
+    def prune(self, sources: Sequence[Path]) -> List[Path]:
+        """
+        Drop entries whose source is not in `sources` and delete their outputs.
+
+        An output still claimed by a live source is kept. Returns the deleted
+        output paths.
+        """
+        live = {self._key(source) for source in sources}
+        stale = [key for key in self.entries if key not in live]
+        claimed = {entry.get("output") for key, entry in self.entries.items() if key in live}
+        removed: List[Path] = []
+        for key in stale:
+            output = self.entries.pop(key).get("output")
+            if isinstance(output, str) and output not in claimed:
+                output_path = Path(output)
+                if output_path.exists():
+                    output_path.unlink()
+                    removed.append(output_path)
+        return removed
+
+    def save(self) -> None:
+        data = {"fingerprint": self.fingerprint, "files": dict(sorted(self.entries.items()))}
+        atomic_write(self.path, json.dumps(data, indent=2).encode("utf-8"))
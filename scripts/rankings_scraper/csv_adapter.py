@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import codecs
+import csv
+import io
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+from .html_adapter import HtmlTableAdapter, _clean_text, _parse_rank_value
+from .models import RankingEntry
+from .pipeline import LeaderboardStream
+from .profiling import span, timed_iter
+
+SAMPLE_SIZE = 64 * 1024
+DELIMITERS = ",;\t|"
+_BOMS = ((codecs.BOM_UTF8, "utf-8-sig"), (codecs.BOM_UTF16_LE, "utf-16"), (codecs.BOM_UTF16_BE, "utf-16"))
+CP1252_FALLBACK = "rankings-cp1252-fallback"
+
+
+def _decode_as_cp1252(error: UnicodeError) -> Tuple[str, int]:
+    """Codec error handler: decode the bytes UTF-8 rejected as cp1252 and carry on."""
+    if not isinstance(error, UnicodeDecodeError):
+        raise error
+    return error.object[error.start : error.end].decode("cp1252", errors="replace"), error.end
+
+
+codecs.register_error(CP1252_FALLBACK, _decode_as_cp1252)
+
+
+def sniff_encoding(sample: bytes) -> str:
+    """
+    Encoding of a CSV sample: from its BOM, else UTF-8 when the sample decodes, else cp1252.
+
+    A multi-byte character cut at the end of the sample does not count as invalid.
+    """
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return encoding
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+    except UnicodeDecodeError:
+        return "cp1252"  # spreadsheet exports that are not UTF-8 are almost always Windows-1252
+    return "utf-8"
+
+
+def sniff_delimiter(text: str) -> str:
+    """
+    Delimiter of a CSV sample: `csv.Sniffer` over complete lines, checked against the header line.
+
+    Falls back to the candidate splitting the header line into the most
+    columns (comma when none does).
+    """
+    lines = text.splitlines()
+    if len(lines) > 1 and not text.endswith(("\n", "\r")):
+        lines = lines[:-1]  # drop the line cut by the sample boundary
+    header = lines[0] if lines else ""
+    try:
+        delimiter = csv.Sniffer().sniff("\n".join(lines), delimiters=DELIMITERS).delimiter
+    except csv.Error:
+        delimiter = ""
+    if delimiter and len(next(csv.reader([header], delimiter=delimiter))) > 1:
+        return delimiter
+    counts = {candidate: len(next(csv.reader([header], delimiter=candidate))) for candidate in DELIMITERS}
+    best = max(counts, key=lambda candidate: counts[candidate])
+    return best if counts[best] > 1 else ","
+
+
+class _PrefixedStream(io.RawIOBase):
+    """Byte stream replaying an already-read `prefix` before the rest of `stream`."""
+
+    def __init__(self, prefix: bytes, stream: IO[bytes], on_close: Optional[Callable[[], None]] = None) -> None:
+        self._prefix = memoryview(prefix)
+        self._stream = stream
+        self._on_close = on_close
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        if self._prefix:
+            size = min(len(buffer), len(self._prefix))
+            buffer[:size] = self._prefix[:size]
+            self._prefix = self._prefix[size:]
+            return size
+        data = self._stream.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+    def close(self) -> None:
+        if not self.closed:
+            (self._on_close or self._stream.close)()
+        super().close()
+
+
+def open_csv_text(stream: IO[bytes], on_close: Optional[Callable[[], None]] = None) -> Tuple[IO[str], str, str]:
+    """
+    Wrap a byte stream for the csv module, sniffing encoding and delimiter from its first `SAMPLE_SIZE` bytes.
+
+    Only the sample is buffered; the rest is decoded as it is read. A file
+    sniffed as UTF-8 may still hold cp1252 bytes past the sample (rows
+    pasted from another export): those are decoded as cp1252 rather than
+    failing mid-stream. Returns (text stream, encoding, delimiter).
+    """
+    chunks: List[bytes] = []
+    size = 0
+    while size < SAMPLE_SIZE:
+        chunk = stream.read(SAMPLE_SIZE - size)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        size += len(chunk)
+    sample = b"".join(chunks)
+    encoding = sniff_encoding(sample)
+    errors = {"cp1252": "replace", "utf-16": "strict"}.get(encoding, CP1252_FALLBACK)
+    sample_text = codecs.getincrementaldecoder(encoding)(errors=errors).decode(sample, final=False)
+    delimiter = sniff_delimiter(sample_text)
+    raw = _PrefixedStream(sample, stream, on_close)
+    text = io.TextIOWrapper(io.BufferedReader(raw, SAMPLE_SIZE), encoding=encoding, errors=errors, newline="")
+    return text, encoding, delimiter
+
+
+class CsvAdapter(HtmlTableAdapter):
+    """
+    Adapter streaming rankings from CSV/TSV downloads.
+
+    The file is read with the csv module one row at a time: encoding (BOM,
+    UTF-8 or cp1252) and delimiter (`,`, `;`, tab or `|`) are sniffed from
+    the first 64 KiB, headers are mapped with the same aliases as HTML
+    tables, and entries are yielded lazily, so memory stays flat however
+    large the export. `url` may be `http(s)://`, `file://` or a local path;
+    HTTP bodies are streamed rather than downloaded first, and bypass the
+    HTTP cache. With `stream_pages()` each page is fetched whole.
+
+    Example:
+        adapter = CsvAdapter()
+        stream = adapter.stream(master_type="mim", year=2025, source="QS", url="exports/qs-2025.csv", category="MiM")
+        for entry in stream.entries:
+            ...
+    """
+
+    def stream(
+        self,
+        *,
+        master_type: str,
+        year: int,
+        source: str,
+        url: str,
+        category: str,
+        region: Optional[str] = None,
+        html_override: Optional[str] = None,
+    ) -> LeaderboardStream:
+        """
+        Open the CSV and return its entries as a lazily validated stream.
+
+        The header row is read and checked before returning; the file stays
+        open until the stream is exhausted. `html_override` holds CSV text
+        to parse instead of fetching (useful for tests).
+        """
+        if html_override is not None:
+            entries = self._iter_table(html_override)
+        else:
+            text, _encoding, delimiter = self._open(url)
+            entries = self._iter_csv(text, delimiter)
+        try:
+            return LeaderboardStream(
+                master_type=master_type,
+                source=source,
+                category=category,
+                year=year,
+                source_url=url,
+                region=region,
+                entries=entries,
+            )
+        except Exception:
+            if html_override is None:
+                text.close()
+            raise
+
+    def _open(self, url: str) -> Tuple[IO[str], str, str]:
+        parts = urlsplit(url)
+        if parts.scheme in ("http", "https"):
+            from .http_client import DEFAULT_HEADERS  # deferred: imports requests
+
+            response = self.session.get(url, headers=dict(DEFAULT_HEADERS), timeout=self.timeout, stream=True)
+            try:
+                response.raise_for_status()
+                response.raw.decode_content = True
+            except Exception:
+                response.close()
+                raise
+            return open_csv_text(response.raw, on_close=response.close)
+        path = Path(unquote(parts.path)) if parts.scheme == "file" else Path(url)
+        return open_csv_text(path.open("rb"))
+
+    def _iter_table(self, html: str) -> Iterator[RankingEntry]:
+        """Parse CSV text already in memory (`html_override`, pages of `stream_pages()`)."""
+        text = html.lstrip("\ufeff")
+        return self._iter_csv(io.StringIO(text, newline=""), sniff_delimiter(text[:SAMPLE_SIZE]))
+
+    def _all_table_entries(self, html: str) -> List[RankingEntry]:
+        return list(self._iter_table(html))
+
+    def _iter_csv(self, text: IO[str], delimiter: str) -> Iterator[RankingEntry]:
+        """Read and check the header row now; return a generator of the entries."""
+        rows = csv.reader(text, delimiter=delimiter)
+        try:
+            with span("header_map"):
+                headers = next(rows, [])
+                header_map = self._build_header_map([_clean_text(header) for header in headers])
+            if "rank" not in header_map.values() or "school_name" not in header_map.values():
+                raise ValueError("CSV must contain rank and school columns")
+        except Exception:
+            text.close()
+            raise
+        return timed_iter("build_entries", self._iter_csv_rows(rows, header_map, text))
+
+    def _iter_csv_rows(
+        self, rows: Iterable[List[str]], header_map: Dict[int, str], text: IO[str]
+    ) -> Iterator[RankingEntry]:
+        # Same rule as tables: when several columns map to a field, the right-most cell present in the row wins.
+        positions: Dict[str, List[int]] = {}
+        for idx, canonical in sorted(header_map.items()):
+            positions.setdefault(canonical, []).insert(0, idx)
+        columns = list(positions.items())
+        produced = False
+        try:
+            for cells in rows:
+                width = len(cells)
+                fields: Dict[str, Optional[str]] = {}
+                for canonical, indexes in columns:
+                    for idx in indexes:
+                        if idx < width:
+                            fields[canonical] = _clean_text(cells[idx]) or None
+                            break
+                rank = _parse_rank_value(fields.get("rank"))
+                school = fields.get("school_name")
+                if rank is None or not school:
+                    continue
+                produced = True
+                yield RankingEntry(
+                    rank=rank,
+                    school_name=school,
+                    program_name=fields.get("program_name"),
+                    country=fields.get("country"),
+                    city=fields.get("city"),
+                    score=self._parse_score(fields.get("score")),
+                    notes=fields.get("notes"),
+                    link=fields.get("link"),
+                    metadata={},
+                )
+        finally:
+            text.close()
+        if not produced:
+            raise ValueError("No entries parsed from CSV")
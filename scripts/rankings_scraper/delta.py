@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .fileio import atomic_write
+from .models import NdjsonLeaderboardReader, RankingEntry, leaderboard_format, load_leaderboard
+from .serialization import ENTRY_FIELDS, LEADERBOARD_FIELDS
+
+DELTA_SUFFIX = ".delta.json"
+# Fields compared besides rank and score; a change lands in `updated`.
+DETAIL_FIELDS = tuple(name for name in ENTRY_FIELDS if name not in ("rank", "score", "school_name", "program_name")) + (
+    "metadata",
+)
+
+EntryKey = Tuple[str, str, int]
+
+
+def _normalise(value: Optional[str]) -> str:
+    return " ".join((value or "").split()).casefold()
+
+
+def delta_path(output_path: Path) -> Path:
+    """`ranking.json` / `ranking.ndjson` -> `ranking.delta.json`."""
+    output_path = Path(output_path)
+    return output_path.with_name(output_path.stem + DELTA_SUFFIX)
+
+
+@dataclass
+class PreviousOutput:
+    """Leaderboard fields and entries (in `to_dict()` form) of the last written output, by key."""
+
+    header: Dict[str, Any]
+    entries: Dict[EntryKey, Dict[str, Any]]
+    scraped_at: Optional[str] = None
+
+
+class _KeyCounter:
+    """
+    Key entries by (school_name, program_name), normalised for case and spaces.
+
+    A ranking may list the same school and programme twice; the n-th
+    occurrence gets index n so each row keeps a distinct key.
+    """
+
+    def __init__(self) -> None:
+        self._seen: Dict[Tuple[str, str], int] = {}
+
+    def key(self, school_name: str, program_name: Optional[str]) -> EntryKey:
+        base = (_normalise(school_name), _normalise(program_name))
+        occurrence = self._seen.get(base, 0)
+        self._seen[base] = occurrence + 1
+        return base + (occurrence,)
+
+
+def load_previous(output_path: Path) -> Optional[PreviousOutput]:
+    """
+    Read the leaderboard previously written to `output_path` (JSON or NDJSON).
+
+    Returns None when there is no previous output, in which case every
+    current entry counts as added. A file that exists but cannot be read
+    raises ValueError rather than being taken for a first run.
+    """
+    path = Path(output_path)
+    try:
+        output_format = leaderboard_format(path)
+    except FileNotFoundError:
+        return None
+    try:
+        if output_format == "json":
+            payload = load_leaderboard(path)
+            header = {name: getattr(payload, name) for name in LEADERBOARD_FIELDS}
+            return _index(header, (entry.to_dict() for entry in payload.entries), payload.scraped_at)
+        with NdjsonLeaderboardReader(path) as reader:
+            header = {name: reader.header.get(name) for name in LEADERBOARD_FIELDS}
+            return _index(header, (entry.to_dict() for entry in reader), reader.scraped_at)
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        raise ValueError(f"Cannot read previous output {path}: {exc}") from exc
+
+
+def _index(header: Dict[str, Any], rows: Iterable[Dict[str, Any]], scraped_at: Optional[str]) -> PreviousOutput:
+    keys = _KeyCounter()
+    entries: Dict[EntryKey, Dict[str, Any]] = {}
+    for row in rows:
+        entries[keys.key(row["school_name"], row.get("program_name"))] = row
+    return PreviousOutput(header=header, entries=entries, scraped_at=scraped_at)
+
+
+@dataclass
+class EntryDelta:
+    """
+    Keyed difference between two versions of a leaderboard.
+
+    `added` holds full entries; `removed` the previous rank of each dropped
+    entry; `moved` and `rescored` the old and new rank or score; `updated`
+    the new value of any other field that changed. `leaderboard` holds
+    leaderboard fields (source URL, region, ...) whose value changed. An
+    unchanged ranking gives an empty delta.
+    """
+
+    added: List[Dict[str, Any]] = field(default_factory=list)
+    removed: List[Dict[str, Any]] = field(default_factory=list)
+    moved: List[Dict[str, Any]] = field(default_factory=list)
+    rescored: List[Dict[str, Any]] = field(default_factory=list)
+    updated: List[Dict[str, Any]] = field(default_factory=list)
+    leaderboard: Dict[str, Any] = field(default_factory=dict)
+    baseline: bool = False
+
+    @property
+    def changes(self) -> int:
+        return (
+            len(self.added)
+            + len(self.removed)
+            + len(self.moved)
+            + len(self.rescored)
+            + len(self.updated)
+            + len(self.leaderboard)
+        )
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.baseline and self.changes == 0
+
+    def summary(self) -> str:
+        if self.is_empty:
+            return "unchanged"
+        return (
+            f"{len(self.added)} added, {len(self.removed)} removed, {len(self.moved)} moved, "
+            f"{len(self.rescored)} rescored, {len(self.updated)} updated"
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "baseline": self.baseline,
+            "unchanged": self.is_empty,
+            "leaderboard": self.leaderboard,
+            "added": self.added,
+            "removed": self.removed,
+            "moved": self.moved,
+            "rescored": self.rescored,
+            "updated": self.updated,
+        }
+
+
+class DeltaTracker:
+    """
+    Build an EntryDelta while the current entries stream past.
+
+    Each observed entry is matched against the previous output in O(1) and
+    its match removed, so whatever is left at `finish()` was removed; the
+    whole diff is O(n) and only the previous output is held in memory.
+    Plug `observe` into `LeaderboardStream.tap()`.
+
+    Example:
+        tracker = DeltaTracker(load_previous(output_path))
+        stream.tap(tracker.observe)
+        dump_payload(stream, output_path)
+        write_delta(delta_path(output_path), tracker.finish(stream))
+    """
+
+    def __init__(self, previous: Optional[PreviousOutput]) -> None:
+        self.previous = previous
+        self._pending: Dict[EntryKey, Dict[str, Any]] = dict(previous.entries) if previous is not None else {}
+        self._keys = _KeyCounter()
+        self.delta = EntryDelta(baseline=previous is None)
+
+    def observe(self, entry: RankingEntry) -> None:
+        key = self._keys.key(entry.school_name, entry.program_name)
+        old = self._pending.pop(key, None)
+        if old is None:
+            self.delta.added.append(entry.to_dict())
+            return
+        ident = {"school_name": entry.school_name, "program_name": entry.program_name}
+        if old.get("rank") != entry.rank:
+            self.delta.moved.append({**ident, "from": old.get("rank"), "to": entry.rank})
+        if old.get("score") != entry.score:
+            self.delta.rescored.append({**ident, "from": old.get("score"), "to": entry.score})
+        changed = {
+            name: getattr(entry, name)
+            for name in DETAIL_FIELDS
+            if (old.get(name) or None) != (getattr(entry, name) or None)
+        }
+        if changed:
+            self.delta.updated.append({**ident, "fields": changed})
+
+    def finish(self, leaderboard: Any) -> EntryDelta:
+        """Close the diff once the stream is exhausted; `leaderboard` supplies the new leaderboard fields."""
+        delta = self.delta
+        for old in self._pending.values():
+            delta.removed.append(
+                {"school_name": old["school_name"], "program_name": old.get("program_name"), "rank": old.get("rank")}
+            )
+        self._pending = {}
+        if self.previous is not None:
+            delta.leaderboard = {
+                name: getattr(leaderboard, name)
+                for name in LEADERBOARD_FIELDS
+                if self.previous.header.get(name) != getattr(leaderboard, name)
+            }
+        return delta
+
+
+def diff_entries(previous: Optional[PreviousOutput], current: Iterable[RankingEntry], leaderboard: Any) -> EntryDelta:
+    """Diff already available entries against a previous output."""
+    tracker = DeltaTracker(previous)
+    for entry in current:
+        tracker.observe(entry)
+    return tracker.finish(leaderboard)
+
+
+def write_delta(path: Path, delta: EntryDelta, metadata: Optional[Mapping[str, Any]] = None) -> Path:
+    """Write the delta document atomically, with `metadata` (output, timestamps) first."""
+    document = {**(metadata or {}), **delta.to_dict()}
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write(path, json.dumps(document, indent=2, ensure_ascii=False).encode("utf-8"))
+    return path
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any, Iterator
+
+
+@contextmanager
+def atomic_open(path: Path, mode: str = "w", **kwargs: Any) -> Iterator[IO[Any]]:
+    """
+    Open a temp file next to `path` that replaces `path` once the block exits cleanly.
+
+    Readers never see a half-written file; on error the temp file is
+    removed and `path` is left untouched. The temp name is unique per
+    process and thread, so concurrent writers do not clobber each other.
+
+    Example:
+        with atomic_open(Path("data/rankings/ft-mim-2025.json"), encoding="utf-8") as handle:
+            handle.write(text)
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with tmp_path.open(mode, **kwargs) as handle:
+            yield handle
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def atomic_write(path: Path, data: bytes) -> None:
+    """Write `data` to `path` atomically (temp file + rename)."""
+    with atomic_open(path, "wb") as handle:
+        handle.write(data)
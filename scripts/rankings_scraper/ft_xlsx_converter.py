@@ -1,16 +1,28 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
+import os
 import re
+import time
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
 
-from openpyxl import load_workbook
-from openpyxl.cell.cell import Cell
+from .canonical import SchoolCatalogue
+from .conversion_manifest import ConversionManifest, file_sha256
+from .header_index import HeaderIndex, normalize_header_aliases
+from .models import RankingEntry
+from .pipeline import LeaderboardStream
+from .profiling import StageStats, active, disable, enable, profiled, span, timed_iter
+from .serialization import OUTPUT_FORMATS, dump_payload
+from .xlsx_stream import SheetCell, XlsxSheetReader
 
-from .models import LeaderboardPayload, RankingEntry
+if TYPE_CHECKING:
+    from openpyxl.cell.cell import Cell
 
 HEADER_ALIASES: Dict[str, List[str]] = {
     "rank": ["rank", "position", "#"],
@@ -22,6 +34,12 @@ HEADER_ALIASES: Dict[str, List[str]] = {
     "link": ["link", "url", "website"],
 }
 
+HEADER_INDEX = HeaderIndex(HEADER_ALIASES)
+
+# Bump whenever a code change alters the JSON produced for the same workbook,
+# so the incremental manifest re-converts everything.
+CONVERTER_VERSION = 1
+
 FILENAME_PATTERNS: Sequence[Tuple[str, str, str]] = [
     ("masters-in-management", "mim", "Master in Management"),
     ("masters-of-management", "mim", "Master in Management"),
@@ -74,26 +92,26 @@ class FileMeta:
     source_url: str
 
 
-def _clean_text(value: Optional[str]) -> str:
-    if value is None:
-        return ""
-    return re.sub(r"\s+", " ", str(value)).strip()
+@dataclass
+class ConversionResult:
+    """Outcome of converting one workbook."""
 
+    source: Path
+    elapsed: float
+    output_path: Optional[Path] = None
+    error: Optional[str] = None
+    # Stage timings collected in a worker process when profiling.
+    stages: Optional[Dict[str, StageStats]] = None
 
-def _normalize_header(value: str) -> str:
-    lowered = value.lower()
-    cleaned = re.sub(r"[^a-z0-9#]+", " ", lowered)
-    return _clean_text(cleaned)
+    @property
+    def ok(self) -> bool:
+        return self.error is None
 
 
-def _match_header(header: str) -> Optional[str]:
-    normalized = _normalize_header(header)
-    for canonical, aliases in HEADER_ALIASES.items():
-        for alias in aliases:
-            alias_norm = _normalize_header(alias)
-            if normalized == alias_norm or normalized.startswith(alias_norm):
-                return canonical
-    return None
+def _clean_text(value: Optional[str]) -> str:
+    if value is None:
+        return ""
+    return re.sub(r"\s+", " ", str(value)).strip()
 
 
 def _parse_rank(raw: Optional[str]) -> Optional[int]:
@@ -145,24 +163,7 @@ def _infer_meta_from_filename(path: Path) -> FileMeta:
     )
 
 
-def _header_row(ws) -> Tuple[int, List[str]]:
-    for idx, row in enumerate(ws.iter_rows(values_only=True), start=1):
-        values = [cell for cell in row if cell not in (None, "")]
-        if len(values) >= 2:
-            return idx, [str(cell) for cell in row]
-    raise ValueError("No header row found in workbook")
-
-
-def _build_header_map(headers: List[str]) -> Dict[int, str]:
-    mapping: Dict[int, str] = {}
-    for idx, header in enumerate(headers):
-        canonical = _match_header(str(header))
-        if canonical:
-            mapping[idx] = canonical
-    return mapping
-
-
-def _extract_cell_value(cell: Cell) -> Optional[str]:
+def _extract_cell_value(cell: SheetCell) -> Optional[str]:
     if cell.value is None:
         return None
     return str(cell.value)
@@ -175,12 +176,29 @@ def _extract_link(cell: Cell) -> Optional[str]:
 
 
 def _parse_rows(ws, header_row_idx: int, header_map: Dict[int, str]) -> List[RankingEntry]:
+    """Parse the rows of an openpyxl worksheet below `header_row_idx`."""
+    rows = (
+        [SheetCell(cell.value, _extract_link(cell)) for cell in row]
+        for row in ws.iter_rows(min_row=header_row_idx + 1)
+    )
+    return _parse_cells(rows, header_map)
+
+
+def _parse_cells(rows: Iterable[Sequence[SheetCell]], header_map: Dict[int, str]) -> List[RankingEntry]:
+    return list(_iter_cells(rows, header_map))
+
+
+def _iter_cells(rows: Iterable[Sequence[SheetCell]], header_map: Dict[int, str]) -> Iterator[RankingEntry]:
+    """Check the header map now; return a generator of the entries in `rows`."""
     if "rank" not in header_map.values() or "school_name" not in header_map.values():
         raise ValueError("Table must contain rank and school columns")
+    return _iter_entries(rows, header_map)
+
 
-    entries: List[RankingEntry] = []
+def _iter_entries(rows: Iterable[Sequence[SheetCell]], header_map: Dict[int, str]) -> Iterator[RankingEntry]:
+    produced = False
     has_link_column = "link" in header_map.values()
-    for row in ws.iter_rows(min_row=header_row_idx + 1):
+    for row in rows:
         values_present = any(cell.value not in (None, "") for cell in row)
         if not values_present:
             continue
@@ -193,10 +211,10 @@ def _parse_rows(ws, header_row_idx: int, header_map: Dict[int, str]) -> List[Ran
             if canonical is None:
                 continue
             if canonical == "link":
-                normalized[canonical] = _extract_link(cell) or _extract_cell_value(cell)
+                normalized[canonical] = cell.link or _extract_cell_value(cell)
             else:
                 if canonical == "school_name":
-                    school_link = _extract_link(cell)
+                    school_link = cell.link
                 normalized[canonical] = _extract_cell_value(cell)
 
         rank_int = _parse_rank(normalized.get("rank"))
@@ -216,37 +234,79 @@ def _parse_rows(ws, header_row_idx: int, header_map: Dict[int, str]) -> List[Ran
             link=link_value,
             metadata={},
         )
-        entries.append(entry)
+        produced = True
+        yield entry
 
-    if not entries:
+    if not produced:
         raise ValueError("No entries parsed from workbook")
-    return entries
 
 
-def convert_file(path: Path, output_dir: Path) -> Path:
-    meta = _infer_meta_from_filename(path)
-    wb = load_workbook(path, data_only=True)
-    ws = wb.active
+def _read_entries(path: Path, header_index: HeaderIndex) -> List[RankingEntry]:
+    return list(_iter_workbook_entries(path, header_index))
+
 
-    header_row_idx, headers = _header_row(ws)
-    header_map = _build_header_map(headers)
-    entries = _parse_rows(ws, header_row_idx, header_map)
+def _iter_workbook_entries(path: Path, header_index: HeaderIndex) -> Iterator[RankingEntry]:
+    """
+    Stream the active sheet once: find the header row now, then yield the rows below it.
 
-    payload = LeaderboardPayload(
+    The workbook stays open until the returned generator is exhausted or closed.
+    """
+    with span("open_workbook") as stage:
+        reader = XlsxSheetReader(path)
+        stage.add(bytes=path.stat().st_size)
+    try:
+        rows = reader.iter_rows()
+        with span("find_header_row"):
+            for _row_number, cells in rows:
+                if sum(1 for cell in cells if cell.value not in (None, "")) >= 2:
+                    headers = [str(cell.value) for cell in cells]
+                    break
+            else:
+                raise ValueError("No header row found in workbook")
+        with span("header_map"):
+            header_map = header_index.build_header_map(headers)
+        entries = _iter_cells((cells for _row_number, cells in rows), header_map)
+    except Exception:
+        reader.close()
+        raise
+    return _closing(reader, timed_iter("build_entries", entries))
+
+
+def _closing(reader: XlsxSheetReader, entries: Iterator[RankingEntry]) -> Iterator[RankingEntry]:
+    with reader:
+        yield from entries
+
+
+def convert_file(
+    path: Path,
+    output_dir: Path,
+    header_aliases: Optional[Mapping[str, Sequence[str]]] = None,
+    output_format: str = "json",
+    schools: Optional[Path] = None,
+) -> Path:
+    meta = _infer_meta_from_filename(path)
+    header_index = HEADER_INDEX.extend(header_aliases) if header_aliases else HEADER_INDEX
+    stream = LeaderboardStream(
         master_type=meta.master_type,
         source="Financial Times",
         category=meta.category,
         year=meta.year,
         source_url=meta.source_url,
         region=None,
-        entries=entries,
+        entries=_iter_workbook_entries(path, header_index),
     )
-    payload.validate()
+    if schools is not None:
+        stream.tap(_load_catalogue(str(schools)).canonicalize)
 
     slug = _slugify(f"ft-{meta.category}-{meta.year}")
-    output_path = output_dir / f"{slug}.json"
-    output_path.write_text(json.dumps(payload.to_dict(), indent=2, ensure_ascii=False), encoding="utf-8")
-    return output_path
+    output_path = output_dir / f"{slug}.{output_format}"
+    return dump_payload(stream, output_path, output_format=output_format)
+
+
+@lru_cache(maxsize=4)
+def _load_catalogue(path: str) -> SchoolCatalogue:
+    # Cached so each worker process indexes the catalogue once, not once per workbook.
+    return SchoolCatalogue.from_file(Path(path))
 
 
 def _slugify(value: str) -> str:
@@ -266,26 +326,191 @@ def discover_files(input_dir: Path) -> Iterable[Path]:
             yield path
 
 
+def conversion_fingerprint(
+    header_aliases: Optional[Mapping[str, Sequence[str]]] = None,
+    output_format: str = "json",
+    schools_digest: Optional[str] = None,
+) -> str:
+    """Identify the converter version, header aliases, format and school catalogue an output was produced with."""
+    state = {
+        "version": CONVERTER_VERSION,
+        "aliases": HEADER_ALIASES,
+        "extra_aliases": header_aliases or {},
+        "format": output_format,
+    }
+    if schools_digest is not None:
+        state["schools"] = schools_digest
+    return hashlib.sha256(json.dumps(state, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _convert_one(
+    path: Path,
+    output_dir: Path,
+    header_aliases: Optional[Mapping[str, Sequence[str]]],
+    output_format: str = "json",
+    profile: bool = False,
+    schools: Optional[Path] = None,
+) -> ConversionResult:
+    profiler = enable() if profile else None
+    started = time.perf_counter()
+    try:
+        output_path = convert_file(path, output_dir, header_aliases, output_format, schools)
+    except Exception as exc:  # noqa: BLE001
+        result = ConversionResult(source=path, elapsed=time.perf_counter() - started, error=str(exc) or type(exc).__name__)
+    else:
+        result = ConversionResult(source=path, elapsed=time.perf_counter() - started, output_path=output_path)
+    if profiler is not None:
+        disable()
+        result.stages = profiler.stages
+    return result
+
+
+def convert_files(
+    files: Sequence[Path],
+    output_dir: Path,
+    header_aliases: Optional[Mapping[str, Sequence[str]]] = None,
+    *,
+    jobs: int = 1,
+    output_format: str = "json",
+    schools: Optional[Path] = None,
+) -> Iterator[ConversionResult]:
+    """
+    Convert workbooks, yielding one result per file in input order.
+
+    With `jobs > 1` files are parsed on a process pool (workbook parsing is
+    CPU-bound, so threads would serialize on the GIL). Results are still
+    yielded in input order, each as soon as it and every earlier file are
+    done, so progress output is deterministic. Failures are captured per file
+    instead of aborting the run. `schools` is a school catalogue file used to
+    set `metadata.canonical_school_id`.
+
+    Example:
+        for result in convert_files(files, Path("data/rankings"), jobs=4):
+            print(result.output_path if result.ok else result.error)
+    """
+    if jobs <= 1 or len(files) <= 1:
+        for path in files:
+            yield _convert_one(path, output_dir, header_aliases, output_format, schools=schools)
+        return
+
+    # Workers profile themselves and send their stage timings back with the result.
+    profiler = active()
+    with ProcessPoolExecutor(max_workers=min(jobs, len(files))) as executor:
+        futures = [
+            executor.submit(
+                _convert_one, path, output_dir, header_aliases, output_format, profiler is not None, schools
+            )
+            for path in files
+        ]
+        for path, future in zip(files, futures):
+            try:
+                result = future.result()
+            except Exception as exc:  # noqa: BLE001 - e.g. a worker process died
+                result = ConversionResult(source=path, elapsed=0.0, error=str(exc) or type(exc).__name__)
+            if profiler is not None and result.stages:
+                profiler.merge(result.stages)
+            yield result
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Convert FT Excel rankings to normalized JSON.")
     parser.add_argument("--input-dir", default="data/financial_times", help="Directory containing FT Excel exports.")
     parser.add_argument("--output-dir", default="data/rankings", help="Directory to write JSON payloads.")
+    parser.add_argument(
+        "--header-aliases",
+        default=None,
+        help="JSON file of extra header aliases per field, e.g. {\"school_name\": [\"institution name\"]}.",
+    )
+    parser.add_argument(
+        "--format",
+        dest="output_format",
+        choices=OUTPUT_FORMATS,
+        default="json",
+        help="Output format; ndjson writes a header line, then one entry per line (default: json).",
+    )
+    parser.add_argument(
+        "--schools",
+        default=None,
+        help="School catalogue (JSON array of {id, name, aliases}); matched entries get metadata.canonical_school_id.",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Convert every workbook, even those unchanged since the last run.",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print a per-stage breakdown (wall, CPU, rows, bytes) to stderr when done.",
+    )
+    parser.add_argument(
+        "--profile-out",
+        default=None,
+        help="Also write cProfile stats of the main process to this file (implies --profile).",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes (0 = one per CPU).",
+    )
     return parser.parse_args()
 
 
 def main() -> None:
     args = parse_args()
+    with profiled(args.profile, args.profile_out):
+        _run(args)
+
+
+def _run(args: argparse.Namespace) -> None:
     input_dir = Path(args.input_dir)
     output_dir = Path(args.output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
+    header_aliases = None
+    if args.header_aliases:
+        try:
+            header_aliases = normalize_header_aliases(json.loads(Path(args.header_aliases).read_text(encoding="utf-8")))
+        except ValueError as exc:
+            raise SystemExit(f"Invalid --header-aliases {args.header_aliases}: {exc}") from exc
+
     files = list(discover_files(input_dir))
     if not files:
         raise SystemExit(f"No .xlsx files found in {input_dir}")
 
-    for file_path in files:
-        output_path = convert_file(file_path, output_dir)
-        print(f"Wrote {output_path}")
+    schools = Path(args.schools) if args.schools else None
+    if schools is not None:
+        _load_catalogue(str(schools))  # fail fast on an invalid catalogue
+    fingerprint = conversion_fingerprint(
+        header_aliases, args.output_format, file_sha256(schools) if schools is not None else None
+    )
+    manifest = ConversionManifest.load(output_dir, fingerprint)
+    pending = files if args.force else [path for path in files if not manifest.is_current(path)]
+    unchanged = len(files) - len(pending)
+
+    jobs = args.jobs or os.cpu_count() or 1
+    failures: List[ConversionResult] = []
+    for result in convert_files(
+        pending, output_dir, header_aliases, jobs=jobs, output_format=args.output_format, schools=schools
+    ):
+        if result.ok and result.output_path is not None:
+            manifest.record(result.source, result.output_path)
+            print(f"Wrote {result.output_path} ({result.elapsed:.2f}s)")
+        else:
+            print(f"FAILED {result.source.name}: {result.error}")
+            failures.append(result)
+
+    for removed in manifest.prune(files):
+        print(f"Removed {removed} (source workbook deleted)")
+    manifest.save()
+
+    print(f"{len(pending) - len(failures)} converted, {unchanged} unchanged, {len(failures)} failed")
+    if failures:
+        print("Errors:")
+        for result in failures:
+            print(f"  {result.source}: {result.error}")
+        raise SystemExit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+CANONICAL_FIELDS = ("rank", "school_name", "program_name", "country", "city", "score", "notes", "link")
+
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9#]+")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Trie node key holding the (priority, canonical) of an alias ending at that node.
+_END = ""
+
+
+def normalize_header(value: str) -> str:
+    """Lowercase, turn punctuation into spaces and collapse whitespace."""
+    cleaned = _NON_ALNUM_RE.sub(" ", value.lower())
+    return _WHITESPACE_RE.sub(" ", cleaned).strip()
+
+
+def normalize_header_aliases(data: Any) -> Dict[str, List[str]]:
+    """
+    Validate user-supplied header aliases (config `header_aliases`, converter `--header-aliases`).
+
+    Example:
+        normalize_header_aliases({"school_name": ["institution name"]})
+    """
+    if not isinstance(data, Mapping) or not all(
+        isinstance(aliases, list) and all(isinstance(alias, str) for alias in aliases) for aliases in data.values()
+    ):
+        raise ValueError("header_aliases must map field names to lists of strings")
+    unknown = [str(field) for field in data if field not in CANONICAL_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown header fields: {', '.join(unknown)}. Expected: {', '.join(CANONICAL_FIELDS)}")
+    return {str(field): list(aliases) for field, aliases in data.items()}
+
+
+class HeaderIndex:
+    """
+    Compiled header-to-field matcher.
+
+    A header maps to the first canonical field (in alias declaration order)
+    having an alias that equals, or is a prefix of, the normalized header.
+    Aliases are normalized once into a character trie, so a lookup walks the
+    header once instead of scanning every alias, and repeated header strings
+    are answered from an LRU memo.
+
+    `extend()` layers per-source aliases on top of an index without
+    recompiling it; the extension is consulted first.
+
+    Example:
+        index = HeaderIndex({"rank": ["rank", "#"], "school_name": ["school"]})
+        index.match("Rank 2024")  # "rank"
+        qs = index.extend({"school_name": ["institution name"]})
+        qs.match("Institution Name")  # "school_name"
+    """
+
+    def __init__(self, aliases: Mapping[str, Sequence[str]], base: Optional["HeaderIndex"] = None) -> None:
+        unknown = [field for field in aliases if field not in CANONICAL_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown header fields: {', '.join(unknown)}. Expected: {', '.join(CANONICAL_FIELDS)}")
+        self.base = base
+        self._trie: Dict[str, Any] = {}
+        priority = 0
+        for canonical, field_aliases in aliases.items():
+            for alias in field_aliases:
+                self._insert(normalize_header(alias), (priority, canonical))
+                priority += 1
+        self.match = lru_cache(maxsize=1024)(self._match)
+
+    def _insert(self, alias: str, value: Tuple[int, str]) -> None:
+        node = self._trie
+        for char in alias:
+            node = node.setdefault(char, {})
+        existing: Optional[Tuple[int, str]] = node.get(_END)
+        if existing is None or existing[0] > value[0]:
+            node[_END] = value
+
+    def _lookup(self, normalized: str) -> Optional[str]:
+        best: Optional[Tuple[int, str]] = None
+        node: Optional[Dict[str, Any]] = self._trie
+        for char in normalized:
+            node = node.get(char)
+            if node is None:
+                break
+            found: Optional[Tuple[int, str]] = node.get(_END)
+            if found is not None and (best is None or found[0] < best[0]):
+                best = found
+        return best[1] if best is not None else None
+
+    def _match(self, header: str) -> Optional[str]:
+        normalized = normalize_header(header)
+        index: Optional[HeaderIndex] = self
+        while index is not None:
+            canonical = index._lookup(normalized)
+            if canonical is not None:
+                return canonical
+            index = index.base
+        return None
+
+    def extend(self, aliases: Mapping[str, Sequence[str]]) -> "HeaderIndex":
+        """Return an index matching `aliases` first, then this index."""
+        return HeaderIndex(aliases, base=self)
+
+    def build_header_map(self, headers: Sequence[object]) -> Dict[int, str]:
+        """Map column positions to canonical fields, skipping unknown headers."""
+        mapping: Dict[int, str] = {}
+        for idx, header in enumerate(headers):
+            canonical = self.match(str(header))
+            if canonical:
+                mapping[idx] = canonical
+        return mapping
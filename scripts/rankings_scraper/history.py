@@ -0,0 +1,432 @@
+"""
+Local multi-year ranking history backed by SQLite.
+
+Usage:
+    PYTHONPATH=. python3 -m scripts.rankings_scraper.history --db data/rankings/history.sqlite import data/rankings
+    PYTHONPATH=. python3 -m scripts.rankings_scraper.history --db data/rankings/history.sqlite trajectory "HEC Paris" --type mim --from 2021 --to 2025
+    PYTHONPATH=. python3 -m scripts.rankings_scraper.history --db data/rankings/history.sqlite movers --type mim --year 2025 --limit 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .canonical import CANONICAL_ID_KEY, school_key
+from .conversion_manifest import MANIFEST_NAME
+from .delta import DELTA_SUFFIX
+from .models import NdjsonLeaderboardReader, RankingEntry, leaderboard_format, load_leaderboard
+
+# Bumped when the layout changes; older files are dropped and rebuilt by the next import.
+SCHEMA_VERSION = 2
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS leaderboards (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    master_type TEXT NOT NULL,
+    category TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    region TEXT NOT NULL DEFAULT '',
+    source_url TEXT NOT NULL,
+    scraped_at TEXT,
+    entry_count INTEGER NOT NULL,
+    UNIQUE (source, master_type, category, year, region)
+);
+CREATE TABLE IF NOT EXISTS entries (
+    leaderboard_id INTEGER NOT NULL REFERENCES leaderboards(id) ON DELETE CASCADE,
+    canonical_id TEXT,
+    school_key TEXT NOT NULL,
+    master_type TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    rank INTEGER NOT NULL,
+    school_name TEXT NOT NULL,
+    program_name TEXT,
+    country TEXT,
+    score REAL
+);
+CREATE INDEX IF NOT EXISTS entries_school_type_year ON entries (school_key, master_type, year);
+CREATE INDEX IF NOT EXISTS entries_canonical_type_year ON entries (canonical_id, master_type, year);
+CREATE INDEX IF NOT EXISTS entries_leaderboard_rank ON entries (leaderboard_id, rank);
+CREATE INDEX IF NOT EXISTS entries_type_year ON entries (master_type, year);
+CREATE TABLE IF NOT EXISTS school_ids (
+    school_key TEXT PRIMARY KEY,
+    canonical_id TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS school_ids_canonical ON school_ids (canonical_id);
+CREATE TABLE IF NOT EXISTS imported_files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+"""
+
+
+def history_keys(entry: RankingEntry) -> Tuple[Optional[str], str]:
+    """Canonical school id (None when the entry was not canonicalised) and normalised name of an entry."""
+    canonical = entry.metadata.get(CANONICAL_ID_KEY) if entry.metadata else None
+    return (str(canonical) if canonical else None), school_key(entry.school_name)
+
+
+def leaderboard_files(directory: Path) -> List[Path]:
+    """JSON and NDJSON leaderboards in `directory`, without delta files or the converter manifest."""
+    return [
+        path
+        for path in sorted(Path(directory).iterdir())
+        if path.suffix in (".json", ".ndjson") and not path.name.endswith(DELTA_SUFFIX) and path.name != MANIFEST_NAME
+    ]
+
+
+@dataclass(frozen=True)
+class TrajectoryPoint:
+    year: int
+    source: str
+    category: str
+    rank: int
+    score: Optional[float]
+    school_name: str
+    program_name: Optional[str]
+
+
+@dataclass(frozen=True)
+class Mover:
+    school_name: str
+    previous_rank: int
+    rank: int
+
+    @property
+    def change(self) -> int:
+        """Places gained (positive) or lost (negative)."""
+        return self.previous_rank - self.rank
+
+
+class HistoryStore:
+    """
+    SQLite store of every leaderboard ever imported, indexed for per-school queries.
+
+    One row per leaderboard (source, master_type, category, year, region);
+    re-adding a leaderboard replaces its entries. Entries carry their
+    canonical school id, when canonicalisation gave one, and their
+    normalised name (`history_keys`), each indexed with (master_type, year),
+    so a trajectory is an index range scan rather than a pass over every
+    payload file. Names seen with a canonical id are remembered, so a school
+    is followed across years whether or not each import was canonicalised.
+    Inserts use `executemany` in one transaction; the database runs in WAL
+    mode so readers are not blocked by an import.
+
+    Example:
+        with HistoryStore(Path("data/rankings/history.sqlite")) as store:
+            store.import_dir(Path("data/rankings"))
+            for point in store.trajectory("HEC Paris", master_type="mim", years=(2021, 2025)):
+                print(point.year, point.rank)
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(self.path))
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("PRAGMA foreign_keys=ON")
+        if self.connection.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self.connection.executescript(
+                "DROP TABLE IF EXISTS entries; DROP TABLE IF EXISTS leaderboards;"
+                " DROP TABLE IF EXISTS school_ids; DROP TABLE IF EXISTS imported_files;"
+            )
+            self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self) -> "HistoryStore":
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def add(self, leaderboard: Any, entries: Optional[Iterable[RankingEntry]] = None) -> int:
+        """
+        Store a leaderboard (LeaderboardPayload, ColumnarLeaderboard or stream); returns its entry count.
+
+        Entries (`leaderboard.entries` unless given) are consumed once, so a
+        stream or NDJSON reader is inserted without being materialised.
+        """
+        region = leaderboard.region or ""
+        with self.connection:
+            self.connection.execute(
+                "DELETE FROM leaderboards WHERE source = ? AND master_type = ? AND category = ? AND year = ? AND region = ?",
+                (leaderboard.source, leaderboard.master_type, leaderboard.category, leaderboard.year, region),
+            )
+            cursor = self.connection.execute(
+                "INSERT INTO leaderboards (source, master_type, category, year, region, source_url, scraped_at, entry_count)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, 0)",
+                (
+                    leaderboard.source,
+                    leaderboard.master_type,
+                    leaderboard.category,
+                    leaderboard.year,
+                    region,
+                    leaderboard.source_url,
+                    leaderboard.scraped_at,
+                ),
+            )
+            leaderboard_id = cursor.lastrowid
+            source_entries = leaderboard.entries if entries is None else entries
+            rows = self._entry_rows(leaderboard_id, leaderboard.master_type, leaderboard.year, source_entries)
+            count = self.connection.executemany(
+                "INSERT INTO entries"
+                " (leaderboard_id, canonical_id, school_key, master_type, year, rank, school_name, program_name, country, score)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            ).rowcount
+            self.connection.execute(
+                "INSERT OR IGNORE INTO school_ids (school_key, canonical_id)"
+                " SELECT DISTINCT school_key, canonical_id FROM entries"
+                " WHERE leaderboard_id = ? AND canonical_id IS NOT NULL",
+                (leaderboard_id,),
+            )
+            self.connection.execute("UPDATE leaderboards SET entry_count = ? WHERE id = ?", (count, leaderboard_id))
+        return count
+
+    @staticmethod
+    def _entry_rows(
+        leaderboard_id: int, master_type: str, year: int, entries: Iterable[RankingEntry]
+    ) -> Iterator[Tuple[Any, ...]]:
+        for entry in entries:
+            yield (
+                leaderboard_id,
+                *history_keys(entry),
+                master_type,
+                year,
+                entry.rank,
+                entry.school_name,
+                entry.program_name,
+                entry.country,
+                entry.score,
+            )
+
+    def add_file(self, path: Path) -> int:
+        """Store a leaderboard file written by the scraper or converter (JSON or NDJSON)."""
+        path = Path(path)
+        if leaderboard_format(path) == "json":
+            return self.add(load_leaderboard(path))
+        with NdjsonLeaderboardReader(path) as reader:
+            return self.add(reader, entries=reader)
+
+    def import_dir(self, directory: Path, *, force: bool = False) -> Tuple[int, int, List[str]]:
+        """
+        Import every leaderboard file in `directory`, skipping files unchanged since their last import.
+
+        Delta files and the converter manifest are ignored. Returns
+        (imported, unchanged, errors).
+        """
+        imported = unchanged = 0
+        errors: List[str] = []
+        for path in leaderboard_files(directory):
+            stat = path.stat()
+            key = str(path.resolve())
+            known = self.connection.execute("SELECT size, mtime_ns FROM imported_files WHERE path = ?", (key,)).fetchone()
+            if not force and known == (stat.st_size, stat.st_mtime_ns):
+                unchanged += 1
+                continue
+            try:
+                self.add_file(path)
+            except (OSError, ValueError, KeyError, TypeError) as exc:
+                errors.append(f"{path.name}: {exc}")
+                continue
+            with self.connection:
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO imported_files (path, size, mtime_ns) VALUES (?, ?, ?)",
+                    (key, stat.st_size, stat.st_mtime_ns),
+                )
+            imported += 1
+        return imported, unchanged, errors
+
+    def trajectory(
+        self,
+        school: str,
+        *,
+        master_type: Optional[str] = None,
+        source: Optional[str] = None,
+        years: Optional[Tuple[int, int]] = None,
+    ) -> List[TrajectoryPoint]:
+        """
+        Ranks of a school over the years, oldest first.
+
+        `school` is a school name (matched on its normalised key) or a
+        canonical id prefixed with "id:". A name seen with a canonical id
+        resolves to that id; the school then matches entries carrying the id
+        and entries without an id under any name seen with it.
+        """
+        if school.startswith("id:"):
+            canonical: Optional[str] = school[3:]
+            names: List[str] = []
+        else:
+            names = [school_key(school)]
+            known = self.connection.execute("SELECT canonical_id FROM school_ids WHERE school_key = ?", names).fetchone()
+            canonical = known[0] if known else None
+        if canonical is not None:
+            names += [
+                name
+                for (name,) in self.connection.execute("SELECT school_key FROM school_ids WHERE canonical_id = ?", (canonical,))
+                if name not in names
+            ]
+        filters: List[str] = []
+        filter_params: List[Any] = []
+        if master_type is not None:
+            filters.append("AND e.master_type = ?")
+            filter_params.append(master_type)
+        if years is not None:
+            filters.append("AND e.year BETWEEN ? AND ?")
+            filter_params.extend(years)
+        if source is not None:
+            filters.append("AND l.source = ?")
+            filter_params.append(source)
+        # One indexed branch per key: SQLite will not use either index for an OR across the two columns.
+        select = (
+            "SELECT e.year, l.source, l.category, e.rank, e.score, e.school_name, e.program_name"
+            " FROM entries e JOIN leaderboards l ON l.id = e.leaderboard_id WHERE "
+        )
+        placeholders = ", ".join("?" * len(names))
+        sql = [
+            select + "e.canonical_id = ?",
+            *filters,
+            "UNION ALL",
+            select + f"e.canonical_id IS NULL AND e.school_key IN ({placeholders})",
+            *filters,
+            "ORDER BY 1, 2, 4",
+        ]
+        params = [canonical, *filter_params, *names, *filter_params]
+        return [TrajectoryPoint(*row) for row in self.connection.execute(" ".join(sql), params)]
+
+    def movers(
+        self,
+        *,
+        master_type: str,
+        year: int,
+        source: Optional[str] = None,
+        previous_year: Optional[int] = None,
+        limit: int = 10,
+    ) -> Tuple[List[Mover], List[Mover]]:
+        """
+        Biggest risers and fallers between `previous_year` (default: year - 1) and `year`.
+
+        Schools are compared within the same source and category, by
+        canonical id when one is known for the entry or its name; a school
+        listed several times in one leaderboard counts with its best rank.
+        """
+        previous_year = year - 1 if previous_year is None else previous_year
+        source_filter = "AND l.source = ?" if source is not None else ""
+        best = (
+            "SELECT l.source, l.category,"
+            " COALESCE('id:' || COALESCE(e.canonical_id, s.canonical_id), e.school_key) AS school,"
+            " MIN(e.rank) AS rank, MIN(e.school_name) AS school_name"
+            " FROM entries e JOIN leaderboards l ON l.id = e.leaderboard_id"
+            " LEFT JOIN school_ids s ON s.school_key = e.school_key"
+            f" WHERE e.master_type = ? AND e.year = ? {source_filter}"
+            " GROUP BY l.source, l.category, school"
+        )
+        sql = (
+            f"SELECT cur.school_name, prev.rank, cur.rank FROM ({best}) cur JOIN ({best}) prev"
+            " ON prev.source = cur.source AND prev.category = cur.category AND prev.school = cur.school"
+            " WHERE prev.rank != cur.rank"
+        )
+        params: List[Any] = [master_type, year] + ([source] if source is not None else [])
+        params += [master_type, previous_year] + ([source] if source is not None else [])
+        moves = [Mover(*row) for row in self.connection.execute(sql, params)]
+        risers = sorted((m for m in moves if m.change > 0), key=lambda m: (-m.change, m.rank))[:limit]
+        fallers = sorted((m for m in moves if m.change < 0), key=lambda m: (m.change, m.rank))[:limit]
+        return risers, fallers
+
+    def summary(self) -> str:
+        leaderboards, entries = self.connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(entry_count), 0) FROM leaderboards"
+        ).fetchone()
+        return f"{leaderboards} leaderboards, {entries} entries"
+
+
+def _print_table(rows: Sequence[Sequence[str]]) -> None:
+    widths = [max(len(row[col]) for row in rows) for col in range(len(rows[0]))]
+    for row in rows:
+        print("  ".join(value.ljust(widths[col]) for col, value in enumerate(row)).rstrip())
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Query the multi-year ranking history.")
+    parser.add_argument("--db", default="data/rankings/history.sqlite", help="SQLite history file.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    importer = commands.add_parser("import", help="Import leaderboard files (JSON or NDJSON) from a directory.")
+    importer.add_argument("directory", help="Directory of leaderboard payloads, e.g. data/rankings.")
+    importer.add_argument("--force", action="store_true", help="Re-import files even if unchanged.")
+
+    trajectory = commands.add_parser("trajectory", help="Rank of one school across years.")
+    trajectory.add_argument("school", help="School name, or id:<canonical_school_id>.")
+    trajectory.add_argument("--type", dest="master_type", default=None, help="Master type, e.g. mim.")
+    trajectory.add_argument("--source", default=None, help="Only this source, e.g. 'Financial Times'.")
+    trajectory.add_argument("--from", dest="year_from", type=int, default=None, help="First year.")
+    trajectory.add_argument("--to", dest="year_to", type=int, default=None, help="Last year.")
+
+    movers = commands.add_parser("movers", help="Biggest year-over-year risers and fallers.")
+    movers.add_argument("--type", dest="master_type", required=True, help="Master type, e.g. mim.")
+    movers.add_argument("--year", type=int, required=True, help="Year to compare with the previous one.")
+    movers.add_argument("--previous-year", type=int, default=None, help="Year to compare against (default: year - 1).")
+    movers.add_argument("--source", default=None, help="Only this source.")
+    movers.add_argument("--limit", type=int, default=10, help="Risers and fallers to show (default: 10).")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = build_parser().parse_args(argv)
+    with HistoryStore(Path(args.db)) as store:
+        started = time.perf_counter()
+        if args.command == "import":
+            imported, unchanged, errors = store.import_dir(Path(args.directory), force=args.force)
+            print(f"{imported} imported, {unchanged} unchanged, {len(errors)} failed ({store.summary()})")
+            for error in errors:
+                print(f"  {error}")
+            if errors:
+                raise SystemExit(1)
+            return
+        if args.command == "trajectory":
+            years = None
+            if args.year_from is not None or args.year_to is not None:
+                years = (args.year_from or 1900, args.year_to or 9999)
+            points = store.trajectory(args.school, master_type=args.master_type, source=args.source, years=years)
+            elapsed = time.perf_counter() - started
+            if not points:
+                print(f"No history for {args.school}")
+                return
+            rows = [("YEAR", "RANK", "SCORE", "SOURCE", "CATEGORY", "SCHOOL / PROGRAMME")]
+            for point in points:
+                label = point.school_name + (f" / {point.program_name}" if point.program_name else "")
+                score = f"{point.score:g}" if point.score is not None else "-"
+                rows.append((str(point.year), str(point.rank), score, point.source, point.category, label))
+            _print_table(rows)
+            print(f"{len(points)} rows in {elapsed * 1000:.1f} ms")
+            return
+        risers, fallers = store.movers(
+            master_type=args.master_type,
+            year=args.year,
+            source=args.source,
+            previous_year=args.previous_year,
+            limit=args.limit,
+        )
+        elapsed = time.perf_counter() - started
+        for title, moves in (("Risers", risers), ("Fallers", fallers)):
+            print(f"{title}:")
+            if not moves:
+                print("  (none)")
+                continue
+            rows = [("CHANGE", "FROM", "TO", "SCHOOL")]
+            rows += [(f"{move.change:+d}", str(move.previous_rank), str(move.rank), move.school_name) for move in moves]
+            _print_table(rows)
+        print(f"computed in {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
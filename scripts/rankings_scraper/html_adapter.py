@@ -1,12 +1,21 @@
 from __future__ import annotations
 
 import re
-from typing import Dict, List, Optional
-
-import requests
-from bs4 import BeautifulSoup
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
 
+from .header_index import HeaderIndex
+from .html_scan import iter_header_tables, locate_header_table
+from .http_cache import HttpCache
 from .models import LeaderboardPayload, RankingEntry
+from .pagination import PaginationConfig, merge_pages, new_entries
+from .parser_backends import ParsedTable, ParserBackend, TableCell, get_parser_backend
+from .pipeline import LeaderboardStream
+from .profiling import span, timed_iter
+
+if TYPE_CHECKING:
+    import requests
 
 HEADER_ALIASES: Dict[str, List[str]] = {
     "rank": ["rank", "position", "#"],
@@ -19,25 +28,15 @@ HEADER_ALIASES: Dict[str, List[str]] = {
     "link": ["link", "url", "website"],
 }
 
+HEADER_INDEX = HeaderIndex(HEADER_ALIASES)
+
 
 def _clean_text(value: str) -> str:
     return re.sub(r"\s+", " ", value).strip()
 
 
-def _normalize_header(value: str) -> str:
-    lowered = value.lower()
-    cleaned = re.sub(r"[^a-z0-9#]+", " ", lowered)
-    return _clean_text(cleaned)
-
-
-def _match_header(header: str) -> Optional[str]:
-    normalized = _normalize_header(header)
-    for canonical, aliases in HEADER_ALIASES.items():
-        for alias in aliases:
-            alias_norm = _normalize_header(alias)
-            if normalized == alias_norm or normalized.startswith(alias_norm):
-                return canonical
-    return None
+def _text_or_none(cell: TableCell) -> Optional[str]:
+    return cell.text or None
 
 
 def _parse_rank_value(raw: Optional[str]) -> Optional[int]:
@@ -58,10 +57,44 @@ class HtmlTableAdapter:
     Adapter parsing simple HTML tables into normalized leaderboard entries.
 
     Designed for quick reuse across ranking sources that expose tabular data.
+    Pass a shared `session` (see `http_client.build_session`) to reuse pooled
+    keep-alive connections across adapters; otherwise one is built on first fetch.
+    With a `cache`, fetches become conditional GETs and unchanged pages are
+    served from disk on 304. `table_only` (default) builds a tree for the
+    ranking table alone instead of the whole page. `parser` selects the HTML
+    backend ("html.parser", "lxml", "selectolax" or "auto"). `header_aliases`
+    adds per-source header aliases, matched before the built-in ones.
+    With `all_tables`, every table with rank and school columns is read and
+    the rows are merged in rank order instead of stopping at the first table.
+    `stream()` yields entries lazily; `scrape()` collects them into a payload;
+    `stream_pages()` walks a ranking split across numbered pages.
     """
 
-    def __init__(self, timeout: float = 10.0) -> None:
+    def __init__(
+        self,
+        timeout: float = 10.0,
+        session: Optional[requests.Session] = None,
+        cache: Optional[HttpCache] = None,
+        table_only: bool = True,
+        parser: str = "html.parser",
+        header_aliases: Optional[Mapping[str, Sequence[str]]] = None,
+        all_tables: bool = False,
+    ) -> None:
         self.timeout = timeout
+        self._session = session
+        self.cache = cache
+        self.table_only = table_only
+        self.backend: ParserBackend = get_parser_backend(parser)
+        self.header_index = HEADER_INDEX.extend(header_aliases) if header_aliases else HEADER_INDEX
+        self.all_tables = all_tables
+
+    @property
+    def session(self) -> requests.Session:
+        if self._session is None:
+            from .http_client import build_session  # deferred: imports requests
+
+            self._session = build_session()
+        return self._session
 
     def scrape(
         self,
@@ -86,9 +119,37 @@ class HtmlTableAdapter:
             region: Optional region.
             html_override: Raw HTML to parse instead of fetching (useful for tests).
         """
+        return self.stream(
+            master_type=master_type,
+            year=year,
+            source=source,
+            url=url,
+            category=category,
+            region=region,
+            html_override=html_override,
+        ).collect()
+
+    def stream(
+        self,
+        *,
+        master_type: str,
+        year: int,
+        source: str,
+        url: str,
+        category: str,
+        region: Optional[str] = None,
+        html_override: Optional[str] = None,
+    ) -> LeaderboardStream:
+        """
+        Fetch the page and return its entries as a lazily validated stream.
+
+        The page is fetched and the table headers are checked before
+        returning; rows are turned into entries as the stream is consumed.
+        Arguments are the same as `scrape()`.
+        """
         html = html_override or self._fetch_html(url)
-        entries = self._parse_table(html)
-        payload = LeaderboardPayload(
+        entries = merge_pages([self._all_table_entries(html)]) if self.all_tables else self._iter_table(html)
+        return LeaderboardStream(
             master_type=master_type,
             source=source,
             category=category,
@@ -97,105 +158,220 @@ class HtmlTableAdapter:
             region=region,
             entries=entries,
         )
-        payload.validate()
-        return payload
+
+    def stream_pages(
+        self,
+        *,
+        master_type: str,
+        year: int,
+        source: str,
+        category: str,
+        pagination: PaginationConfig,
+        url: Optional[str] = None,
+        region: Optional[str] = None,
+    ) -> LeaderboardStream:
+        """
+        Fetch and parse every page of a paginated ranking, then stream the merged entries.
+
+        Up to `pagination.workers` pages are fetched and parsed at once on a
+        thread pool; results are consumed in page order, so when the last
+        page is unknown at most `workers - 1` fetches past it are wasted.
+        The first page must hold a ranking table (and, with a fixed
+        `pagination.pages`, every page must). Entries are merged in rank
+        order with rows repeated across page boundaries dropped. `url`
+        (default: the first page) is recorded as the payload's source URL.
+
+        Example:
+            pagination = PaginationConfig(url_template="https://example.com/ranking?page={page}")
+            stream = adapter.stream_pages(master_type="mim", year=2025, source="FT", category="MiM", pagination=pagination)
+        """
+        pages = self._fetch_pages(pagination)
+        return LeaderboardStream(
+            master_type=master_type,
+            source=source,
+            category=category,
+            year=year,
+            source_url=url or pagination.page_url(pagination.start),
+            region=region,
+            entries=merge_pages(pages),
+        )
+
+    def _fetch_pages(self, pagination: PaginationConfig) -> List[List[RankingEntry]]:
+        until_empty = pagination.pages is None
+        numbers = iter(pagination.page_numbers())
+        pages: List[List[RankingEntry]] = []
+        seen: set = set()
+        in_flight: Deque[Future] = deque()
+        with ThreadPoolExecutor(max_workers=pagination.workers) as executor:
+
+            def submit(page: int) -> None:
+                required = not until_empty or page == pagination.start
+                in_flight.append(executor.submit(self._load_page, pagination.page_url(page), required=required))
+
+            for page in numbers:
+                submit(page)
+                if len(in_flight) >= pagination.workers:
+                    break
+            try:
+                while in_flight:
+                    entries = in_flight.popleft().result()
+                    if until_empty:
+                        entries = new_entries(entries, seen)
+                        if not entries:
+                            break
+                    pages.append(entries)
+                    page = next(numbers, None)
+                    if page is not None:
+                        submit(page)
+            finally:
+                for future in in_flight:
+                    future.cancel()
+        return pages
+
+    def _load_page(self, url: str, *, required: bool) -> List[RankingEntry]:
+        """
+        Fetch and parse one page of a paginated ranking.
+
+        Unless `required`, a page answering 404 or without ranking rows
+        returns [] and marks the end of the ranking.
+        """
+        try:
+            html = self._fetch_html(url)
+        except Exception as exc:
+            response = getattr(exc, "response", None)
+            if not required and response is not None and response.status_code == 404:
+                return []
+            raise
+        try:
+            return self._all_table_entries(html) if self.all_tables else list(self._iter_table(html))
+        except ValueError:
+            if required:
+                raise
+            return []
 
     def _fetch_html(self, url: str) -> str:
-        headers = {
-            "User-Agent": "deadline-tracker-scraper/1.0 (+https://github.com)",
-            "Accept": "text/html,application/xhtml+xml",
-        }
-        response = requests.get(url, headers=headers, timeout=self.timeout)
-        response.raise_for_status()
-        return response.text
+        from .http_client import DEFAULT_HEADERS  # deferred: imports requests
+
+        with span("fetch") as stage:
+            cached = self.cache.get(url) if self.cache is not None else None
+            headers = dict(DEFAULT_HEADERS)
+            if cached is not None:
+                headers.update(cached.conditional_headers())
+
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+            if cached is not None and response.status_code == 304:
+                self.cache.record_hit()
+                stage.add(bytes=len(cached.content))
+                return cached.text
+            response.raise_for_status()
+            if self.cache is not None:
+                self.cache.record_miss()
+                self.cache.store(url, response)
+            stage.add(bytes=len(response.content))
+            return response.text
 
     def _parse_table(self, html: str) -> List[RankingEntry]:
-        soup = BeautifulSoup(html, "html.parser")
-        tables = soup.find_all("table")
-        if not tables:
-            raise ValueError("No table found in HTML content; page may be dynamic (html-table adapter insufficient)")
-
-        table = None
-        headers: List[str] = []
-        for candidate in tables:
-            headers = [self._cell_text(th) for th in candidate.find_all("th")]
-            if headers:
-                table = candidate
-                break
-
-        if table is None or not headers:
-            raise ValueError("Table must have header cells (<th>); page may be dynamic (html-table adapter insufficient)")
-
-        header_map = self._build_header_map(headers)
+        return list(self._iter_table(html))
+
+    def _iter_table(self, html: str) -> Iterator[RankingEntry]:
+        """Parse the table and check its headers now; return a generator of its entries."""
+        with span("locate_table") as stage:
+            fragment = locate_header_table(html) if self.table_only else None
+            stage.add(bytes=len(html))
+        # Without a qualifying table, parse the full page so errors stay the same.
+        with span("parse_table") as stage:
+            markup = fragment if fragment is not None else html
+            table = self.backend.parse_table(markup)
+            stage.add(rows=len(table.rows), bytes=len(markup))
+
+        with span("header_map"):
+            header_map = self._build_header_map(table.headers)
         if "rank" not in header_map.values() or "school_name" not in header_map.values():
             raise ValueError("Table must contain rank and school columns")
+        return timed_iter("build_entries", self._iter_rows(table, header_map))
 
-        has_link_column = "link" in header_map.values()
-
+    def _all_table_entries(self, html: str) -> List[RankingEntry]:
+        """Entries of every table on the page with rank and school columns, in document order."""
         entries: List[RankingEntry] = []
-        for row in table.find_all("tr"):
-            cells = row.find_all(["td", "th"])
-            if len(cells) < 2 or cells[0].name == "th":
+        for fragment in iter_header_tables(html):
+            with span("parse_table") as stage:
+                table = self.backend.parse_table(fragment)
+                stage.add(rows=len(table.rows), bytes=len(fragment))
+            with span("header_map"):
+                header_map = self._build_header_map(table.headers)
+            if "rank" not in header_map.values() or "school_name" not in header_map.values():
                 continue
+            entries.extend(timed_iter("build_entries", self._iter_rows(table, header_map, require_rows=False)))
+        if not entries:
+            # Nothing usable: fall back to the single-table path for its error.
+            return list(self._iter_table(html))
+        return entries
 
-            normalized = {key: None for key in header_map.keys()}
-            school_link: Optional[str] = None
-            for idx, cell in enumerate(cells):
-                canonical = header_map.get(idx)
-                if canonical is None:
-                    continue
-                if canonical == "school_name":
-                    school_link = self._extract_link(cell)
-                normalized[canonical] = self._extract_cell_value(cell, canonical)
-
-            rank_int = _parse_rank_value(normalized.get("rank"))
-            school_value = normalized.get("school_name")
-            if rank_int is None or school_value is None:
+    def _iter_rows(
+        self, table: ParsedTable, header_map: Dict[int, str], *, require_rows: bool = True
+    ) -> Iterator[RankingEntry]:
+        has_link_column = "link" in header_map.values()
+        columns = self._build_columns(header_map)
+
+        produced = False
+        for cells in table.rows:
+            width = len(cells)
+            fields: Dict[str, Any] = {}
+            school_cell: Optional[TableCell] = None
+            for canonical, indexes, normalise in columns:
+                for idx in indexes:
+                    if idx < width:
+                        cell = cells[idx]
+                        fields[canonical] = normalise(cell)
+                        if canonical == "school_name":
+                            school_cell = cell
+                        break
+
+            rank_int = fields.get("rank")
+            if rank_int is None or school_cell is None:
                 continue
 
-            link_value = normalized.get("link") or (school_link if not has_link_column else None)
+            link_value = fields.get("link") or (school_cell.href if not has_link_column else None)
             entry = RankingEntry(
                 rank=rank_int,
-                school_name=_clean_text(school_value),
-                program_name=_clean_text(normalized["program_name"]) if normalized.get("program_name") else None,
-                country=_clean_text(normalized["country"]) if normalized.get("country") else None,
-                city=_clean_text(normalized["city"]) if normalized.get("city") else None,
-                score=self._parse_score(normalized.get("score")),
-                notes=_clean_text(normalized["notes"]) if normalized.get("notes") else None,
+                school_name=fields["school_name"],
+                program_name=fields.get("program_name"),
+                country=fields.get("country"),
+                city=fields.get("city"),
+                score=fields.get("score"),
+                notes=fields.get("notes"),
                 link=link_value,
                 metadata={},
             )
-            entries.append(entry)
+            produced = True
+            yield entry
 
-        if not entries:
+        if require_rows and not produced:
             raise ValueError("No entries parsed from table")
-        return entries
 
     def _build_header_map(self, headers: List[str]) -> Dict[int, str]:
-        mapping: Dict[int, str] = {}
-        for idx, header in enumerate(headers):
-            canonical = _match_header(header)
-            if canonical:
-                mapping[idx] = canonical
-        return mapping
-
-    def _extract_cell_value(self, cell, canonical: str) -> Optional[str]:
-        link = cell.find("a")
-        if canonical == "link" and link and link.get("href"):
-            return link.get("href")
-        if canonical == "school_name" and link and link.get("href"):
-            return link.text or link.get("href")
-        return self._cell_text(cell)
-
-    def _extract_link(self, cell) -> Optional[str]:
-        link = cell.find("a")
-        if link and link.get("href"):
-            return link.get("href")
-        return None
+        return self.header_index.build_header_map(headers)
 
-    def _cell_text(self, element) -> str:
-        text = element.get_text(separator=" ", strip=True)
-        return _clean_text(text)
+    def _build_columns(self, header_map: Dict[int, str]) -> List[Tuple[str, Tuple[int, ...], Callable[[TableCell], Any]]]:
+        """
+        Precompute, per canonical field, the cell positions to read and its normaliser.
+
+        When several headers map to the same field the right-most cell present in
+        the row wins, so positions are tried from last to first.
+        """
+        positions: Dict[str, List[int]] = {}
+        for idx, canonical in sorted(header_map.items()):
+            positions.setdefault(canonical, []).append(idx)
+        normalisers: Dict[str, Callable[[TableCell], Any]] = {
+            "rank": lambda cell: _parse_rank_value(cell.text),
+            "school_name": lambda cell: _clean_text(cell.link_text or cell.href) if cell.href else cell.text,
+            "score": lambda cell: self._parse_score(cell.text),
+            "link": lambda cell: cell.href or cell.text or None,
+        }
+        return [
+            (canonical, tuple(reversed(indexes)), normalisers.get(canonical, _text_or_none))
+            for canonical, indexes in positions.items()
+        ]
 
     def _parse_score(self, raw: Optional[str]) -> Optional[float]:
         if raw is None:
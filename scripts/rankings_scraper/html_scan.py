@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import re
+from typing import Iterator, Optional
+
+# Only the tags that matter for locating a ranking table are tokenized; the
+# rest of the page is skipped by the regex engine without building any tree.
+_TOKEN_RE = re.compile(r"<!--|<(/?)(table|th|script|style)\b[^>]*>", re.IGNORECASE)
+_RAW_TEXT_TAGS = {"script", "style"}
+_RAW_TEXT_END_RE = {tag: re.compile(rf"</{tag}\s*>", re.IGNORECASE) for tag in _RAW_TEXT_TAGS}
+
+
+def locate_header_table(html: str) -> Optional[str]:
+    """
+    Return the source of the first `<table>` containing a `<th>`, or None.
+
+    Mirrors `BeautifulSoup.find_all("table")` document order: when the first
+    `<th>` sits in nested tables, the outermost open table is the match.
+    Scanning stops as soon as that table closes, so markup after the ranking
+    is never looked at. Comments and raw-text elements (scripts, styles) are
+    skipped so tags inside them are not mistaken for markup.
+
+    Example:
+        fragment = locate_header_table(page_html)
+        soup = BeautifulSoup(fragment or page_html, "html.parser")
+    """
+    return next(iter_header_tables(html), None)
+
+
+def iter_header_tables(html: str) -> Iterator[str]:
+    """
+    Yield the source of every outermost `<table>` containing a `<th>`, in document order.
+
+    Same matching rules as `locate_header_table`; used when a ranking is
+    split across several tables on one page.
+
+    Example:
+        fragments = list(iter_header_tables(page_html))
+    """
+    open_tables = 0
+    table_start = 0
+    candidate_start: Optional[int] = None
+    pos = 0
+    while True:
+        match = _TOKEN_RE.search(html, pos)
+        if match is None:
+            break
+        if match.group(0) == "<!--":
+            end = html.find("-->", match.end())
+            if end == -1:
+                break
+            pos = end + 3
+            continue
+
+        closing = bool(match.group(1))
+        tag = match.group(2).lower()
+        pos = match.end()
+
+        if tag in _RAW_TEXT_TAGS:
+            if not closing:
+                end_match = _RAW_TEXT_END_RE[tag].search(html, pos)
+                if end_match is None:
+                    break
+                pos = end_match.end()
+            continue
+
+        if tag == "table":
+            if not closing:
+                if open_tables == 0:
+                    table_start = match.start()
+                open_tables += 1
+            elif open_tables:
+                open_tables -= 1
+                if open_tables == 0 and candidate_start is not None:
+                    yield html[candidate_start : match.end()]
+                    candidate_start = None
+        elif tag == "th" and not closing and open_tables and candidate_start is None:
+            candidate_start = table_start
+
+    if candidate_start is not None:
+        yield html[candidate_start:]
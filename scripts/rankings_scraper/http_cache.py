@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+from .fileio import atomic_write
+
+if TYPE_CHECKING:
+    import requests
+
+
+@dataclass
+class CachedPage:
+    """Cached body of a page plus the validators needed to revalidate it."""
+
+    url: str
+    content: bytes
+    encoding: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def text(self) -> str:
+        return str(self.content, self.encoding or "utf-8", errors="replace")
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers: Dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """
+    Persistent, size-bounded cache for conditional GETs keyed by URL.
+
+    Each URL maps to `<sha256>.body` (raw bytes) and `<sha256>.json`
+    (validators and encoding). Only responses carrying an ETag or
+    Last-Modified header are kept, since they are the only ones that can be
+    revalidated. Least recently used entries are evicted once the total body
+    size exceeds `max_bytes`; recency survives restarts through file mtimes.
+
+    Example:
+        cache = HttpCache(Path(".cache/rankings"), max_bytes=200 * 1024 * 1024)
+        adapter = HtmlTableAdapter(cache=cache)
+    """
+
+    def __init__(self, directory: Path, max_bytes: int = 200 * 1024 * 1024) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._load_index()
+
+    def _load_index(self) -> None:
+        found = []
+        for meta_path in self.directory.glob("*.json"):
+            body_path = meta_path.with_suffix(".body")
+            try:
+                found.append((meta_path.stat().st_mtime_ns, meta_path.stem, body_path.stat().st_size))
+            except FileNotFoundError:
+                meta_path.unlink(missing_ok=True)
+        for _mtime, key, size in sorted(found):
+            self._index[key] = size
+            self._total_bytes += size
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _paths(self, key: str) -> Tuple[Path, Path]:
+        return self.directory / f"{key}.json", self.directory / f"{key}.body"
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        """Return the cached page for `url`, or None if absent."""
+        key = self._key(url)
+        with self._lock:
+            if key not in self._index:
+                return None
+            meta_path, body_path = self._paths(key)
+            try:
+                meta = json.loads(meta_path.read_text(encoding="utf-8"))
+                content = body_path.read_bytes()
+            except (OSError, ValueError):
+                self._drop(key)
+                return None
+            self._index.move_to_end(key)
+            os.utime(meta_path)
+        return CachedPage(
+            url=url,
+            content=content,
+            encoding=meta.get("encoding"),
+            etag=meta.get("etag"),
+            last_modified=meta.get("last_modified"),
+        )
+
+    def store(self, url: str, response: requests.Response) -> None:
+        """Persist a 200 response if it can later be revalidated."""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+        if "no-store" in response.headers.get("Cache-Control", "").lower():
+            return
+        content = response.content
+        if len(content) > self.max_bytes:
+            return
+
+        key = self._key(url)
+        meta = {
+            "url": url,
+            "encoding": response.encoding or response.apparent_encoding,
+            "etag": etag,
+            "last_modified": last_modified,
+        }
+        meta_path, body_path = self._paths(key)
+        with self._lock:
+            self._drop(key)
+            atomic_write(body_path, content)
+            atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+            self._index[key] = len(content)
+            self._total_bytes += len(content)
+            while self._total_bytes > self.max_bytes and self._index:
+                oldest = next(iter(self._index))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def record_hit(self) -> None:
+        with self._lock:
+            self.hits += 1
+
+    def record_miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+
+    def _drop(self, key: str) -> None:
+        size = self._index.pop(key, None)
+        if size is not None:
+            self._total_bytes -= size
+        meta_path, body_path = self._paths(key)
+        meta_path.unlink(missing_ok=True)
+        body_path.unlink(missing_ok=True)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def summary(self) -> str:
+        return (
+            f"{self.hits} hits, {self.misses} misses, {self.evictions} evictions, "
+            f"{len(self._index)} entries ({self._total_bytes / (1024 * 1024):.1f} MB)"
+        )
+
+
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+
+USER_AGENT = "deadline-tracker-scraper/1.0 (+https://github.com)"
+
+DEFAULT_HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept": "text/html,application/xhtml+xml",
+    "Accept-Encoding": ACCEPT_ENCODING,
+}
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def build_session(
+    *,
+    pool_connections: int = 10,
+    pool_maxsize: int = 10,
+    retries: int = 3,
+    backoff_factor: float = 0.5,
+    backoff_jitter: float = 0.5,
+) -> requests.Session:
+    """
+    Build a keep-alive session with a connection pool and retrying GETs.
+
+    Idempotent requests are retried on connection errors, timeouts and
+    transient statuses with exponential backoff plus random jitter. A
+    `Retry-After` header on 429/503 responses takes precedence over backoff.
+    Once retries are exhausted the last response is returned so callers can
+    still `raise_for_status()`.
+
+    Example:
+        session = build_session(pool_maxsize=8, retries=2)
+        html = session.get("https://example.com/ranking", timeout=10).text
+    """
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=backoff_factor,
+        backoff_jitter=backoff_jitter,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from .header_index import CANONICAL_FIELDS
+from .html_adapter import HtmlTableAdapter, _clean_text, _parse_rank_value
+from .models import RankingEntry
+from .profiling import span, timed_iter
+
+# Script elements are found with one regex pass; no DOM is built.
+_SCRIPT_RE = re.compile(r"<script\b([^>]*)>(.*?)</script\s*>", re.IGNORECASE | re.DOTALL)
+_ATTR_RE = re.compile(r"""\b(id|type)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""", re.IGNORECASE)
+_JSON_TYPES = {"application/json", "application/ld+json"}
+# `window.__STATE__ = {...}` / `self.__DATA__={...}` style hydration assignments.
+_ASSIGNMENT_RE = re.compile(r"(?:^|[\s;,])(?:(?:window|self|globalThis)\.)?([A-Za-z_$][\w$]*)\s*=\s*(?=[\[{])")
+_DECODER = json.JSONDecoder()
+
+
+def _split_path(path: str) -> Tuple[str, ...]:
+    return tuple(part for part in path.split(".") if part)
+
+
+def resolve_path(data: Any, path: Tuple[str, ...]) -> Any:
+    """
+    Follow a dotted path (`props.pageProps.rows.0.name`) into parsed JSON; None when absent.
+
+    Numeric parts index lists; other parts are object keys.
+    """
+    current = data
+    for part in path:
+        if isinstance(current, Mapping):
+            current = current.get(part)
+        elif isinstance(current, list) and part.lstrip("-").isdigit():
+            index = int(part)
+            current = current[index] if -len(current) <= index < len(current) else None
+        else:
+            return None
+        if current is None:
+            return None
+    return current
+
+
+@dataclass(frozen=True)
+class JsonExtraction:
+    """
+    Where the ranking sits in a page's embedded JSON.
+
+    `script` names the blob: a script element id (`__NEXT_DATA__`) or the
+    variable of an inline assignment (`window.__INITIAL_STATE__ = {...}`);
+    by default every JSON script and assignment is tried in document order.
+    `entries` is the dotted path to the list of rows; when omitted the
+    first list of objects with rank and school fields is used. `fields`
+    maps entry fields to dotted paths inside a row; fields not listed are
+    matched from the row's keys with the header aliases.
+
+    Example:
+        JsonExtraction(
+            script="__NEXT_DATA__",
+            entries="props.pageProps.ranking.rows",
+            fields={"school_name": "school.name", "score": "scores.overall"},
+        )
+    """
+
+    script: Optional[str] = None
+    entries: Optional[str] = None
+    fields: Optional[Mapping[str, str]] = None
+
+    def __post_init__(self) -> None:
+        unknown = [field for field in self.fields or {} if field not in CANONICAL_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown json fields: {', '.join(unknown)}. Expected: {', '.join(CANONICAL_FIELDS)}")
+        if self.fields is not None and not all(isinstance(path, str) and path for path in self.fields.values()):
+            raise ValueError("json fields must map field names to non-empty paths")
+
+
+class EmbeddedJsonAdapter(HtmlTableAdapter):
+    """
+    Adapter reading rankings from JSON embedded in the page (`__NEXT_DATA__`, hydration state, JSON-LD).
+
+    Pages that render their table client-side still ship the data in a
+    script element. The script bodies are located with a regex scan and
+    decoded with `json`; no DOM is built and nothing is rendered. Rows are
+    mapped to entries with `extraction` (see `JsonExtraction`). Fetching,
+    caching, `stream()`, `scrape()` and `stream_pages()` are inherited from
+    `HtmlTableAdapter`; `all_tables` and `parser` have no effect.
+
+    Example:
+        adapter = EmbeddedJsonAdapter(extraction=JsonExtraction(entries="props.pageProps.rows"))
+        payload = adapter.scrape(master_type="mim", year=2025, source="QS", url=url, category="MiM")
+    """
+
+    def __init__(self, *args: Any, extraction: Optional[JsonExtraction] = None, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.extraction = extraction or JsonExtraction()
+        self._entries_path = _split_path(self.extraction.entries) if self.extraction.entries else None
+        self._field_paths = {field: _split_path(path) for field, path in (self.extraction.fields or {}).items()}
+
+    def _iter_table(self, html: str) -> Iterator[RankingEntry]:
+        """Decode the embedded data and pick the rows now; return a generator of their entries."""
+        with span("locate_json") as stage:
+            rows, columns = self._locate_rows(html)
+            stage.add(rows=len(rows), bytes=len(html))
+        return timed_iter("build_entries", self._iter_json_rows(rows, columns))
+
+    def _all_table_entries(self, html: str) -> List[RankingEntry]:
+        return list(self._iter_table(html))
+
+    def _iter_blobs(self, html: str) -> Iterator[Any]:
+        """Decoded JSON blobs of the page, restricted to `extraction.script` when set."""
+        wanted = self.extraction.script
+        for match in _SCRIPT_RE.finditer(html):
+            attrs = _attributes(match.group(1))
+            body = match.group(2).strip()
+            if not body:
+                continue
+            if attrs.get("type", "").lower() in _JSON_TYPES or attrs.get("id") == "__NEXT_DATA__":
+                if wanted is not None and attrs.get("id") != wanted:
+                    continue
+                try:
+                    yield json.loads(body)
+                except ValueError:
+                    continue
+                continue
+            for assignment in _ASSIGNMENT_RE.finditer(body):
+                if wanted is not None and assignment.group(1) != wanted:
+                    continue
+                try:
+                    yield _DECODER.raw_decode(body, assignment.end())[0]
+                except ValueError:
+                    continue
+
+    def _locate_rows(self, html: str) -> Tuple[List[Mapping[str, Any]], Dict[str, Tuple[str, ...]]]:
+        found_blob = False
+        for blob in self._iter_blobs(html):
+            found_blob = True
+            if self._entries_path is not None:
+                candidates: Iterator[Any] = iter([resolve_path(blob, self._entries_path)])
+            else:
+                candidates = _iter_object_lists(blob)
+            for rows in candidates:
+                if not isinstance(rows, list) or not rows:
+                    continue
+                objects = [row for row in rows if isinstance(row, Mapping)]
+                if not objects:
+                    continue
+                columns = self._build_json_columns(objects[0])
+                if "rank" in columns and "school_name" in columns:
+                    return objects, columns
+        if not found_blob:
+            name = f" '{self.extraction.script}'" if self.extraction.script else ""
+            raise ValueError(f"No embedded JSON{name} found in page (json-embedded adapter)")
+        where = f" at '{self.extraction.entries}'" if self.extraction.entries else ""
+        raise ValueError(f"Embedded JSON has no list of rows with rank and school fields{where}")
+
+    def _build_json_columns(self, sample: Mapping[str, Any]) -> Dict[str, Tuple[str, ...]]:
+        """Field -> path within a row: configured paths first, then top-level keys matched by header aliases."""
+        columns = dict(self._field_paths)
+        # Shortest key first, so "rank" wins over "rankChange" when both match.
+        keys = sorted((key for key in sample if isinstance(key, str)), key=len)
+        for idx, canonical in sorted(self._build_header_map(keys).items()):
+            columns.setdefault(canonical, (keys[idx],))
+        return columns
+
+    def _iter_json_rows(
+        self, rows: List[Mapping[str, Any]], columns: Dict[str, Tuple[str, ...]]
+    ) -> Iterator[RankingEntry]:
+        produced = False
+        for row in rows:
+            fields = {canonical: resolve_path(row, path) for canonical, path in columns.items()}
+            rank = fields.get("rank")
+            rank_int = int(rank) if _is_number(rank) else _parse_rank_value(_text(rank))
+            school = _text(fields.get("school_name"))
+            if rank_int is None or not school:
+                continue
+            score = fields.get("score")
+            produced = True
+            yield RankingEntry(
+                rank=rank_int,
+                school_name=school,
+                program_name=_text(fields.get("program_name")),
+                country=_text(fields.get("country")),
+                city=_text(fields.get("city")),
+                score=float(score) if _is_number(score) else self._parse_score(_text(score)),
+                notes=_text(fields.get("notes")),
+                link=_text(fields.get("link")),
+                metadata={},
+            )
+        if not produced:
+            raise ValueError("No entries parsed from embedded JSON")
+
+
+def _attributes(raw: str) -> Dict[str, str]:
+    return {name.lower(): double or single or bare for name, double, single, bare in _ATTR_RE.findall(raw)}
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _text(value: Any) -> Optional[str]:
+    if value is None or isinstance(value, (Mapping, list)):
+        return None
+    return _clean_text(str(value)) or None
+
+
+def _iter_object_lists(data: Any) -> Iterator[List[Any]]:
+    """Lists holding objects, breadth-first, so the shallowest ranking-like list comes first."""
+    queue = [data]
+    while queue:
+        next_level: List[Any] = []
+        for node in queue:
+            children = node.values() if isinstance(node, Mapping) else node if isinstance(node, list) else ()
+            if isinstance(node, list) and any(isinstance(item, Mapping) for item in node):
+                yield node
+            next_level.extend(child for child in children if isinstance(child, (Mapping, list)))
+        queue = next_level
@@ -3,15 +3,35 @@ from __future__ import annotations
 import argparse
 import json
 import sys
-from dataclasses import dataclass
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Any, Dict, Mapping, Optional, Type
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Type, Union
+from urllib.parse import urlsplit
 
+from .canonical import SchoolCatalogue
+from .csv_adapter import CsvAdapter
+from .delta import DeltaTracker, EntryDelta, delta_path, load_previous, write_delta
+from .header_index import normalize_header_aliases
 from .html_adapter import HtmlTableAdapter
+from .http_cache import HttpCache
+from .json_adapter import EmbeddedJsonAdapter, JsonExtraction
 from .models import LeaderboardPayload
+from .pagination import PaginationConfig
+from .parser_backends import PARSER_BACKENDS
+from .pipeline import LeaderboardStream
+from .profiling import profiled
+from .serialization import OUTPUT_FORMATS, dump_payload
+
+if TYPE_CHECKING:
+    import requests
 
 ADAPTERS: Dict[str, Type[HtmlTableAdapter]] = {
     "html-table": HtmlTableAdapter,
+    "json-embedded": EmbeddedJsonAdapter,
+    "csv": CsvAdapter,
 }
 
 
@@ -30,7 +50,22 @@ class ScrapeConfig:
             region=None,
             adapter="html-table",
             output_path="ranking.json",
+            parser="html.parser",
+            header_aliases={"school_name": ["institution name"]},
+            output_format="json",
+            pagination=PaginationConfig(url_template="https://example.com/ranking?page={page}"),
+            all_tables=False,
+            delta=False,
+            json_extraction=None,
         )
+
+    `pagination` (JSON: an object with `url_template`, and optionally
+    `start`, `pages`, `max_pages`, `workers`) fetches a ranking split across
+    numbered pages; `all_tables` merges every ranking table of a page.
+    `delta` also writes `<output>.delta.json`, the changes since the
+    previous output at `output_path`. `json_extraction` (JSON: an object
+    with optional `script`, `entries` and `fields`) tells the
+    `json-embedded` adapter where the rows sit in the page's embedded JSON.
     """
 
     url: str
@@ -41,6 +76,28 @@ class ScrapeConfig:
     region: Optional[str] = None
     adapter: str = "html-table"
     output_path: str = "ranking.json"
+    parser: str = "html.parser"
+    header_aliases: Optional[Dict[str, List[str]]] = None
+    output_format: str = "json"
+    pagination: Optional[PaginationConfig] = None
+    all_tables: bool = False
+    delta: bool = False
+    json_extraction: Optional[JsonExtraction] = None
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one config in a batch run."""
+
+    config: ScrapeConfig
+    elapsed: float
+    entries: int = 0
+    error: Optional[str] = None
+    delta: Optional[EntryDelta] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -52,12 +109,108 @@ def build_parser() -> argparse.ArgumentParser:
         default="-",
         help="Path to JSON config. Use '-' to read from stdin (default).",
     )
+    parser.add_argument(
+        "--batch",
+        default=None,
+        help="JSON array of configs, or a directory of *.json configs, scraped concurrently.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="Maximum concurrent scrapes in batch mode (default: 8).",
+    )
+    parser.add_argument(
+        "--per-host",
+        type=int,
+        default=2,
+        help="Maximum concurrent scrapes against a single host in batch mode (default: 2).",
+    )
     parser.add_argument(
         "--timeout",
         type=float,
         default=10.0,
         help="HTTP timeout in seconds (default: 10).",
     )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=3,
+        help="Retries for failed or throttled GETs, with exponential backoff (default: 3).",
+    )
+    parser.add_argument(
+        "--parser",
+        choices=["auto", *PARSER_BACKENDS],
+        default=None,
+        help="HTML parser backend; overrides the config's 'parser' (default: html.parser).",
+    )
+    parser.add_argument(
+        "--format",
+        dest="output_format",
+        choices=OUTPUT_FORMATS,
+        default=None,
+        help="Output format, overriding the config's 'output_format'; ndjson writes one entry per line (default: json).",
+    )
+    parser.add_argument(
+        "--schools",
+        default=None,
+        help="School catalogue (JSON array of {id, name, aliases}); matched entries get metadata.canonical_school_id.",
+    )
+    parser.add_argument(
+        "--delta",
+        action="store_true",
+        help="Also write <output>.delta.json with the entries added, removed, moved or rescored since the previous output.",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print a per-stage breakdown (wall, CPU, rows, bytes) to stderr when done.",
+    )
+    parser.add_argument(
+        "--profile-out",
+        default=None,
+        help="Also write cProfile stats to this file, for python -m pstats (implies --profile).",
+    )
+    replay = parser.add_mutually_exclusive_group()
+    replay.add_argument(
+        "--record",
+        default=None,
+        help="Save every HTTP response received into this cassette directory.",
+    )
+    replay.add_argument(
+        "--replay",
+        default=None,
+        help="Serve HTTP from this cassette directory through a local server instead of the network.",
+    )
+    parser.add_argument(
+        "--replay-latency",
+        type=float,
+        default=0.0,
+        help="Replay: seconds added to every response (default: 0).",
+    )
+    parser.add_argument(
+        "--replay-error-rate",
+        type=float,
+        default=0.0,
+        help="Replay: fraction of requests answered with HTTP 503 (default: 0).",
+    )
+    parser.add_argument(
+        "--replay-bandwidth-kb",
+        type=float,
+        default=None,
+        help="Replay: cap each response body at this many KB/s (default: unlimited).",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Directory for the conditional-GET page cache (disabled by default).",
+    )
+    parser.add_argument(
+        "--max-cache-mb",
+        type=float,
+        default=200.0,
+        help="Size cap of the page cache in MB; least recently used pages are evicted (default: 200).",
+    )
     return parser
 
 
@@ -75,6 +228,44 @@ def _load_config(path: str) -> Mapping[str, Any]:
     return data
 
 
+def _load_batch_configs(path: str) -> List[ScrapeConfig]:
+    source = Path(path)
+    raw_configs: List[Any] = []
+    if source.is_dir():
+        for config_path in sorted(source.glob("*.json")):
+            try:
+                raw_configs.append(json.loads(config_path.read_text(encoding="utf-8")))
+            except json.JSONDecodeError as exc:
+                raise ValueError(f"Invalid JSON config {config_path.name}: {exc}") from exc
+    else:
+        try:
+            data = json.loads(source.read_text(encoding="utf-8"))
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"Invalid JSON batch: {exc}") from exc
+        if not isinstance(data, list):
+            raise ValueError("Batch file must be a JSON array of configs")
+        raw_configs = data
+
+    if not raw_configs:
+        raise ValueError(f"No configs found in {path}")
+
+    configs: List[ScrapeConfig] = []
+    seen_outputs: Dict[str, int] = {}
+    for idx, raw in enumerate(raw_configs):
+        if not isinstance(raw, Mapping):
+            raise ValueError(f"Config #{idx} must be a JSON object")
+        try:
+            config = _normalize_config(raw)
+        except ValueError as exc:
+            raise ValueError(f"Config #{idx}: {exc}") from exc
+        output_key = str(Path(config.output_path).resolve())
+        if output_key in seen_outputs:
+            raise ValueError(f"Config #{idx} reuses output_path of config #{seen_outputs[output_key]}: {config.output_path}")
+        seen_outputs[output_key] = idx
+        configs.append(config)
+    return configs
+
+
 def _normalize_config(data: Mapping[str, Any]) -> ScrapeConfig:
     required = ["url", "master_type", "year", "source", "category"]
     missing = [key for key in required if not data.get(key)]
@@ -91,6 +282,25 @@ def _normalize_config(data: Mapping[str, Any]) -> ScrapeConfig:
 
     adapter = (data.get("adapter") or "html-table").strip()
     output_path = (data.get("output_path") or "ranking.json").strip() or "ranking.json"
+    parser = (data.get("parser") or "html.parser").strip()
+    output_format = (data.get("output_format") or "json").strip()
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"output_format must be one of: {', '.join(OUTPUT_FORMATS)}")
+
+    header_aliases = data.get("header_aliases")
+    if header_aliases is not None:
+        header_aliases = normalize_header_aliases(header_aliases)
+
+    all_tables = data.get("all_tables", False)
+    delta = data.get("delta", False)
+    if not isinstance(all_tables, bool) or not isinstance(delta, bool):
+        raise ValueError("all_tables and delta must be booleans")
+    pagination = _normalize_pagination(data["pagination"]) if data.get("pagination") is not None else None
+    json_extraction = None
+    if data.get("json_extraction") is not None:
+        if adapter != "json-embedded":
+            raise ValueError("json_extraction requires adapter 'json-embedded'")
+        json_extraction = _normalize_json_extraction(data["json_extraction"])
 
     return ScrapeConfig(
         url=str(data["url"]).strip(),
@@ -101,16 +311,93 @@ def _normalize_config(data: Mapping[str, Any]) -> ScrapeConfig:
         region=str(data["region"]).strip() if data.get("region") else None,
         adapter=adapter,
         output_path=output_path,
+        parser=parser,
+        header_aliases=header_aliases,
+        output_format=output_format,
+        pagination=pagination,
+        all_tables=all_tables,
+        delta=delta,
+        json_extraction=json_extraction,
     )
 
 
-def scrape_from_config(config: ScrapeConfig, *, timeout: float) -> LeaderboardPayload:
+def _normalize_json_extraction(data: Any) -> JsonExtraction:
+    if not isinstance(data, Mapping):
+        raise ValueError("json_extraction must be an object")
+    options: Dict[str, Any] = {}
+    for key in ("script", "entries"):
+        value = data.get(key)
+        if value is None:
+            continue
+        if not isinstance(value, str) or not value.strip():
+            raise ValueError(f"json_extraction.{key} must be a non-empty string")
+        options[key] = value.strip()
+    fields = data.get("fields")
+    if fields is not None:
+        if not isinstance(fields, Mapping):
+            raise ValueError("json_extraction.fields must map field names to paths")
+        options["fields"] = {str(field): path for field, path in fields.items()}
+    try:
+        return JsonExtraction(**options)
+    except ValueError as exc:
+        raise ValueError(f"json_extraction: {exc}") from exc
+
+
+def _normalize_pagination(data: Any) -> PaginationConfig:
+    if not isinstance(data, Mapping):
+        raise ValueError("pagination must be an object")
+    url_template = data.get("url_template")
+    if not isinstance(url_template, str) or not url_template.strip():
+        raise ValueError("pagination.url_template is required")
+    numbers: Dict[str, Optional[int]] = {}
+    for key in ("start", "pages", "max_pages", "workers"):
+        value = data.get(key)
+        if value is None:
+            continue
+        if isinstance(value, bool) or not isinstance(value, int):
+            raise ValueError(f"pagination.{key} must be an integer")
+        numbers[key] = value
+    try:
+        return PaginationConfig(url_template=url_template.strip(), **numbers)
+    except ValueError as exc:
+        raise ValueError(f"pagination: {exc}") from exc
+
+
+def stream_from_config(
+    config: ScrapeConfig,
+    *,
+    timeout: float,
+    session: Optional[requests.Session] = None,
+    cache: Optional[HttpCache] = None,
+) -> LeaderboardStream:
+    """Fetch the page (or pages) for `config` and return its entries as a lazily validated stream."""
     adapter_cls = ADAPTERS.get(config.adapter)
     if adapter_cls is None:
         raise ValueError(f"Unknown adapter '{config.adapter}'. Available: {', '.join(ADAPTERS)}")
 
-    adapter = adapter_cls(timeout=timeout)
-    payload: LeaderboardPayload = adapter.scrape(
+    options: Dict[str, Any] = {}
+    if config.json_extraction is not None:
+        options["extraction"] = config.json_extraction
+    adapter = adapter_cls(
+        timeout=timeout,
+        session=session,
+        cache=cache,
+        parser=config.parser,
+        header_aliases=config.header_aliases,
+        all_tables=config.all_tables,
+        **options,
+    )
+    if config.pagination is not None:
+        return adapter.stream_pages(
+            master_type=config.master_type,
+            year=config.year,
+            source=config.source,
+            category=config.category,
+            pagination=config.pagination,
+            url=config.url,
+            region=config.region,
+        )
+    return adapter.stream(
         master_type=config.master_type,
         year=config.year,
         source=config.source,
@@ -118,21 +405,257 @@ def scrape_from_config(config: ScrapeConfig, *, timeout: float) -> LeaderboardPa
         category=config.category,
         region=config.region,
     )
-    return payload
+
+
+def scrape_from_config(
+    config: ScrapeConfig,
+    *,
+    timeout: float,
+    session: Optional[requests.Session] = None,
+    cache: Optional[HttpCache] = None,
+) -> LeaderboardPayload:
+    return stream_from_config(config, timeout=timeout, session=session, cache=cache).collect()
+
+
+def _write_payload(
+    payload: Union[LeaderboardPayload, LeaderboardStream], output_path: Path, output_format: str = "json"
+) -> None:
+    dump_payload(payload, output_path, output_format=output_format)
+
+
+def _write_output(
+    stream: LeaderboardStream, config: ScrapeConfig, schools: Optional[SchoolCatalogue] = None
+) -> Optional[EntryDelta]:
+    """
+    Write the stream to `config.output_path`, plus its delta file when `config.delta` is set.
+
+    With `schools`, entries are canonicalised before they are written or diffed.
+    """
+    output_path = Path(config.output_path)
+    if schools is not None:
+        stream.tap(schools.canonicalize)
+    if not config.delta:
+        _write_payload(stream, output_path, config.output_format)
+        return None
+    previous = load_previous(output_path)
+    tracker = DeltaTracker(previous)
+    stream.tap(tracker.observe)
+    _write_payload(stream, output_path, config.output_format)
+    delta = tracker.finish(stream)
+    write_delta(
+        delta_path(output_path),
+        delta,
+        {
+            "output_path": str(output_path),
+            "previous_scraped_at": previous.scraped_at if previous is not None else None,
+            "scraped_at": stream.scraped_at,
+        },
+    )
+    return delta
+
+
+def _host_of(url: str) -> str:
+    return (urlsplit(url).hostname or "").lower()
+
+
+def _run_one(
+    config: ScrapeConfig,
+    *,
+    timeout: float,
+    session: requests.Session,
+    cache: Optional[HttpCache],
+    schools: Optional[SchoolCatalogue] = None,
+) -> BatchResult:
+    started = time.perf_counter()
+    try:
+        stream = stream_from_config(config, timeout=timeout, session=session, cache=cache)
+        delta = _write_output(stream, config, schools)
+    except Exception as exc:  # noqa: BLE001
+        return BatchResult(config=config, elapsed=time.perf_counter() - started, error=str(exc) or type(exc).__name__)
+    return BatchResult(config=config, elapsed=time.perf_counter() - started, entries=stream.count, delta=delta)
+
+
+def _budgeted(config: ScrapeConfig, per_host: int) -> Tuple[ScrapeConfig, str, int]:
+    """The config as run in a batch, the host it fetches from and how many of that host's slots it holds."""
+    if config.pagination is None:
+        return config, _host_of(config.url), 1
+    slots = min(config.pagination.workers, per_host)
+    pagination = replace(config.pagination, workers=slots)
+    return replace(config, pagination=pagination), _host_of(pagination.url_template), slots
+
+
+def run_batch(
+    configs: Sequence[ScrapeConfig],
+    *,
+    timeout: float,
+    workers: int = 8,
+    per_host: int = 2,
+    retries: int = 3,
+    cache: Optional[HttpCache] = None,
+    session: Optional[requests.Session] = None,
+    schools: Optional[SchoolCatalogue] = None,
+) -> List[BatchResult]:
+    """
+    Scrape many configs on a bounded thread pool, capping concurrency per host.
+
+    Jobs are dispatched in config order, skipping over jobs whose host is at its
+    cap so that a slow host never blocks workers other hosts could use. All
+    jobs share one pooled session, so configs on the same host reuse
+    keep-alive connections (pass `session` to supply it; it is not closed).
+    Failures are captured per config; results are returned in config order.
+    A `schools` catalogue, shared by all jobs, canonicalises school names.
+    Page fetches count against the same cap: a paginated job fetches at most
+    `min(pagination.workers, per_host)` pages at once and holds that many
+    of its host's slots while it runs.
+    """
+    if workers < 1:
+        raise ValueError("workers must be >= 1")
+    if per_host < 1:
+        raise ValueError("per_host must be >= 1")
+
+    pending: List[int] = list(range(len(configs)))
+    results: List[Optional[BatchResult]] = [None] * len(configs)
+    running: Dict[Future, int] = {}
+    host_load: Dict[str, int] = {}
+
+    with ExitStack() as stack:
+        if session is None:
+            from .http_client import build_session  # deferred: imports requests
+
+            session = stack.enter_context(
+                build_session(pool_connections=workers, pool_maxsize=per_host, retries=retries)
+            )
+        executor = stack.enter_context(ThreadPoolExecutor(max_workers=workers))
+        while pending or running:
+            for idx in list(pending):
+                if len(running) >= workers:
+                    break
+                config, host, slots = _budgeted(configs[idx], per_host)
+                if host_load.get(host, 0) + slots > per_host:
+                    continue
+                pending.remove(idx)
+                host_load[host] = host_load.get(host, 0) + slots
+                future = executor.submit(_run_one, config, timeout=timeout, session=session, cache=cache, schools=schools)
+                running[future] = idx
+
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                idx = running.pop(future)
+                _config, host, slots = _budgeted(configs[idx], per_host)
+                host_load[host] -= slots
+                results[idx] = replace(future.result(), config=configs[idx])
+
+    return [result for result in results if result is not None]
+
+
+def _print_batch_summary(results: Sequence[BatchResult], elapsed: float) -> None:
+    rows = [("STATUS", "ENTRIES", "SECONDS", "SOURCE", "OUTPUT / ERROR")]
+    for result in results:
+        cfg = result.config
+        rows.append(
+            (
+                "ok" if result.ok else "FAILED",
+                str(result.entries) if result.ok else "-",
+                f"{result.elapsed:.2f}",
+                f"{cfg.source} {cfg.category} {cfg.year}",
+                cfg.output_path if result.ok else (result.error or ""),
+            )
+        )
+    widths = [max(len(row[col]) for row in rows) for col in range(4)]
+    for row in rows:
+        print("  ".join(value.ljust(widths[col]) for col, value in enumerate(row[:4])) + "  " + row[4])
+
+    failures = sum(1 for result in results if not result.ok)
+    print(f"{len(results) - failures} succeeded, {failures} failed in {elapsed:.2f}s")
+
+
+@contextmanager
+def _http_session(args: argparse.Namespace, **pool: int) -> Iterator[requests.Session]:
+    """Build the run's session, recording to or replaying from a cassette when asked."""
+    from .http_client import build_session  # deferred: imports requests
+
+    with ExitStack() as stack:
+        session = stack.enter_context(build_session(retries=args.retries, **pool))
+        if args.record or args.replay:
+            from .replay import Cassette, ReplayServer
+
+            cassette = Cassette(Path(args.record or args.replay))
+            if args.record:
+                cassette.attach(session)
+                stack.callback(lambda: print(f"Recorded {cassette.recorded} responses to {cassette.directory}"))
+            else:
+                bandwidth = args.replay_bandwidth_kb
+                server = stack.enter_context(
+                    ReplayServer(
+                        cassette,
+                        latency=args.replay_latency,
+                        error_rate=args.replay_error_rate,
+                        bandwidth=int(bandwidth * 1024) if bandwidth else None,
+                    )
+                )
+                server.attach(session)
+                stack.callback(lambda: print(f"Replay: {server.summary()}"))
+        yield session
 
 
 def run() -> None:
     parser = build_parser()
     args = parser.parse_args()
+    with profiled(args.profile, args.profile_out):
+        _run(args)
+
+
+def _run(args: argparse.Namespace) -> None:
+    cache: Optional[HttpCache] = None
+    if args.cache_dir:
+        cache = HttpCache(Path(args.cache_dir), max_bytes=int(args.max_cache_mb * 1024 * 1024))
+    schools = SchoolCatalogue.from_file(Path(args.schools)) if args.schools else None
+
+    if args.batch:
+        configs = _load_batch_configs(args.batch)
+        if args.parser:
+            configs = [replace(config, parser=args.parser) for config in configs]
+        if args.output_format:
+            configs = [replace(config, output_format=args.output_format) for config in configs]
+        if args.delta:
+            configs = [replace(config, delta=True) for config in configs]
+        started = time.perf_counter()
+        with _http_session(args, pool_connections=args.workers, pool_maxsize=args.per_host) as session:
+            results = run_batch(
+                configs,
+                timeout=args.timeout,
+                workers=args.workers,
+                per_host=args.per_host,
+                retries=args.retries,
+                cache=cache,
+                session=session,
+                schools=schools,
+            )
+        _print_batch_summary(results, time.perf_counter() - started)
+        if cache is not None:
+            print(f"HTTP cache: {cache.summary()}")
+        if any(not result.ok for result in results):
+            raise SystemExit(1)
+        return
 
     config_raw = _load_config(args.input)
     config = _normalize_config(config_raw)
-
-    payload = scrape_from_config(config, timeout=args.timeout)
+    if args.parser:
+        config = replace(config, parser=args.parser)
+    if args.output_format:
+        config = replace(config, output_format=args.output_format)
+    if args.delta:
+        config = replace(config, delta=True)
 
     output_path = Path(config.output_path)
-    output_path.write_text(json.dumps(payload.to_dict(), indent=2, ensure_ascii=False))
+    with _http_session(args) as session:
+        stream = stream_from_config(config, timeout=args.timeout, session=session, cache=cache)
+        delta = _write_output(stream, config, schools)
     print(f"Wrote normalized ranking to {output_path}")
+    if delta is not None:
+        print(f"Delta ({delta.summary()}) written to {delta_path(output_path)}")
+    if cache is not None:
+        print(f"HTTP cache: {cache.summary()}")
 
 
 if __name__ == "__main__":
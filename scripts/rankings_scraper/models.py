@@ -1,8 +1,17 @@
 from __future__ import annotations
 
-from dataclasses import asdict, dataclass, field
+import copy
+import json
+import sys
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Mapping, Optional
+
+from .profiling import span
+
+# Slotted entries drop the per-instance __dict__ (dataclass slots need 3.10+).
+_SLOTS: Dict[str, bool] = {"slots": True} if sys.version_info >= (3, 10) else {}
 
 
 def _utcnow_iso() -> str:
@@ -10,7 +19,33 @@ def _utcnow_iso() -> str:
     return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
 
 
-@dataclass
+def validate_entry_fields(rank: int, school_name: str) -> None:
+    """Checks shared by RankingEntry and columnar rows."""
+    if rank < 1:
+        raise ValueError("rank must be >= 1")
+    if not school_name.strip():
+        raise ValueError("school_name is required")
+
+
+def validate_leaderboard_fields(
+    master_type: str, source: str, category: str, year: int, source_url: str, entry_count: int
+) -> None:
+    """Checks shared by LeaderboardPayload and ColumnarLeaderboard."""
+    if year < 1900:
+        raise ValueError("year must be >= 1900")
+    if not master_type.strip():
+        raise ValueError("master_type is required")
+    if not source.strip():
+        raise ValueError("source is required")
+    if not category.strip():
+        raise ValueError("category is required")
+    if not source_url.strip():
+        raise ValueError("source_url is required")
+    if not entry_count:
+        raise ValueError("entries must not be empty")
+
+
+@dataclass(**_SLOTS)
 class RankingEntry:
     """
     Normalized row extracted from a ranking.
@@ -32,14 +67,36 @@ class RankingEntry:
 
     def validate(self) -> None:
         """Validate required fields and types."""
-        if self.rank < 1:
-            raise ValueError("rank must be >= 1")
-        if not self.school_name.strip():
-            raise ValueError("school_name is required")
+        validate_entry_fields(self.rank, self.school_name)
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "RankingEntry":
+        """Build an entry from its `to_dict()` form; unknown keys are ignored."""
+        return cls(
+            rank=data["rank"],
+            school_name=data["school_name"],
+            program_name=data.get("program_name"),
+            country=data.get("country"),
+            city=data.get("city"),
+            score=data.get("score"),
+            notes=data.get("notes"),
+            link=data.get("link"),
+            metadata=dict(data.get("metadata") or {}),
+        )
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to a JSON-serializable dict."""
-        return asdict(self)
+        """Convert to a JSON-serializable dict (metadata is deep-copied, like dataclasses.asdict)."""
+        return {
+            "rank": self.rank,
+            "school_name": self.school_name,
+            "program_name": self.program_name,
+            "country": self.country,
+            "city": self.city,
+            "score": self.score,
+            "notes": self.notes,
+            "link": self.link,
+            "metadata": copy.deepcopy(self.metadata) if self.metadata else {},
+        }
 
 
 @dataclass
@@ -70,21 +127,13 @@ class LeaderboardPayload:
 
     def validate(self) -> None:
         """Validate the leaderboard and nested entries."""
-        if self.year < 1900:
-            raise ValueError("year must be >= 1900")
-        if not self.master_type.strip():
-            raise ValueError("master_type is required")
-        if not self.source.strip():
-            raise ValueError("source is required")
-        if not self.category.strip():
-            raise ValueError("category is required")
-        if not self.source_url.strip():
-            raise ValueError("source_url is required")
-        if not self.entries:
-            raise ValueError("entries must not be empty")
-
-        for entry in self.entries:
-            entry.validate()
+        with span("validate") as stage:
+            validate_leaderboard_fields(
+                self.master_type, self.source, self.category, self.year, self.source_url, len(self.entries)
+            )
+            for entry in self.entries:
+                entry.validate()
+            stage.add(rows=len(self.entries))
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert payload to a JSON-serializable dict."""
@@ -100,3 +149,109 @@ class LeaderboardPayload:
         }
 
 
+class NdjsonLeaderboardReader:
+    """
+    Streaming reader for leaderboards written with `--format ndjson`.
+
+    The header line is parsed on open and exposed as attributes
+    (`master_type`, `year`, ...); iterating yields one RankingEntry per
+    line, so only the current line is held in memory.
+
+    Example:
+        with NdjsonLeaderboardReader(Path("ft-mim-2025.ndjson")) as reader:
+            print(reader.source, reader.year)
+            for entry in reader:
+                print(entry.rank, entry.school_name)
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._handle: IO[str] = self.path.open("r", encoding="utf-8")
+        try:
+            header = json.loads(self._handle.readline() or "null")
+            if not isinstance(header, dict) or "entries" in header:
+                raise ValueError(f"Not an NDJSON leaderboard (missing header line): {self.path}")
+        except Exception:
+            self._handle.close()
+            raise
+        self.header: Dict[str, Any] = header
+        self.master_type: str = header.get("master_type", "")
+        self.source: str = header.get("source", "")
+        self.category: str = header.get("category", "")
+        self.year: int = header.get("year", 0)
+        self.source_url: str = header.get("source_url", "")
+        self.region: Optional[str] = header.get("region")
+        self.scraped_at: str = header.get("scraped_at", "")
+
+    def __enter__(self) -> "NdjsonLeaderboardReader":
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._handle.close()
+
+    def __iter__(self) -> Iterator[RankingEntry]:
+        for line_number, line in enumerate(self._handle, start=2):
+            if not line.strip():
+                continue
+            try:
+                yield RankingEntry.from_dict(json.loads(line))
+            except (ValueError, KeyError, TypeError) as exc:
+                raise ValueError(f"Invalid entry on line {line_number} of {self.path}: {exc}") from exc
+
+    def read_payload(self) -> LeaderboardPayload:
+        """Materialize the remaining entries into a LeaderboardPayload."""
+        return LeaderboardPayload(
+            master_type=self.master_type,
+            source=self.source,
+            category=self.category,
+            year=self.year,
+            source_url=self.source_url,
+            region=self.region,
+            entries=list(self),
+            scraped_at=self.scraped_at,
+        )
+
+
+def leaderboard_format(path: Path) -> str:
+    """
+    Output format of a leaderboard file, "json" or "ndjson", from its first line.
+
+    An NDJSON file starts with a header object that has no "entries"; a JSON
+    payload is one document, pretty-printed or on a single line.
+
+    Example:
+        if leaderboard_format(path) == "ndjson":
+            reader = NdjsonLeaderboardReader(path)
+    """
+    with Path(path).open("r", encoding="utf-8") as handle:
+        first_line = handle.readline()
+    try:
+        first = json.loads(first_line)
+    except ValueError:
+        return "json"  # first line of a pretty-printed document
+    return "ndjson" if isinstance(first, dict) and "entries" not in first else "json"
+
+
+def load_leaderboard(path: Path) -> LeaderboardPayload:
+    """
+    Read a leaderboard file written with `--format json` or `--format ndjson`.
+
+    Example:
+        payload = load_leaderboard(Path("data/rankings/ft-mim-2025.json"))
+    """
+    path = Path(path)
+    if leaderboard_format(path) == "ndjson":
+        with NdjsonLeaderboardReader(path) as reader:
+            return reader.read_payload()
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(data, dict) or not isinstance(data.get("entries"), list):
+        raise ValueError(f"Not a leaderboard (no entries list): {path}")
+    payload = LeaderboardPayload(
+        **{name: data.get(name) for name in ("master_type", "source", "category", "year", "source_url", "region")},
+        entries=[RankingEntry.from_dict(row) for row in data["entries"]],
+    )
+    payload.scraped_at = data.get("scraped_at") or payload.scraped_at
+    return payload
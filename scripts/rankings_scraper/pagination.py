@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .models import RankingEntry
+
+PAGE_PLACEHOLDER = "{page}"
+
+
+@dataclass(frozen=True)
+class PaginationConfig:
+    """
+    How to walk a ranking split across numbered pages.
+
+    `url_template` holds a `{page}` placeholder. With `pages` set, exactly
+    that many pages are fetched from `start`; otherwise pages are fetched
+    until one has no ranking rows, answers 404, or only repeats rows already
+    seen (sites that clamp out-of-range pages to the last one), with
+    `max_pages` as a safety cap. `workers` pages are fetched concurrently.
+
+    Example:
+        PaginationConfig(url_template="https://example.com/ranking?page={page}", pages=10, workers=4)
+    """
+
+    url_template: str
+    start: int = 1
+    pages: Optional[int] = None
+    max_pages: int = 50
+    workers: int = 4
+
+    def __post_init__(self) -> None:
+        if PAGE_PLACEHOLDER not in self.url_template:
+            raise ValueError(f"url_template must contain {PAGE_PLACEHOLDER}")
+        if self.start < 0:
+            raise ValueError("start must be >= 0")
+        if self.pages is not None and self.pages < 1:
+            raise ValueError("pages must be >= 1")
+        if self.max_pages < 1:
+            raise ValueError("max_pages must be >= 1")
+        if self.workers < 1:
+            raise ValueError("workers must be >= 1")
+
+    @property
+    def page_limit(self) -> int:
+        return self.pages if self.pages is not None else self.max_pages
+
+    def page_url(self, page: int) -> str:
+        return self.url_template.replace(PAGE_PLACEHOLDER, str(page))
+
+    def page_numbers(self) -> range:
+        return range(self.start, self.start + self.page_limit)
+
+
+def entry_key(entry: RankingEntry) -> Tuple[int, str, str]:
+    """Identity of a row for de-duplication: rank, school and programme, case-insensitively."""
+    return (entry.rank, entry.school_name.casefold(), (entry.program_name or "").casefold())
+
+
+def new_entries(entries: Iterable[RankingEntry], seen: set) -> List[RankingEntry]:
+    """Entries whose key is not in `seen` yet; adds their keys to `seen`."""
+    fresh: List[RankingEntry] = []
+    for entry in entries:
+        key = entry_key(entry)
+        if key not in seen:
+            seen.add(key)
+            fresh.append(entry)
+    return fresh
+
+
+def merge_pages(pages: Sequence[Iterable[RankingEntry]]) -> Iterator[RankingEntry]:
+    """
+    Merge per-page (or per-table) entries in rank order, dropping repeated rows.
+
+    Rows repeated across a page boundary are kept once. The sort is stable,
+    so tied ranks keep their page order.
+    """
+    seen: set = set()
+    merged: List[RankingEntry] = []
+    for entries in pages:
+        merged.extend(new_entries(entries, seen))
+    merged.sort(key=lambda entry: entry.rank)
+    return iter(merged)
@@ -0,0 +1,421 @@
+from __future__ import annotations
+
+import re
+from abc import ABC, abstractmethod
+from html.parser import HTMLParser
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple, Type
+
+NO_TABLE_ERROR = "No table found in HTML content; page may be dynamic (html-table adapter insufficient)"
+NO_HEADER_ERROR = "Table must have header cells (<th>); page may be dynamic (html-table adapter insufficient)"
+
+
+class TableCell(NamedTuple):
+    """
+    Backend-neutral view of a `<td>`/`<th>` cell.
+
+    `text` is the whitespace-collapsed cell text. `href` is the target of the
+    cell's first `<a>` when it has one, and `link_text` that anchor's raw text.
+    """
+
+    tag: str
+    text: str
+    href: Optional[str] = None
+    link_text: Optional[str] = None
+
+
+class ParsedTable(NamedTuple):
+    """Header texts and data rows of the first table that has `<th>` cells."""
+
+    headers: List[str]
+    rows: List[List[TableCell]]
+
+
+def _clean_text(value: str) -> str:
+    return re.sub(r"\s+", " ", value).strip()
+
+
+def _is_data_row(tags: Sequence[str]) -> bool:
+    return len(tags) >= 2 and tags[0] != "th"
+
+
+class ParserBackend(ABC):
+    """
+    Turns HTML into a `ParsedTable`.
+
+    Every backend selects the first table (in document order, nested tables
+    included) that contains a `<th>`, and keeps rows with at least two cells
+    whose first cell is a `<td>`.
+    """
+
+    name = ""
+
+    @abstractmethod
+    def parse_table(self, html: str) -> ParsedTable:
+        """First table with `<th>` cells; ValueError when the page has none."""
+
+
+# Elements BeautifulSoup closes immediately; they never hold text or cells.
+_VOID_ELEMENTS = frozenset(
+    {
+        "area", "base", "basefont", "bgsound", "br", "col", "command", "embed", "frame", "hr", "image",
+        "img", "input", "isindex", "keygen", "link", "menuitem", "meta", "nextid", "param", "source",
+        "spacer", "track", "wbr",
+    }
+)
+# Elements whose text BeautifulSoup leaves out of get_text().
+_HIDDEN_TEXT_ELEMENTS = frozenset({"script", "style", "template", "rt", "rp"})
+
+
+class _TableDone(Exception):
+    """Raised to stop tokenizing once the header table has closed."""
+
+
+class _Cell:
+    __slots__ = ("tag", "runs", "href", "link_runs", "link_state")
+
+    def __init__(self, tag: str) -> None:
+        self.tag = tag
+        self.runs: List[str] = []
+        self.href: Optional[str] = None
+        self.link_runs: List[str] = []
+        # 0: no <a> seen yet, 1: inside the first <a>, 2: first <a> closed.
+        self.link_state = 0
+
+    def to_table_cell(self) -> TableCell:
+        href = self.href
+        return TableCell(self.tag, _clean_text(" ".join(self.runs)), href, "".join(self.link_runs) if href else None)
+
+
+class _TableEventParser(HTMLParser):
+    """
+    Single-pass extraction of the first table with `<th>` cells.
+
+    Instead of building a tree and querying it per row and per cell, tokenizer
+    events are routed straight to the open table/row/cell/anchor, so every
+    cell's text, first link and link text are gathered in one traversal.
+    Tree semantics follow BeautifulSoup's html.parser builder: end tags close
+    everything opened after the matching start tag, void elements never open,
+    and script/style text is not cell text.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        # Open elements as (tag, kind, payload); kind: "table", "tr", "cell", "a", "hidden" or "".
+        self._stack: List[Tuple[str, str, object]] = []
+        self._pending: List[str] = []
+        self._table_depth = 0
+        self._hidden_depth = 0
+        self._open_cells: List[_Cell] = []
+        self._open_rows: List[List[_Cell]] = []
+        self.headers: List[_Cell] = []
+        self.rows: List[List[_Cell]] = []
+        self.saw_table = False
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        text = "".join(self._pending)
+        self._pending.clear()
+        if self._hidden_depth:
+            return
+        for cell in self._open_cells:
+            cell.runs.append(text)
+            if cell.link_state == 1:
+                cell.link_runs.append(text)
+
+    def handle_data(self, data: str) -> None:
+        if self._open_cells:
+            self._pending.append(data)
+
+    def unknown_decl(self, data: str) -> None:
+        self._flush()
+        if data.startswith("CDATA["):
+            self.handle_data(data[6:])
+            self._flush()
+
+    def handle_comment(self, data: str) -> None:
+        self._flush()
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        self._flush()
+        if tag in _VOID_ELEMENTS:
+            return
+        kind = ""
+        payload: object = None
+        if tag == "table":
+            self.saw_table = True
+            if self._table_depth == 0:
+                self.headers = []
+                self.rows = []
+            self._table_depth += 1
+            kind = "table"
+        elif self._table_depth:
+            if tag == "tr":
+                row: List[_Cell] = []
+                self.rows.append(row)
+                self._open_rows.append(row)
+                kind, payload = "tr", row
+            elif tag == "td" or tag == "th":
+                cell = _Cell(tag)
+                for row in self._open_rows:
+                    row.append(cell)
+                if tag == "th":
+                    self.headers.append(cell)
+                self._open_cells.append(cell)
+                kind, payload = "cell", cell
+            elif tag == "a":
+                href = None
+                for name, value in attrs:
+                    if name == "href":
+                        href = value
+                        break
+                opened = []
+                for cell in self._open_cells:
+                    if cell.link_state == 0:
+                        cell.link_state = 1
+                        cell.href = href or None
+                        opened.append(cell)
+                if opened:
+                    kind, payload = "a", opened
+        if tag in _HIDDEN_TEXT_ELEMENTS:
+            self._hidden_depth += 1
+            kind = "hidden"
+        self._stack.append((tag, kind, payload))
+
+    def handle_endtag(self, tag: str) -> None:
+        self._flush()
+        stack = self._stack
+        for pos in range(len(stack) - 1, -1, -1):
+            if stack[pos][0] == tag:
+                break
+        else:
+            return
+        while len(stack) > pos:
+            _tag, kind, payload = stack.pop()
+            if kind == "cell":
+                self._open_cells.remove(payload)
+            elif kind == "a":
+                for cell in payload:
+                    cell.link_state = 2
+            elif kind == "tr":
+                self._open_rows.remove(payload)
+            elif kind == "hidden":
+                self._hidden_depth -= 1
+            elif kind == "table":
+                self._table_depth -= 1
+                if self._table_depth == 0 and self.headers:
+                    raise _TableDone
+
+    def parse(self, html: str) -> None:
+        try:
+            self.feed(html)
+            self.close()
+        except _TableDone:
+            pass
+        self._flush()
+
+
+class HtmlParserBackend(ParserBackend):
+    """Pure-Python fallback: a single-pass event engine over the stdlib `html.parser`."""
+
+    name = "html.parser"
+
+    def parse_table(self, html: str) -> ParsedTable:
+        parser = _TableEventParser()
+        parser.parse(html)
+        if not parser.saw_table:
+            raise ValueError(NO_TABLE_ERROR)
+        if not parser.headers:
+            raise ValueError(NO_HEADER_ERROR)
+
+        rows: List[List[TableCell]] = []
+        for row in parser.rows:
+            if not _is_data_row([cell.tag for cell in row]):
+                continue
+            rows.append([cell.to_table_cell() for cell in row])
+        return ParsedTable(headers=[cell.to_table_cell().text for cell in parser.headers], rows=rows)
+
+
+class BeautifulSoupBackend(ParserBackend):
+    """Reference backend: BeautifulSoup tree with `html.parser`, queried per row and cell."""
+
+    name = "bs4"
+
+    def parse_table(self, html: str) -> ParsedTable:
+        from bs4 import BeautifulSoup  # deferred: only this backend needs bs4
+
+        soup = BeautifulSoup(html, "html.parser")
+        tables = soup.find_all("table")
+        if not tables:
+            raise ValueError(NO_TABLE_ERROR)
+
+        table = None
+        headers: List[str] = []
+        for candidate in tables:
+            headers = [self._text(th) for th in candidate.find_all("th")]
+            if headers:
+                table = candidate
+                break
+        if table is None:
+            raise ValueError(NO_HEADER_ERROR)
+
+        rows: List[List[TableCell]] = []
+        for row in table.find_all("tr"):
+            cells = row.find_all(["td", "th"])
+            if not _is_data_row([cell.name for cell in cells]):
+                continue
+            rows.append([self._cell(cell) for cell in cells])
+        return ParsedTable(headers=headers, rows=rows)
+
+    def _cell(self, cell) -> TableCell:
+        link = cell.find("a")
+        href = (link.get("href") or None) if link is not None else None
+        return TableCell(
+            tag=cell.name,
+            text=self._text(cell),
+            href=href,
+            link_text=link.text if href else None,
+        )
+
+    @staticmethod
+    def _text(element) -> str:
+        return _clean_text(element.get_text(separator=" ", strip=True))
+
+
+class LxmlBackend(ParserBackend):
+    """libxml2-based backend (`pip install lxml`)."""
+
+    name = "lxml"
+
+    def __init__(self) -> None:
+        try:
+            import lxml.etree
+            import lxml.html
+        except ImportError as exc:
+            raise ValueError("Parser backend 'lxml' requires the lxml package (pip install lxml)") from exc
+        self._html = lxml.html
+        self._etree = lxml.etree
+
+    def parse_table(self, html: str) -> ParsedTable:
+        try:
+            root = self._html.document_fromstring(html)
+        except self._etree.ParserError:
+            raise ValueError(NO_TABLE_ERROR) from None
+        self._etree.strip_elements(root, *_HIDDEN_TEXT_ELEMENTS, with_tail=False)
+
+        tables = list(root.iter("table"))
+        if not tables:
+            raise ValueError(NO_TABLE_ERROR)
+
+        table = None
+        headers: List[str] = []
+        for candidate in tables:
+            headers = [self._text(th) for th in candidate.iter("th")]
+            if headers:
+                table = candidate
+                break
+        if table is None:
+            raise ValueError(NO_HEADER_ERROR)
+
+        rows: List[List[TableCell]] = []
+        for row in table.iter("tr"):
+            cells = list(row.iter("td", "th"))
+            if not _is_data_row([cell.tag for cell in cells]):
+                continue
+            rows.append([self._cell(cell) for cell in cells])
+        return ParsedTable(headers=headers, rows=rows)
+
+    def _cell(self, cell) -> TableCell:
+        link = next(cell.iter("a"), None)
+        href = (link.get("href") or None) if link is not None else None
+        return TableCell(
+            tag=cell.tag,
+            text=self._text(cell),
+            href=href,
+            link_text=link.text_content() if href else None,
+        )
+
+    @staticmethod
+    def _text(element) -> str:
+        return _clean_text(" ".join(piece.strip() for piece in element.itertext() if piece.strip()))
+
+
+class SelectolaxBackend(ParserBackend):
+    """Lexbor-based backend (`pip install selectolax`), the fastest option."""
+
+    name = "selectolax"
+
+    def __init__(self) -> None:
+        try:
+            from selectolax.lexbor import LexborHTMLParser
+        except ImportError as exc:
+            raise ValueError("Parser backend 'selectolax' requires the selectolax package (pip install selectolax)") from exc
+        self._parser_cls = LexborHTMLParser
+
+    def parse_table(self, html: str) -> ParsedTable:
+        tree = self._parser_cls(html)
+        tree.strip_tags(list(_HIDDEN_TEXT_ELEMENTS))
+        tables = tree.css("table")
+        if not tables:
+            raise ValueError(NO_TABLE_ERROR)
+
+        table = None
+        headers: List[str] = []
+        for candidate in tables:
+            headers = [self._text(th) for th in candidate.css("th")]
+            if headers:
+                table = candidate
+                break
+        if table is None:
+            raise ValueError(NO_HEADER_ERROR)
+
+        rows: List[List[TableCell]] = []
+        for row in table.css("tr"):
+            cells = [node for node in row.traverse() if node.tag in ("td", "th")]
+            if not _is_data_row([cell.tag for cell in cells]):
+                continue
+            rows.append([self._cell(cell) for cell in cells])
+        return ParsedTable(headers=headers, rows=rows)
+
+    def _cell(self, cell) -> TableCell:
+        link = cell.css_first("a")
+        href = (link.attributes.get("href") or None) if link is not None else None
+        return TableCell(
+            tag=cell.tag,
+            text=self._text(cell),
+            href=href,
+            link_text=link.text(deep=True) if href else None,
+        )
+
+    @staticmethod
+    def _text(node) -> str:
+        return _clean_text(node.text(deep=True, separator=" ", strip=True))
+
+
+PARSER_BACKENDS: Dict[str, Type[ParserBackend]] = {
+    HtmlParserBackend.name: HtmlParserBackend,
+    BeautifulSoupBackend.name: BeautifulSoupBackend,
+    LxmlBackend.name: LxmlBackend,
+    SelectolaxBackend.name: SelectolaxBackend,
+}
+
+# Preference order for "auto": fastest installed backend first.
+AUTO_ORDER = ("selectolax", "lxml", "html.parser")
+
+
+def get_parser_backend(name: str = "html.parser") -> ParserBackend:
+    """
+    Instantiate a parser backend by name, or the fastest installed one for "auto".
+
+    Raises ValueError for unknown names or when the backend's package is missing.
+    """
+    if name == "auto":
+        for candidate in AUTO_ORDER:
+            try:
+                return PARSER_BACKENDS[candidate]()
+            except ValueError:
+                continue
+    backend_cls = PARSER_BACKENDS.get(name)
+    if backend_cls is None:
+        raise ValueError(f"Unknown parser backend '{name}'. Available: auto, {', '.join(PARSER_BACKENDS)}")
+    return backend_cls()
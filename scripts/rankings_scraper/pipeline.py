@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from typing import Callable, Iterable, Iterator, List, Optional
+
+from .models import LeaderboardPayload, RankingEntry, _utcnow_iso, validate_leaderboard_fields
+from .profiling import timed_iter
+
+
+class LeaderboardStream:
+    """
+    Leaderboard whose entries are produced lazily by an adapter.
+
+    Adapters return a stream instead of a fully built payload; a sink
+    (`serialization.dump_payload`, or `collect()` for a LeaderboardPayload)
+    then pulls entries one at a time. Leaderboard fields are validated when
+    the stream is created, each entry is validated as it is pulled, and
+    exhausting the stream runs the summary check (at least one entry), so a
+    consumed stream has passed the same checks as `LeaderboardPayload.validate()`.
+    A stream can be consumed only once; `count` holds the number of entries
+    pulled so far. `tap()` registers callbacks that see each validated entry
+    as it goes by (e.g. `delta.DeltaTracker.observe`).
+
+    Example:
+        stream = adapter.stream(master_type="mim", year=2025, source="FT", url=url, category="MiM")
+        dump_payload(stream, Path("ranking.ndjson"), output_format="ndjson")
+        print(stream.count)
+    """
+
+    def __init__(
+        self,
+        master_type: str,
+        source: str,
+        category: str,
+        year: int,
+        source_url: str,
+        region: Optional[str] = None,
+        entries: Iterable[RankingEntry] = (),
+        scraped_at: Optional[str] = None,
+    ) -> None:
+        # The entry count is only known at the end; check the rest up front.
+        validate_leaderboard_fields(master_type, source, category, year, source_url, entry_count=1)
+        self.master_type = master_type
+        self.source = source
+        self.category = category
+        self.year = year
+        self.source_url = source_url
+        self.region = region
+        self.scraped_at = scraped_at or _utcnow_iso()
+        self.count = 0
+        self._source: Optional[Iterable[RankingEntry]] = entries
+        self._taps: List[Callable[[RankingEntry], None]] = []
+
+    def tap(self, callback: Callable[[RankingEntry], None]) -> "LeaderboardStream":
+        """Call `callback` with every validated entry as the stream is consumed."""
+        if self._source is None:
+            raise ValueError("Cannot tap a LeaderboardStream that is already being consumed")
+        self._taps.append(callback)
+        return self
+
+    @property
+    def entries(self) -> Iterator[RankingEntry]:
+        """Validated entries; raises ValueError at the end if there were none."""
+        if self._source is None:
+            raise ValueError("LeaderboardStream entries can only be consumed once")
+        source, self._source = self._source, None
+        return timed_iter("validate", self._validated(source))
+
+    def _validated(self, source: Iterable[RankingEntry]) -> Iterator[RankingEntry]:
+        taps = self._taps
+        for entry in source:
+            entry.validate()
+            for callback in taps:
+                callback(entry)
+            self.count += 1
+            yield entry
+        if not self.count:
+            raise ValueError("entries must not be empty")
+
+    def collect(self) -> LeaderboardPayload:
+        """Consume the stream into a validated LeaderboardPayload."""
+        entries = list(self.entries)
+        return LeaderboardPayload(
+            master_type=self.master_type,
+            source=self.source,
+            category=self.category,
+            year=self.year,
+            source_url=self.source_url,
+            region=self.region,
+            entries=entries,
+            scraped_at=self.scraped_at,
+        )
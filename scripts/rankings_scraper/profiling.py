@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import IO, Dict, Iterable, Iterator, List, Optional, TypeVar, Union
+
+T = TypeVar("T")
+
+# The profiler spans record into; None (the default) makes every span a no-op.
+_ACTIVE: Optional["StageProfiler"] = None
+_local = threading.local()
+
+
+@dataclass
+class StageStats:
+    """Self time of one stage: time spent in nested stages is not counted twice."""
+
+    calls: int = 0
+    wall: float = 0.0
+    cpu: float = 0.0
+    rows: int = 0
+    bytes: int = 0
+
+    def add(self, other: "StageStats") -> None:
+        self.calls += other.calls
+        self.wall += other.wall
+        self.cpu += other.cpu
+        self.rows += other.rows
+        self.bytes += other.bytes
+
+
+class StageProfiler:
+    """
+    Collects per-stage wall time, CPU time, rows and bytes across threads.
+
+    Stages nest (a lazily produced row is timed inside the write that pulls
+    it), so each stage records its self time and the breakdown adds up to
+    the instrumented total. CPU time is per thread.
+
+    Example:
+        profiler = enable()
+        with span("fetch") as stage:
+            stage.add(bytes=len(html))
+        disable()
+        print(profiler.report())
+    """
+
+    def __init__(self) -> None:
+        self.stages: Dict[str, StageStats] = {}
+        self._lock = threading.Lock()
+        self.started = time.perf_counter()
+
+    def record(self, name: str, stats: StageStats) -> None:
+        with self._lock:
+            self.stages.setdefault(name, StageStats()).add(stats)
+
+    def merge(self, stages: Dict[str, StageStats]) -> None:
+        """Fold in stages collected elsewhere (e.g. in a worker process)."""
+        for name, stats in stages.items():
+            self.record(name, stats)
+
+    def report(self) -> str:
+        elapsed = time.perf_counter() - self.started
+        rows = [("STAGE", "CALLS", "WALL ms", "CPU ms", "ROWS", "KB")]
+        for name, stats in sorted(self.stages.items(), key=lambda item: -item[1].wall):
+            rows.append(
+                (
+                    name,
+                    str(stats.calls),
+                    f"{stats.wall * 1000:.1f}",
+                    f"{stats.cpu * 1000:.1f}",
+                    str(stats.rows) if stats.rows else "-",
+                    f"{stats.bytes / 1024:.1f}" if stats.bytes else "-",
+                )
+            )
+        widths = [max(len(row[col]) for row in rows) for col in range(len(rows[0]))]
+        lines = [
+            "  ".join(value.ljust(widths[0]) if col == 0 else value.rjust(widths[col]) for col, value in enumerate(row))
+            for row in rows
+        ]
+        staged = sum(stats.wall for stats in self.stages.values())
+        lines.append(f"instrumented {staged * 1000:.1f} ms of {elapsed * 1000:.1f} ms wall")
+        return "\n".join(lines)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        return None
+
+    def add(self, rows: int = 0, bytes: int = 0) -> None:  # noqa: A002 - mirrors StageStats
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("profiler", "name", "rows", "bytes", "child_wall", "child_cpu", "_wall", "_cpu")
+
+    def __init__(self, profiler: StageProfiler, name: str) -> None:
+        self.profiler = profiler
+        self.name = name
+        self.rows = 0
+        self.bytes = 0
+        self.child_wall = 0.0
+        self.child_cpu = 0.0
+
+    def add(self, rows: int = 0, bytes: int = 0) -> None:  # noqa: A002 - mirrors StageStats
+        self.rows += rows
+        self.bytes += bytes
+
+    def __enter__(self) -> "_Span":
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        stack.append(self)
+        self._cpu = time.thread_time()
+        self._wall = time.perf_counter()
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        wall = time.perf_counter() - self._wall
+        cpu = time.thread_time() - self._cpu
+        stack: List[_Span] = _local.stack
+        stack.pop()
+        if stack:
+            stack[-1].child_wall += wall
+            stack[-1].child_cpu += cpu
+        self.profiler.record(
+            self.name,
+            StageStats(calls=1, wall=wall - self.child_wall, cpu=cpu - self.child_cpu, rows=self.rows, bytes=self.bytes),
+        )
+
+
+def span(name: str) -> Union[_Span, _NullSpan]:
+    """Time a block as stage `name`; a shared no-op when profiling is off."""
+    profiler = _ACTIVE
+    if profiler is None:
+        return _NULL_SPAN
+    return _Span(profiler, name)
+
+
+def timed_iter(name: str, iterable: Iterable[T], *, rows: bool = True) -> Iterator[T]:
+    """
+    Charge the time spent producing each item of `iterable` to stage `name`.
+
+    Used for lazy pipelines, where work happens when a sink pulls items.
+    Returns the plain iterator when profiling is off.
+    """
+    profiler = _ACTIVE
+    if profiler is None:
+        return iter(iterable)
+    return _timed(profiler, name, iter(iterable), rows)
+
+
+def _timed(profiler: StageProfiler, name: str, iterator: Iterator[T], rows: bool) -> Iterator[T]:
+    while True:
+        with _Span(profiler, name) as stage:
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            if rows:
+                stage.rows = 1
+        yield item
+
+
+def enable() -> StageProfiler:
+    global _ACTIVE
+    _ACTIVE = StageProfiler()
+    return _ACTIVE
+
+
+def disable() -> None:
+    global _ACTIVE
+    _ACTIVE = None
+
+
+def active() -> Optional[StageProfiler]:
+    return _ACTIVE
+
+
+@contextmanager
+def profiled(enabled: bool, pstats_path: Optional[str] = None, out: IO[str] = sys.stderr) -> Iterator[Optional[StageProfiler]]:
+    """
+    Enable stage spans (and cProfile when `pstats_path` is set) for a CLI run.
+
+    The stage breakdown is printed to `out` and the pstats dump written
+    when the block exits, even if it raised.
+    """
+    if not enabled and not pstats_path:
+        yield None
+        return
+    profiler = enable()
+    cprofile = None
+    if pstats_path:
+        import cProfile
+
+        cprofile = cProfile.Profile()
+    if cprofile is not None:
+        cprofile.enable()
+    try:
+        yield profiler
+    finally:
+        if cprofile is not None:
+            cprofile.disable()
+            cprofile.dump_stats(pstats_path)
+        disable()
+        print(profiler.report(), file=out)
+        if pstats_path:
+            print(f"cProfile stats written to {pstats_path} (python -m pstats {pstats_path})", file=out)
@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+from urllib.parse import quote, unquote
+
+from .fileio import atomic_write
+
+if TYPE_CHECKING:
+    import requests
+
+# Response headers worth replaying; framing headers are rebuilt by the server.
+RECORDED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Cache-Control", "Location", "Retry-After")
+
+
+@dataclass
+class RecordedResponse:
+    """One response saved in a cassette: status, replayable headers and decoded body."""
+
+    url: str
+    status: int
+    body: bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+class Cassette:
+    """
+    Directory of recorded HTTP responses keyed by URL.
+
+    Each URL maps to `<sha256>.json` (URL, status, headers) and
+    `<sha256>.body` (the decoded body), the same layout as `HttpCache`.
+    `attach(session)` records every final response the session receives,
+    after retries; 304s are skipped since they carry no body to replay.
+    Re-recording a URL overwrites it.
+
+    Example:
+        cassette = Cassette(Path("cassettes/ft-2025"))
+        cassette.attach(session)
+        adapter = HtmlTableAdapter(session=session)
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.recorded = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _paths(self, url: str) -> Tuple[Path, Path]:
+        key = self._key(url)
+        return self.directory / f"{key}.json", self.directory / f"{key}.body"
+
+    def add(self, url: str, body: bytes, *, status: int = 200, headers: Optional[Dict[str, str]] = None) -> None:
+        """Save a response for `url`."""
+        meta = {"url": url, "status": status, "headers": dict(headers or {})}
+        meta_path, body_path = self._paths(url)
+        with self._lock:
+            atomic_write(body_path, body)
+            atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+            self.recorded += 1
+
+    def record(self, response: requests.Response) -> None:
+        """Save a requests response under the URL it was requested with."""
+        if response.status_code == 304:
+            return
+        headers = {name: response.headers[name] for name in RECORDED_HEADERS if name in response.headers}
+        if "Content-Type" not in headers and response.encoding:
+            headers["Content-Type"] = f"text/html; charset={response.encoding}"
+        self.add(response.request.url or response.url, response.content, status=response.status_code, headers=headers)
+
+    def get(self, url: str) -> Optional[RecordedResponse]:
+        meta_path, body_path = self._paths(url)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            body = body_path.read_bytes()
+        except (OSError, ValueError):
+            return None
+        return RecordedResponse(url=meta["url"], status=meta["status"], body=body, headers=meta.get("headers", {}))
+
+    def urls(self) -> List[str]:
+        urls = []
+        for meta_path in sorted(self.directory.glob("*.json")):
+            try:
+                urls.append(json.loads(meta_path.read_text(encoding="utf-8"))["url"])
+            except (OSError, ValueError, KeyError):
+                continue
+        return urls
+
+    def attach(self, session: requests.Session) -> None:
+        """Record every response `session` receives from now on."""
+        session.hooks["response"].append(self._hook)
+
+    def _hook(self, response: requests.Response, *_args: Any, **_kwargs: Any) -> requests.Response:
+        self.record(response)
+        return response
+
+
+@dataclass
+class ReplayStats:
+    requests: int = 0
+    misses: int = 0
+    not_modified: int = 0
+    injected_errors: int = 0
+    bytes_sent: int = 0
+
+
+class ReplayServer:
+    """
+    Local in-process HTTP server answering from a cassette.
+
+    Runs a `ThreadingHTTPServer` with keep-alive on 127.0.0.1 in a
+    background thread. Every response is delayed by `latency` seconds (plus
+    up to `jitter` more); a fraction `error_rate` of requests gets
+    `error_status` instead (chosen with a `seed`-ed RNG, so runs repeat);
+    bodies are sent in chunks paced to `bandwidth` bytes per second per
+    response. URLs missing from the cassette answer 404, and conditional
+    requests matching the recorded ETag or Last-Modified answer 304.
+    `attach(session)` routes a requests session through the server, so the
+    scrapers run unchanged against it.
+
+    Example:
+        with ReplayServer(Cassette(Path("cassettes/ft-2025")), latency=0.05, error_rate=0.1) as server:
+            server.attach(session)
+            run_batch(configs, timeout=5.0, session=session)
+        print(server.stats)
+    """
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        *,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        bandwidth: Optional[int] = None,
+        seed: Optional[int] = 0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        if latency < 0 or jitter < 0:
+            raise ValueError("latency and jitter must be >= 0")
+        if not 0.0 <= error_rate <= 1.0:
+            raise ValueError("error_rate must be between 0 and 1")
+        if bandwidth is not None and bandwidth < 1:
+            raise ValueError("bandwidth must be >= 1 byte per second")
+        self.cassette = cassette
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.bandwidth = bandwidth
+        self.stats = ReplayStats()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _handler_for(self))
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url_for(self, url: str) -> str:
+        """Local URL serving the cassette entry recorded for `url`."""
+        return f"{self.base_url}/{quote(url, safe='')}"
+
+    def start(self) -> "ReplayServer":
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, name="replay-server", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> "ReplayServer":
+        return self.start()
+
+    def __exit__(self, *_exc: object) -> None:
+        self.stop()
+
+    def attach(self, session: requests.Session) -> None:
+        """Send every request of `session` to this server, keeping its pool and retry settings."""
+        from requests.adapters import HTTPAdapter  # deferred: imports requests
+
+        server = self
+
+        class _ReplayAdapter(HTTPAdapter):
+            def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+                request.url = server.url_for(request.url)
+                return super().send(request, **kwargs)
+
+        for prefix in ("http://", "https://"):
+            current = session.get_adapter(prefix + "example.com")
+            session.mount(
+                prefix,
+                _ReplayAdapter(
+                    pool_connections=getattr(current, "_pool_connections", 10),
+                    pool_maxsize=getattr(current, "_pool_maxsize", 10),
+                    max_retries=getattr(current, "max_retries", 0),
+                ),
+            )
+
+    def summary(self) -> str:
+        stats = self.stats
+        return (
+            f"{stats.requests} requests, {stats.misses} misses, {stats.not_modified} not modified, "
+            f"{stats.injected_errors} injected errors, {stats.bytes_sent / 1024:.1f} KB sent"
+        )
+
+    def _plan(self) -> Tuple[float, bool]:
+        """Delay and whether to inject an error for the next request."""
+        with self._lock:
+            self.stats.requests += 1
+            delay = self.latency + (self._rng.uniform(0.0, self.jitter) if self.jitter else 0.0)
+            failed = self.error_rate > 0 and self._rng.random() < self.error_rate
+            if failed:
+                self.stats.injected_errors += 1
+        return delay, failed
+
+    def _count(self, **increments: int) -> None:
+        with self._lock:
+            for name, value in increments.items():
+                setattr(self.stats, name, getattr(self.stats, name) + value)
+
+
+def _handler_for(server: ReplayServer) -> type:
+    class _ReplayHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:  # noqa: N802 - http.server naming
+            delay, failed = server._plan()
+            if delay:
+                time.sleep(delay)
+            if failed:
+                self._send(server.error_status, b"", {"Retry-After": "0"})
+                return
+            recorded = server.cassette.get(unquote(self.path.lstrip("/")))
+            if recorded is None:
+                server._count(misses=1)
+                self._send(404, b"not in cassette", {"Content-Type": "text/plain"})
+                return
+            if self._not_modified(recorded):
+                server._count(not_modified=1)
+                self._send(304, b"", {name: value for name, value in recorded.headers.items() if name != "Content-Type"})
+                return
+            self._send(recorded.status, recorded.body, recorded.headers)
+
+        def _not_modified(self, recorded: RecordedResponse) -> bool:
+            if recorded.status != 200:
+                return False
+            etag = recorded.headers.get("ETag")
+            if etag and self.headers.get("If-None-Match") == etag:
+                return True
+            last_modified = recorded.headers.get("Last-Modified")
+            return bool(last_modified) and self.headers.get("If-Modified-Since") == last_modified
+
+        def _send(self, status: int, body: bytes, headers: Dict[str, str]) -> None:
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if server.bandwidth is None:
+                self.wfile.write(body)
+            else:
+                chunk = max(1024, server.bandwidth // 20)
+                for start in range(0, len(body), chunk):
+                    piece = body[start : start + chunk]
+                    time.sleep(len(piece) / server.bandwidth)
+                    self.wfile.write(piece)
+                    self.wfile.flush()
+            server._count(bytes_sent=len(body))
+
+        def log_message(self, *_args: Any) -> None:
+            return None
+
+    return _ReplayHandler
@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import importlib
+import json
+import math
+from json.encoder import encode_basestring
+from operator import attrgetter
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from .fileio import atomic_open
+from .profiling import span, timed_iter
+
+
+
+def _optional_module(name: str) -> Optional[ModuleType]:
+    try:
+        return importlib.import_module(name)
+    except ImportError:  # pragma: no cover - depends on the environment
+        return None
+
+
+# Optional accelerated encoder, used per entry when its output is provably identical.
+orjson = _optional_module("orjson")
+
+OUTPUT_FORMATS = ("json", "ndjson")
+LEADERBOARD_FIELDS = ("master_type", "source", "category", "year", "source_url", "region")
+ENTRY_FIELDS = ("rank", "school_name", "program_name", "country", "city", "score", "notes", "link")
+_entry_values = attrgetter(*ENTRY_FIELDS)
+
+_INDENT = "  "
+_ENTRY_INDENT = _INDENT * 2
+_FIELD_INDENT = _INDENT * 3
+_INT64_MIN, _INT64_MAX = -(2**63), 2**63 - 1
+_ORJSON_BATCH = 512
+_FLOAT_REPR = float.__repr__
+_INT_REPR = int.__repr__
+
+
+def _encode_float(value: float) -> str:
+    if value != value:
+        return "NaN"
+    if value == math.inf:
+        return "Infinity"
+    if value == -math.inf:
+        return "-Infinity"
+    return _FLOAT_REPR(value)
+
+
+def _encode_value(value: Any, indent: str) -> str:
+    """Encode like json.dumps(indent=2, ensure_ascii=False) for a value nested at `indent`."""
+    value_type = type(value)
+    if value_type is str:
+        return encode_basestring(value)
+    if value is None:
+        return "null"
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if value_type is int:
+        return _INT_REPR(value)
+    if value_type is float:
+        return _encode_float(value)
+    return json.dumps(value, indent=2, ensure_ascii=False).replace("\n", "\n" + indent)
+
+
+def _orjson_safe(values: Tuple[Any, ...]) -> bool:
+    """True if orjson encodes an entry's field values exactly like the stdlib json module."""
+    rank, school_name, program_name, country, city, score, notes, link = values
+    if type(rank) is not int or not _INT64_MIN <= rank <= _INT64_MAX:
+        return False
+    if score is not None:
+        if type(score) is not float:
+            return False
+        # Outside this range CPython switches to exponent notation with a
+        # different spelling than orjson (1e+16 vs 1e16); NaN/inf become null.
+        magnitude = abs(score)
+        if magnitude != 0.0 and not 1e-4 <= magnitude < 1e16:
+            return False
+    for text in (school_name, program_name, country, city, notes, link):
+        if text is not None and type(text) is not str:
+            return False
+    return True
+
+
+def _entry_stdlib(entry: Any) -> str:
+    parts = [
+        f'{_FIELD_INDENT}"{name}": {_encode_value(value, _FIELD_INDENT)}'
+        for name, value in zip(ENTRY_FIELDS, _entry_values(entry))
+    ]
+    metadata = entry.metadata
+    parts.append(f'{_FIELD_INDENT}"metadata": {_encode_value(metadata, _FIELD_INDENT) if metadata else "{}"}')
+    return f"{_ENTRY_INDENT}{{\n" + ",\n".join(parts) + f"\n{_ENTRY_INDENT}}}"
+
+
+def _iter_entries_stdlib(entries: Iterable[Any]) -> Iterator[str]:
+    for entry in entries:
+        yield _entry_stdlib(entry)
+
+
+def _encode_orjson_batch(entries: List[Any], rows: List[Dict[str, Any]]) -> str:
+    try:
+        encoded = orjson.dumps(rows, option=orjson.OPT_INDENT_2).decode("utf-8")
+    except orjson.JSONEncodeError:  # e.g. lone surrogates, which json.dumps accepts
+        return ",\n".join(_entry_stdlib(entry) for entry in entries)
+    # Drop the list brackets and shift the entries one level deeper.
+    return _INDENT + encoded[2:-2].replace("\n", "\n" + _INDENT)
+
+
+def _iter_entries_orjson(entries: Iterable[Any]) -> Iterator[str]:
+    batch: List[Any] = []
+    rows: List[Dict[str, Any]] = []
+    for entry in entries:
+        values = _entry_values(entry)
+        if entry.metadata or not _orjson_safe(values):
+            if batch:
+                yield _encode_orjson_batch(batch, rows)
+                batch, rows = [], []
+            yield _entry_stdlib(entry)
+            continue
+        row = dict(zip(ENTRY_FIELDS, values))
+        row["metadata"] = {}
+        batch.append(entry)
+        rows.append(row)
+        if len(rows) >= _ORJSON_BATCH:
+            yield _encode_orjson_batch(batch, rows)
+            batch, rows = [], []
+    if batch:
+        yield _encode_orjson_batch(batch, rows)
+
+
+def iter_payload_json(payload: Any, *, accelerated: bool = True) -> Iterable[str]:
+    """
+    Yield the JSON text of a leaderboard in chunks.
+
+    The concatenated chunks are byte-for-byte what
+    `json.dumps(payload.to_dict(), indent=2, ensure_ascii=False)` returns, but
+    entries are encoded one at a time straight from their attributes, so no
+    dict tree or full-document string is built. Works with LeaderboardPayload
+    and ColumnarLeaderboard alike. When orjson is installed (and
+    `accelerated` is true) it encodes runs of entries whose values it
+    renders identically; other entries go through the stdlib encoder.
+
+    Example:
+        with path.open("w", encoding="utf-8") as handle:
+            handle.writelines(iter_payload_json(payload))
+    """
+    iter_entries = _iter_entries_orjson if accelerated and orjson is not None else _iter_entries_stdlib
+    header = ",\n".join(
+        f'{_INDENT}"{name}": {_encode_value(getattr(payload, name), _INDENT)}' for name in LEADERBOARD_FIELDS
+    )
+    yield "{\n" + header + f',\n{_INDENT}"entries": ['
+    first = True
+    for chunk in iter_entries(payload.entries):
+        yield ("\n" if first else ",\n") + chunk
+        first = False
+    yield ("]" if first else f"\n{_INDENT}]") + f',\n{_INDENT}"scraped_at": {_encode_value(payload.scraped_at, _INDENT)}\n}}'
+
+
+def _ndjson_line(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def _iter_entry_lines_orjson(entries: Iterable[Any]) -> Iterator[str]:
+    for entry in entries:
+        values = _entry_values(entry)
+        if entry.metadata or not _orjson_safe(values):
+            yield _ndjson_line(entry.to_dict())
+            continue
+        row = dict(zip(ENTRY_FIELDS, values))
+        row["metadata"] = {}
+        try:
+            yield orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE).decode("utf-8")
+        except orjson.JSONEncodeError:
+            yield _ndjson_line(entry.to_dict())
+
+
+def iter_payload_ndjson(payload: Any, *, accelerated: bool = True) -> Iterable[str]:
+    """
+    Yield a leaderboard as NDJSON lines.
+
+    The first line holds the leaderboard fields (everything but `entries`);
+    each following line is one entry, in `RankingEntry.to_dict()` form.
+    Entries are consumed lazily, so `payload.entries` may be any iterable
+    and memory does not grow with the number of rows. Read it back with
+    `models.NdjsonLeaderboardReader`.
+
+    Example:
+        {"master_type":"mim","source":"Financial Times",...,"scraped_at":"2025-01-01T00:00:00Z"}
+        {"rank":1,"school_name":"HEC Paris",...,"metadata":{}}
+    """
+    header = {name: getattr(payload, name) for name in LEADERBOARD_FIELDS}
+    header["scraped_at"] = payload.scraped_at
+    yield _ndjson_line(header)
+    if accelerated and orjson is not None:
+        yield from _iter_entry_lines_orjson(payload.entries)
+    else:
+        for entry in payload.entries:
+            yield _ndjson_line(entry.to_dict())
+
+
+def _iter_format(payload: Any, output_format: str, accelerated: bool) -> Iterable[str]:
+    if output_format == "json":
+        return iter_payload_json(payload, accelerated=accelerated)
+    if output_format == "ndjson":
+        return iter_payload_ndjson(payload, accelerated=accelerated)
+    raise ValueError(f"Unknown output format '{output_format}'. Available: {', '.join(OUTPUT_FORMATS)}")
+
+
+def write_payload_json(
+    payload: Any,
+    handle: TextIO,
+    *,
+    accelerated: bool = True,
+    buffer_chars: int = 1 << 16,
+    output_format: str = "json",
+) -> None:
+    """Stream the payload in `output_format` to a text handle in ~buffer_chars writes."""
+    pending = []
+    size = 0
+    for chunk in timed_iter("serialize", _iter_format(payload, output_format, accelerated), rows=False):
+        pending.append(chunk)
+        size += len(chunk)
+        if size >= buffer_chars:
+            _write(handle, "".join(pending))
+            pending.clear()
+            size = 0
+    if pending:
+        _write(handle, "".join(pending))
+
+
+def _write(handle: TextIO, text: str) -> None:
+    with span("write") as stage:
+        handle.write(text)
+        stage.add(bytes=len(text))
+
+
+def dump_payload(payload: Any, output_path: Path, *, accelerated: bool = True, output_format: str = "json") -> Path:
+    """Write the payload as JSON or NDJSON to `output_path` atomically (temp file + rename)."""
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format '{output_format}'. Available: {', '.join(OUTPUT_FORMATS)}")
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with atomic_open(output_path, "w", encoding="utf-8") as handle:
+        write_payload_json(payload, handle, accelerated=accelerated, output_format=output_format)
+    return output_path
+
+
+def payload_json(payload: Any, *, accelerated: bool = True) -> str:
+    return "".join(iter_payload_json(payload, accelerated=accelerated))
+
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from scripts.rankings_scraper import ft_xlsx_converter
+from scripts.rankings_scraper.benchmarks.suite import compare_results, run_suite, synthetic_html, synthetic_xlsx
+from scripts.rankings_scraper.html_adapter import HtmlTableAdapter
+
+
+def test_synthetic_html_and_xlsx_parse_to_the_same_entries(tmp_path: Path) -> None:
+    html_entries = HtmlTableAdapter()._parse_table(synthetic_html(50, seed=3))
+    xlsx_entries = ft_xlsx_converter._read_entries(
+        synthetic_xlsx(50, tmp_path / "ranking.xlsx", seed=3), ft_xlsx_converter.HEADER_INDEX
+    )
+    assert len(html_entries) == 50
+    assert [(e.rank, e.school_name, e.score, e.program_name) for e in html_entries] == [
+        (e.rank, e.school_name, e.score, e.program_name) for e in xlsx_entries
+    ]
+    assert any(entry.link for entry in xlsx_entries)
+
+
+def test_run_and_compare_flag_regressions() -> None:
+    base = run_suite([20], repeat=1, log=lambda _line: None)
+    assert {"html_parse_table/20", "xlsx_read_entries/20", "validate/20", "serialize_stream/20"} <= set(base["results"])
+
+    head = {"results": {key: dict(value) for key, value in base["results"].items()}}
+    head["results"]["validate/20"]["seconds"] = base["results"]["validate/20"]["seconds"] + 1.0
+    head["results"]["serialize_stream/20"]["peak_bytes"] *= 2
+    flagged = {row["case"] for row in compare_results(base, head) if row["regression"]}
+    assert flagged == {"validate/20", "serialize_stream/20"}
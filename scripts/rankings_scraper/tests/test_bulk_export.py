@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import csv
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+from scripts.rankings_scraper.bulk_export import ENTRY_COLUMNS, BulkBundle, main, pg_array, program_type, slugify
+from scripts.rankings_scraper.models import LeaderboardPayload, RankingEntry
+from scripts.rankings_scraper.serialization import dump_payload
+
+
+def _payload(year: int, entries: List[RankingEntry], master_type: str = "mim") -> LeaderboardPayload:
+    return LeaderboardPayload(
+        master_type=master_type,
+        source="Financial Times",
+        category="Masters in Management",
+        year=year,
+        source_url="https://example.com/ranking",
+        entries=entries,
+    )
+
+
+def _read(path: Path) -> List[Dict[str, str]]:
+    with path.open("r", encoding="utf-8", newline="") as handle:
+        return list(csv.DictReader(handle))
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("Financial Times-Masters in Management-2025-mim", "financial-times-masters-in-management-2025-mim"),
+        ("École des Ponts — MSc Finance!", "ecole-des-ponts-msc-finance"),
+        ("--HEC  Paris--", "hec-paris"),
+        ("Master's in Management (Grande École)-mim", "master-s-in-management-grande-ecole-mim"),
+        ("", ""),
+    ],
+)
+def test_slugify_matches_the_typescript_rules(value: str, expected: str) -> None:
+    assert slugify(value) == expected
+
+
+def test_program_type_and_array_literal() -> None:
+    assert [program_type(t) for t in ("MiM", "mba", "Executive MBA", "Master in Finance", "Data MSc", "other")] == [
+        "master",
+        "mba",
+        "emba",
+        "msc",
+        "specialized_msc",
+        "other",
+    ]
+    assert pg_array([]) == "{}"
+    assert pg_array(['Paris', 'Saint "Q"', "a\\b"]) == '{"Paris","Saint \\"Q\\"","a\\\\b"}'
+
+
+def test_bundle_deduplicates_schools_and_programs(tmp_path: Path) -> None:
+    bundle = BulkBundle()
+    bundle.add(
+        _payload(
+            2024,
+            [
+                RankingEntry(rank=1, school_name="HEC Paris", program_name="MiM", city="Jouy-en-Josas", link="https://hec.edu"),
+                RankingEntry(rank=2, school_name="ESSEC", program_name="MiM", notes="Grande école"),
+                RankingEntry(rank=3, school_name="ESCP", program_name="MiM-mim"),
+                RankingEntry(rank=4, school_name="EDHEC"),
+            ],
+        )
+    )
+    bundle.add(_payload(2025, [RankingEntry(rank=1, school_name="ESSEC", program_name="MiM", score=97.5)]))
+    bundle.write(tmp_path)
+
+    assert [row["name"] for row in _read(tmp_path / "schools.csv")] == ["HEC Paris", "ESSEC", "ESCP", "EDHEC"]
+    programs = _read(tmp_path / "programs.csv")
+    # Same base within the bundle gets the next suffix, as uniqueProgramSlug would give.
+    assert [(row["school_name"], row["slug"]) for row in programs] == [
+        ("HEC Paris", "mim-mim"),
+        ("ESSEC", "mim-mim-1"),
+        ("ESCP", "mim-mim-mim"),
+    ]
+    assert programs[0]["campuses"] == '{"Jouy-en-Josas"}' and programs[0]["type"] == "master"
+    assert programs[1]["description"] == "Grande école"
+    entries = _read(tmp_path / "entries.csv")
+    assert len(entries) == 5
+    assert entries[3]["program_name"] == "" and entries[4]["score"] == "97.5"
+    assert [row["slug"] for row in _read(tmp_path / "leaderboards.csv")] == [
+        "financial-times-masters-in-management-2024-mim",
+        "financial-times-masters-in-management-2025-mim",
+    ]
+
+
+def test_empty_optional_fields_are_written_as_null(tmp_path: Path) -> None:
+    bundle = BulkBundle()
+    bundle.add(_payload(2025, [RankingEntry(rank=1, school_name="HEC Paris", program_name="MiM", notes="")]))
+    bundle.write(tmp_path)
+    lines = (tmp_path / "entries.csv").read_text(encoding="utf-8").splitlines()
+    # Unquoted empty fields are NULL for COPY ... (FORMAT csv); quoted "" would be an empty string.
+    assert lines[1] == "financial-times-masters-in-management-2025-mim,1,,,HEC Paris,MiM"
+    assert '""' not in (tmp_path / "schools.csv").read_text(encoding="utf-8")
+
+
+def test_slugs_skip_values_taken_by_another_base() -> None:
+    bundle = BulkBundle()
+    bundle.add(_payload(2024, [RankingEntry(rank=1, school_name="A", program_name="X")], master_type="mim-1"))
+    bundle.add(
+        _payload(
+            2025,
+            [RankingEntry(rank=1, school_name="B", program_name="X"), RankingEntry(rank=2, school_name="C", program_name="X")],
+        )
+    )
+    assert [program.slug for program in bundle.programs.values()] == ["x-mim-1", "x-mim", "x-mim-2"]
+
+
+def test_readding_a_leaderboard_replaces_its_entries() -> None:
+    bundle = BulkBundle()
+    bundle.add(_payload(2025, [RankingEntry(rank=1, school_name="HEC Paris"), RankingEntry(rank=2, school_name="ESSEC")]))
+    bundle.add(_payload(2025, [RankingEntry(rank=1, school_name="ESSEC")]))
+    assert bundle.summary() == "1 leaderboards, 2 schools, 0 programs, 1 entries"
+
+
+def test_cli_reads_json_and_ndjson_and_writes_the_copy_files(tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    rankings = tmp_path / "rankings"
+    dump_payload(_payload(2024, [RankingEntry(rank=1, school_name="HEC Paris", program_name="MiM")]), rankings / "a.json")
+    dump_payload(
+        _payload(2025, [RankingEntry(rank=1, school_name="HEC Paris", program_name="MiM")]),
+        rankings / "b.ndjson",
+        output_format="ndjson",
+    )
+    main([str(rankings), "--out", str(tmp_path / "bulk")])
+    assert "2 leaderboards, 1 schools, 1 programs, 2 entries" in capsys.readouterr().out
+
+    assert sorted(path.name for path in (tmp_path / "bulk").iterdir()) == [
+        "entries.csv",
+        "leaderboards.csv",
+        "programs.csv",
+        "schools.csv",
+    ]
+    assert list(_read(tmp_path / "bulk" / "entries.csv")[0]) == list(ENTRY_COLUMNS)
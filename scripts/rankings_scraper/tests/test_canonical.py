@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+from unittest import mock
+
+import pytest
+from openpyxl import Workbook
+
+from scripts.rankings_scraper.canonical import CANONICAL_ID_KEY, School, SchoolCatalogue, school_key
+from scripts.rankings_scraper.ft_xlsx_converter import convert_file
+from scripts.rankings_scraper.html_adapter import HtmlTableAdapter
+from scripts.rankings_scraper.main import run
+from scripts.rankings_scraper.models import RankingEntry
+
+SCHOOLS = [
+    {"id": "hec", "name": "HEC Paris"},
+    {"id": "essec", "name": "ESSEC Business School"},
+    {"id": "escp", "name": "ESCP Business School", "aliases": ["ESCP Europe"]},
+    {"id": "dauphine", "name": "Université Paris-Dauphine"},
+    {"id": "lbs", "name": "London Business School"},
+]
+
+
+@pytest.fixture
+def catalogue() -> SchoolCatalogue:
+    return SchoolCatalogue(School(id=s["id"], name=s["name"], aliases=tuple(s.get("aliases", ()))) for s in SCHOOLS)
+
+
+def _matched_id(catalogue: SchoolCatalogue, name: str) -> Optional[str]:
+    found = catalogue.match(name)
+    return found.school_id if found is not None else None
+
+
+def test_school_key_ignores_generic_wording_accents_and_order() -> None:
+    assert school_key("HEC Paris") == school_key("HEC Paris Business School") == school_key("HEC - Paris") == "hec paris"
+    assert school_key("Université Paris-Dauphine") == school_key("Paris Dauphine University")
+    assert school_key("Grenoble Ecole de Management") == school_key("Grenoble Graduate School of Business")
+    assert school_key("University of London") != school_key("London Business School")
+
+
+def test_exact_fuzzy_and_unmatched_names(catalogue: SchoolCatalogue) -> None:
+    assert _matched_id(catalogue, "HEC Paris Business School") == "hec"
+    assert _matched_id(catalogue, "ESCP Europe Business School") == "escp"
+    assert _matched_id(catalogue, "Paris Dauphine University") == "dauphine"
+
+    fuzzy = catalogue.match("HEC Pari")
+    assert fuzzy is not None and fuzzy.school_id == "hec" and 0.8 <= fuzzy.score < 1.0
+    assert catalogue.match("EDHEC Business School") is None
+    assert catalogue.match("University of London") is None
+    assert catalogue.match("HEC Pari") is fuzzy  # cached per key
+
+
+def test_keys_shared_by_two_schools_are_ambiguous() -> None:
+    catalogue = SchoolCatalogue([School("a", "IAE Paris"), School("b", "IAE - Paris")])
+    assert catalogue.match("IAE Paris") is None
+    with pytest.raises(ValueError, match="Duplicate"):
+        SchoolCatalogue([School("a", "X"), School("a", "Y")])
+
+
+def test_large_catalogue_matches_through_the_index() -> None:
+    rng = random.Random(7)
+    syllables = ["ka", "lo", "mi", "ne", "ru", "sa", "ti", "vo", "ze", "bri", "dor", "fal", "gun", "hes", "jor"]
+    names = sorted({"".join(rng.choices(syllables, k=4)).title() + " " + rng.choice(syllables).title() for _ in range(20_000)})
+    schools = [School(id=f"s{index}", name=f"{name} Business School") for index, name in enumerate(names)]
+    schools.append(School(id="hec", name="HEC Paris"))
+    catalogue = SchoolCatalogue(schools)
+    started = time.perf_counter()
+    matched = 0
+    for index in range(0, len(names), len(names) // 200):
+        found = catalogue.match(names[index][:2] + names[index][3:])  # typo: third letter dropped
+        matched += found is not None and found.school_id == f"s{index}"
+        assert found is None or found.school_id == f"s{index}"
+    assert matched > 100
+    assert _matched_id(catalogue, "HEC Paris Business School") == "hec"
+    assert time.perf_counter() - started < 2.0
+
+
+def test_canonicalize_sets_metadata(catalogue: SchoolCatalogue) -> None:
+    entries = [RankingEntry(rank=1, school_name="HEC - Paris"), RankingEntry(rank=2, school_name="Unknown School")]
+    assert catalogue.canonicalize_all(entries) == 1
+    assert entries[0].metadata == {CANONICAL_ID_KEY: "hec"}
+    assert entries[1].metadata == {}
+
+
+def test_catalogue_file_is_validated(tmp_path: Path) -> None:
+    path = tmp_path / "schools.json"
+    path.write_text(json.dumps(SCHOOLS), encoding="utf-8")
+    assert len(SchoolCatalogue.from_file(path)) == len(SCHOOLS)
+    for bad in ({"id": "x"}, [{"id": "x"}], [{"id": "x", "name": "X", "aliases": "Y"}]):
+        path.write_text(json.dumps(bad), encoding="utf-8")
+        with pytest.raises(ValueError):
+            SchoolCatalogue.from_file(path)
+
+
+def test_scraper_and_converter_write_canonical_ids(tmp_path: Path) -> None:
+    catalogue_path = tmp_path / "schools.json"
+    catalogue_path.write_text(json.dumps(SCHOOLS), encoding="utf-8")
+
+    output = tmp_path / "ranking.json"
+    config = tmp_path / "config.json"
+    config.write_text(
+        json.dumps(
+            {
+                "url": "https://example.com/ranking",
+                "master_type": "mim",
+                "year": 2025,
+                "source": "Demo",
+                "category": "MiM",
+                "output_path": str(output),
+            }
+        ),
+        encoding="utf-8",
+    )
+    html = (
+        "<table><tr><th>Rank</th><th>School</th></tr>"
+        "<tr><td>1</td><td>HEC Paris Business School</td></tr><tr><td>2</td><td>EDHEC</td></tr></table>"
+    )
+    argv = ["prog", "--input", str(config), "--schools", str(catalogue_path)]
+    with mock.patch.object(sys, "argv", argv), mock.patch.object(HtmlTableAdapter, "_fetch_html", return_value=html):
+        run()
+    entries = json.loads(output.read_text(encoding="utf-8"))["entries"]
+    assert [entry["metadata"] for entry in entries] == [{CANONICAL_ID_KEY: "hec"}, {}]
+
+    workbook = Workbook()
+    workbook.active.append(["Rank", "School"])
+    workbook.active.append([1, "ESSEC"])
+    xlsx_path = tmp_path / "export-ranking-masters-in-management-2024-test.xlsx"
+    workbook.save(xlsx_path)
+    converted = convert_file(xlsx_path, tmp_path / "out", schools=catalogue_path)
+    assert json.loads(converted.read_text(encoding="utf-8"))["entries"][0]["metadata"] == {CANONICAL_ID_KEY: "essec"}
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import sys
+
+import pytest
+
+from scripts.rankings_scraper.columnar import ColumnarLeaderboard
+from scripts.rankings_scraper.models import LeaderboardPayload, RankingEntry
+
+
+def _payload() -> LeaderboardPayload:
+    return LeaderboardPayload(
+        master_type="mim",
+        source="Financial Times",
+        category="Master in Management",
+        year=2024,
+        source_url="https://rankings.ft.com",
+        region="Europe",
+        entries=[
+            RankingEntry(rank=1, school_name="HEC Paris", country="France", city="Paris", score=97.5),
+            RankingEntry(rank=2, school_name="ESCP", country="France", score=0.0, metadata={"tie": True}),
+            RankingEntry(rank=3, school_name="LBS", program_name="MiM", link="https://london.edu"),
+        ],
+    )
+
+
+def test_to_dict_matches_payload() -> None:
+    payload = _payload()
+    board = ColumnarLeaderboard.from_payload(payload)
+    assert board.to_dict() == payload.to_dict()
+    assert board.to_payload().to_dict() == payload.to_dict()
+    assert [view.to_dict() for view in board] == [entry.to_dict() for entry in payload.entries]
+
+
+def test_row_views_are_lazy_and_complete() -> None:
+    board = ColumnarLeaderboard.from_payload(_payload())
+    assert len(board) == 3
+    assert board[0].score == 97.5
+    assert board[1].score == 0.0
+    assert board[2].score is None
+    assert board[-1].link == "https://london.edu"
+    assert board[1].metadata == {"tie": True}
+    assert board[0].metadata == {}
+    assert [view.rank for view in board[1:]] == [2, 3]
+    assert board[0].to_entry() == _payload().entries[0]
+    assert board[0].country is board[1].country
+    with pytest.raises(IndexError):
+        board[3]
+
+
+def test_metadata_is_copied_on_append() -> None:
+    payload = _payload()
+    board = ColumnarLeaderboard.from_payload(payload)
+    payload.entries[1].metadata["tie"] = False
+    payload.entries[1].metadata["note"] = {"nested": 1}
+    assert board[1].metadata == {"tie": True}
+
+
+def test_validate_matches_payload_rules() -> None:
+    ColumnarLeaderboard.from_payload(_payload()).validate()
+
+    bad_entry = _payload()
+    bad_entry.entries.append(RankingEntry(rank=0, school_name="Nowhere"))
+    with pytest.raises(ValueError, match="rank must be >= 1"):
+        ColumnarLeaderboard.from_payload(bad_entry).validate()
+
+    empty = ColumnarLeaderboard(
+        master_type="mim", source="FT", category="MiM", year=2024, source_url="https://rankings.ft.com"
+    )
+    with pytest.raises(ValueError, match="entries must not be empty"):
+        empty.validate()
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots need Python 3.10")
+def test_ranking_entry_is_slotted() -> None:
+    entry = RankingEntry(rank=1, school_name="HEC Paris")
+    assert not hasattr(entry, "__dict__")
+    assert entry.metadata == {}
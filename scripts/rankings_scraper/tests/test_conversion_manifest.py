@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from scripts.rankings_scraper.conversion_manifest import ConversionManifest
+
+
+def _source(tmp_path: Path, name: str, content: bytes) -> Path:
+    path = tmp_path / name
+    path.write_bytes(content)
+    return path
+
+
+def _output(tmp_path: Path, name: str) -> Path:
+    path = tmp_path / name
+    path.write_text("{}", encoding="utf-8")
+    return path
+
+
+def test_unchanged_source_is_current_across_runs(tmp_path: Path) -> None:
+    source = _source(tmp_path, "mim-2024.xlsx", b"workbook")
+    manifest = ConversionManifest.load(tmp_path, "v1")
+    assert not manifest.is_current(source)
+    manifest.record(source, _output(tmp_path, "mim.json"))
+    manifest.save()
+
+    reloaded = ConversionManifest.load(tmp_path, "v1")
+    assert reloaded.is_current(source)
+
+
+def test_touched_source_with_same_content_stays_current(tmp_path: Path) -> None:
+    source = _source(tmp_path, "mim-2024.xlsx", b"workbook")
+    manifest = ConversionManifest.load(tmp_path, "v1")
+    manifest.record(source, _output(tmp_path, "mim.json"))
+
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+    assert manifest.is_current(source)
+
+    source.write_bytes(b"workbuuk")
+    assert not ConversionManifest.load(tmp_path, "v1").is_current(source)
+    assert not manifest.is_current(source)
+
+
+def test_fingerprint_change_or_missing_output_invalidates(tmp_path: Path) -> None:
+    source = _source(tmp_path, "mim-2024.xlsx", b"workbook")
+    output = _output(tmp_path, "mim.json")
+    manifest = ConversionManifest.load(tmp_path, "v1")
+    manifest.record(source, output)
+    manifest.save()
+
+    assert not ConversionManifest.load(tmp_path, "v2").is_current(source)
+    output.unlink()
+    assert not ConversionManifest.load(tmp_path, "v1").is_current(source)
+
+
+def test_prune_removes_outputs_of_deleted_sources(tmp_path: Path) -> None:
+    kept = _source(tmp_path, "mim-2024.xlsx", b"a")
+    gone = _source(tmp_path, "mba-2025.xlsx", b"b")
+    duplicate = _source(tmp_path, "mim-2024-copy.xlsx", b"c")
+    shared_output = _output(tmp_path, "mim.json")
+    gone_output = _output(tmp_path, "mba.json")
+
+    manifest = ConversionManifest.load(tmp_path, "v1")
+    manifest.record(kept, shared_output)
+    manifest.record(duplicate, shared_output)
+    manifest.record(gone, gone_output)
+    manifest.save()
+
+    gone.unlink()
+    duplicate.unlink()
+    reloaded = ConversionManifest.load(tmp_path, "v2")
+    removed = reloaded.prune([kept])
+
+    assert removed == [gone_output]
+    assert shared_output.exists() and not gone_output.exists()
+    assert len(reloaded.entries) == 1
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+from unittest import mock
+
+import pytest
+from requests import HTTPError
+
+from scripts.rankings_scraper.csv_adapter import SAMPLE_SIZE, CsvAdapter, sniff_delimiter, sniff_encoding
+from scripts.rankings_scraper.http_client import build_session
+from scripts.rankings_scraper.main import run
+from scripts.rankings_scraper.replay import Cassette, ReplayServer
+
+
+def _stream(adapter: CsvAdapter, url: str, **kwargs):
+    return adapter.stream(master_type="mim", year=2025, source="Demo", url=url, category="MiM", **kwargs)
+
+
+@pytest.mark.parametrize(
+    ("encoding", "delimiter", "expected_encoding"),
+    [
+        ("utf-8", ",", "utf-8"),
+        ("utf-8-sig", ";", "utf-8-sig"),
+        ("cp1252", "\t", "cp1252"),
+        ("utf-16", "|", "utf-16"),
+    ],
+)
+def test_encoding_and_delimiter_are_sniffed(tmp_path: Path, encoding: str, delimiter: str, expected_encoding: str) -> None:
+    rows = [["Rang", "École", "Programme", "Pays", "Score"], ["1", "HEC Paris", "MiM", "France", "97,3"], ["2", "ESSEC", "", "France", ""]]
+    buffer = io.StringIO()
+    csv.writer(buffer, delimiter=delimiter).writerows(rows)
+    path = tmp_path / "ranking.csv"
+    path.write_bytes(buffer.getvalue().encode(encoding))
+    assert sniff_encoding(path.read_bytes()) == expected_encoding
+
+    aliases = {"rank": ["rang"], "school_name": ["ecole", "école"], "country": ["pays"]}
+    entries = list(_stream(CsvAdapter(header_aliases=aliases), str(path)).entries)
+    assert [(e.rank, e.school_name, e.program_name, e.country, e.score) for e in entries] == [
+        (1, "HEC Paris", "MiM", "France", 97.3),
+        (2, "ESSEC", None, "France", None),
+    ]
+
+
+def test_sniffing_edge_cases() -> None:
+    assert sniff_encoding("é".encode("utf-8")[:1]) == "utf-8"  # cut multi-byte character
+    assert sniff_encoding("École".encode("cp1252")) == "cp1252"
+    # Decimal commas must not win over the semicolon separating the header.
+    assert sniff_delimiter("Rank;School;Score\n1;HEC;97,3\n2;ESSEC;95,1\n3;ES") == ";"
+    assert sniff_delimiter('Rank,School\n1,"Paris, France"\n') == ","
+    assert sniff_delimiter("Rank\n1\n") == ","
+
+
+def test_cp1252_bytes_past_the_sample_fall_back(tmp_path: Path) -> None:
+    path = tmp_path / "mixed.csv"
+    with path.open("wb") as handle:
+        handle.write(b"Rank,School\n")
+        rank = 0
+        while handle.tell() <= SAMPLE_SIZE:
+            rank += 1
+            handle.write(f"{rank},School {rank}\n".encode("ascii"))
+        handle.write(f"{rank + 1},École Polytechnique\n".encode("cp1252"))
+        handle.write(f"{rank + 2},Université Paris-Saclay\n".encode("utf-8"))
+    assert sniff_encoding(path.read_bytes()[:SAMPLE_SIZE]) == "utf-8"
+
+    entries = list(_stream(CsvAdapter(), str(path)).entries)
+    assert [entry.school_name for entry in entries[-2:]] == ["École Polytechnique", "Université Paris-Saclay"]
+
+
+def test_text_stream_is_closed_when_the_stream_cannot_be_built(tmp_path: Path) -> None:
+    path = tmp_path / "ranking.csv"
+    path.write_text("Rank,School\n1,HEC Paris\n", encoding="utf-8")
+    opened = []
+    original_open = CsvAdapter._open
+
+    def spy_open(adapter: CsvAdapter, url: str):
+        opened.append(original_open(adapter, url))
+        return opened[-1]
+
+    with mock.patch.object(CsvAdapter, "_open", autospec=True, side_effect=spy_open), mock.patch(
+        "scripts.rankings_scraper.csv_adapter.LeaderboardStream", side_effect=TypeError("bad metadata")
+    ):
+        with pytest.raises(TypeError):
+            _stream(CsvAdapter(), str(path))
+    assert opened[0][0].closed
+
+
+def test_quoted_fields_and_missing_columns() -> None:
+    csv_text = 'Rank,School,Notes\n1,"HEC Paris, Jouy-en-Josas","multi\nline"\n,Unranked,\n3,ESCP\n'
+    entries = list(_stream(CsvAdapter(), "https://example.com/r.csv", html_override=csv_text).entries)
+    assert [(e.rank, e.school_name, e.notes) for e in entries] == [(1, "HEC Paris, Jouy-en-Josas", "multi line"), (3, "ESCP", None)]
+
+    with pytest.raises(ValueError, match="rank and school columns"):
+        _stream(CsvAdapter(), "x.csv", html_override="Name,Score\nHEC,1\n")
+    with pytest.raises(ValueError, match="No entries parsed from CSV"):
+        list(_stream(CsvAdapter(), "x.csv", html_override="Rank,School\n,HEC\n").entries)
+
+
+def test_large_export_streams_in_constant_memory(tmp_path: Path) -> None:
+    path = tmp_path / "export.csv"
+    with path.open("w", encoding="utf-8", newline="") as handle:
+        handle.write("Rank,School,Programme,Country,Score,Notes\n")
+        for rank in range(1, 30_001):
+            handle.write(f"{rank},School {rank},Master in Management,France,{rank % 100}.5,{'x' * 40}\n")
+    assert path.stat().st_size > 2_500_000
+
+    tracemalloc.start()
+    try:
+        stream = _stream(CsvAdapter(), path.as_uri())
+        count = sum(1 for _ in stream.entries)
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert count == 30_000
+    assert peak < 1_000_000  # well under the file size: rows are never held together
+
+
+def test_http_body_is_streamed(tmp_path: Path) -> None:
+    cassette = Cassette(tmp_path / "cassette")
+    body = "Rank\tSchool\n1\tHEC Paris\n2\tESSEC\n".encode("utf-8")
+    cassette.add("https://example.com/ranking.tsv", body, headers={"Content-Type": "text/csv"})
+    session = build_session()
+    with ReplayServer(cassette) as server:
+        server.attach(session)
+        entries = list(_stream(CsvAdapter(session=session), "https://example.com/ranking.tsv").entries)
+        assert [entry.school_name for entry in entries] == ["HEC Paris", "ESSEC"]
+        with pytest.raises(HTTPError) as excinfo:
+            _stream(CsvAdapter(session=session), "https://example.com/missing.csv")
+        assert excinfo.value.response is not None and excinfo.value.response.status_code == 404
+
+
+def test_cli_uses_the_csv_adapter(tmp_path: Path) -> None:
+    export = tmp_path / "export.csv"
+    export.write_text("Position;Institution;Score\n1;HEC Paris;97,3\n", encoding="utf-8")
+    output = tmp_path / "ranking.ndjson"
+    config = tmp_path / "config.json"
+    config.write_text(
+        json.dumps(
+            {
+                "url": export.as_uri(),
+                "master_type": "mim",
+                "year": 2025,
+                "source": "Demo",
+                "category": "MiM",
+                "adapter": "csv",
+                "output_path": str(output),
+                "output_format": "ndjson",
+            }
+        ),
+        encoding="utf-8",
+    )
+    with mock.patch.object(sys, "argv", ["prog", "--input", str(config)]):
+        run()
+    lines = output.read_text(encoding="utf-8").splitlines()
+    assert json.loads(lines[1])["school_name"] == "HEC Paris" and json.loads(lines[1])["score"] == 97.3
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+from typing import List, Optional
+from unittest import mock
+
+import pytest
+
+from scripts.rankings_scraper.delta import DeltaTracker, PreviousOutput, delta_path, diff_entries, load_previous
+from scripts.rankings_scraper.html_adapter import HtmlTableAdapter
+from scripts.rankings_scraper.main import run
+from scripts.rankings_scraper.models import LeaderboardPayload, RankingEntry
+from scripts.rankings_scraper.pipeline import LeaderboardStream
+from scripts.rankings_scraper.serialization import dump_payload
+
+
+def _entry(rank: int, school: str, program: Optional[str] = "MiM", score: Optional[float] = None, **fields) -> RankingEntry:
+    return RankingEntry(rank=rank, school_name=school, program_name=program, score=score, **fields)
+
+
+def _payload(entries: List[RankingEntry], source_url: str = "https://example.com/ranking") -> LeaderboardPayload:
+    return LeaderboardPayload(
+        master_type="mim", source="Demo", category="MiM", year=2025, source_url=source_url, entries=entries
+    )
+
+
+@pytest.mark.parametrize("output_format", ["json", "ndjson"])
+def test_unchanged_ranking_gives_an_empty_delta(tmp_path: Path, output_format: str) -> None:
+    output = tmp_path / f"ranking.{output_format}"
+    entries = [_entry(1, "HEC Paris", score=97.3), _entry(2, "ESSEC", program=None), _entry(2, "ESSEC", program=None)]
+    dump_payload(_payload(entries), output, output_format=output_format)
+
+    previous = load_previous(output)
+    assert previous is not None and len(previous.entries) == 3
+    delta = diff_entries(previous, [_entry(1, " hec  paris ", score=97.3), *entries[1:]], _payload(entries))
+    assert delta.is_empty
+    assert delta.summary() == "unchanged"
+
+
+def test_keyed_diff_reports_each_kind_of_change(tmp_path: Path) -> None:
+    output = tmp_path / "ranking.json"
+    dump_payload(
+        _payload([_entry(1, "HEC Paris", score=97.0), _entry(2, "ESSEC", score=95.0), _entry(3, "ESCP", country="France")]),
+        output,
+    )
+    current = [
+        _entry(1, "ESSEC", score=95.0),
+        _entry(2, "HEC Paris", score=96.5),
+        _entry(3, "EDHEC"),
+    ]
+    delta = diff_entries(load_previous(output), current, _payload(current, source_url="https://example.com/v2"))
+
+    assert [row["school_name"] for row in delta.added] == ["EDHEC"]
+    assert delta.removed == [{"school_name": "ESCP", "program_name": "MiM", "rank": 3}]
+    assert delta.moved == [
+        {"school_name": "ESSEC", "program_name": "MiM", "from": 2, "to": 1},
+        {"school_name": "HEC Paris", "program_name": "MiM", "from": 1, "to": 2},
+    ]
+    assert delta.rescored == [{"school_name": "HEC Paris", "program_name": "MiM", "from": 97.0, "to": 96.5}]
+    assert delta.leaderboard == {"source_url": "https://example.com/v2"}
+    assert not delta.is_empty
+
+
+def test_other_field_changes_are_reported_as_updates() -> None:
+    old = [_entry(1, "HEC Paris", link="https://hec.edu")]
+    new = [_entry(1, "HEC Paris", link="https://www.hec.edu")]
+    tracker = DeltaTracker(None)
+    for entry in old:
+        tracker.observe(entry)
+    assert tracker.finish(_payload(old)).baseline
+
+    previous = PreviousOutput(header={}, entries={("hec paris", "mim", 0): old[0].to_dict()})
+    delta = diff_entries(previous, new, _payload(new))
+    assert delta.updated == [{"school_name": "HEC Paris", "program_name": "MiM", "fields": {"link": "https://www.hec.edu"}}]
+
+
+def test_only_a_missing_previous_output_is_a_baseline(tmp_path: Path) -> None:
+    assert load_previous(tmp_path / "absent.json") is None
+    broken = tmp_path / "broken.json"
+    broken.write_text("{\n  \"entries\": [", encoding="utf-8")
+    with pytest.raises(ValueError, match="Cannot read previous output"):
+        load_previous(broken)
+
+
+def test_compact_json_previous_output_is_read(tmp_path: Path) -> None:
+    output = tmp_path / "ranking.json"
+    entries = [_entry(1, "HEC Paris"), _entry(2, "ESSEC")]
+    output.write_text(json.dumps(_payload(entries).to_dict()), encoding="utf-8")
+    delta = diff_entries(load_previous(output), entries, _payload(entries))
+    assert delta.is_empty
+
+
+def test_tracker_observes_a_stream_as_it_is_written(tmp_path: Path) -> None:
+    output = tmp_path / "ranking.ndjson"
+    dump_payload(_payload([_entry(1, "HEC Paris")]), output, output_format="ndjson")
+    tracker = DeltaTracker(load_previous(output))
+    stream = LeaderboardStream(
+        master_type="mim", source="Demo", category="MiM", year=2025, source_url="https://example.com/ranking",
+        entries=iter([_entry(1, "HEC Paris"), _entry(2, "ESSEC")]),
+    )
+    stream.tap(tracker.observe)
+    dump_payload(stream, output, output_format="ndjson")
+    delta = tracker.finish(stream)
+    assert [row["school_name"] for row in delta.added] == ["ESSEC"]
+    assert delta.leaderboard == {}
+    with pytest.raises(ValueError):
+        stream.tap(tracker.observe)
+
+
+def test_cli_writes_delta_next_to_output(tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    output = tmp_path / "ranking.json"
+    config = tmp_path / "config.json"
+    config.write_text(
+        json.dumps(
+            {
+                "url": "https://example.com/ranking",
+                "master_type": "mim",
+                "year": 2025,
+                "source": "Demo",
+                "category": "MiM",
+                "output_path": str(output),
+            }
+        ),
+        encoding="utf-8",
+    )
+    html = "<table><tr><th>Rank</th><th>School</th></tr><tr><td>1</td><td>HEC Paris</td></tr></table>"
+    argv = ["prog", "--input", str(config), "--delta"]
+    with mock.patch.object(sys, "argv", argv), mock.patch.object(HtmlTableAdapter, "_fetch_html", return_value=html):
+        run()
+        first = json.loads(delta_path(output).read_text(encoding="utf-8"))
+        run()
+    second = json.loads(delta_path(output).read_text(encoding="utf-8"))
+
+    assert delta_path(output) == tmp_path / "ranking.delta.json"
+    assert first["baseline"] and len(first["added"]) == 1
+    assert second["unchanged"] and not second["baseline"]
+    assert second["previous_scraped_at"] == first["scraped_at"]
+    assert "Delta (unchanged)" in capsys.readouterr().out
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from scripts.rankings_scraper.fileio import atomic_open, atomic_write
+
+
+def test_atomic_write_replaces_the_file(tmp_path: Path) -> None:
+    target = tmp_path / "page.html"
+    atomic_write(target, b"old")
+    atomic_write(target, b"new")
+    assert target.read_bytes() == b"new"
+    assert [path.name for path in tmp_path.iterdir()] == ["page.html"]
+
+
+def test_failed_write_keeps_the_previous_file(tmp_path: Path) -> None:
+    target = tmp_path / "ranking.json"
+    target.write_text("previous", encoding="utf-8")
+    with pytest.raises(RuntimeError):
+        with atomic_open(target, encoding="utf-8") as handle:
+            handle.write("partial")
+            raise RuntimeError("interrupted")
+    assert target.read_text(encoding="utf-8") == "previous"
+    assert [path.name for path in tmp_path.iterdir()] == ["ranking.json"]
@@ -1,16 +1,20 @@
 from __future__ import annotations
 
+import argparse
 import json
 from pathlib import Path
 from tempfile import NamedTemporaryFile, TemporaryDirectory
 from typing import List
 
+import pytest
 from openpyxl import Workbook
 
 from scripts.rankings_scraper.ft_xlsx_converter import (
     _infer_meta_from_filename,
     _parse_rows,
+    _run,
     convert_file,
+    convert_files,
 )
 from scripts.rankings_scraper.models import RankingEntry
 
@@ -72,3 +76,33 @@ def test_parse_rows_handles_ties() -> None:
     assert entries[0].rank == 1
     assert entries[1].rank == 2
 
+
+
+def test_convert_files_in_parallel_keeps_order_and_collects_errors(tmp_path: Path) -> None:
+    names = [
+        "export-ranking-masters-in-management-2024.xlsx",
+        "export-ranking-unknown-2024.xlsx",
+        "export-ranking-online-mba-2025.xlsx",
+    ]
+    files = []
+    for name in names:
+        path = _make_workbook(["Rank", "School"], [[1, "HEC Paris"], [2, "ESCP"]])
+        files.append(path.rename(tmp_path / name))
+    output_dir = tmp_path / "out"
+    output_dir.mkdir()
+
+    results = list(convert_files(files, output_dir, jobs=2))
+
+    assert [result.source for result in results] == files
+    assert [result.ok for result in results] == [True, False, True]
+    assert "Cannot infer master_type/category" in (results[1].error or "")
+    assert results[0].output_path == output_dir / "ft-master-in-management-2024.json"
+    assert results[2].output_path is not None and results[2].output_path.exists()
+
+
+def test_header_aliases_file_is_validated(tmp_path: Path) -> None:
+    aliases = tmp_path / "aliases.json"
+    aliases.write_text(json.dumps({"school_name": "institution name"}), encoding="utf-8")
+    args = argparse.Namespace(input_dir=str(tmp_path), output_dir=str(tmp_path / "out"), header_aliases=str(aliases))
+    with pytest.raises(SystemExit, match="lists of strings"):
+        _run(args)
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import re
+from typing import Dict, List, Optional
+
+import pytest
+
+from scripts.rankings_scraper import ft_xlsx_converter, html_adapter
+from scripts.rankings_scraper.header_index import HeaderIndex, normalize_header_aliases
+
+HEADERS = [
+    "Rank",
+    "Rank in 2024",
+    "#",
+    "# ",
+    "Position",
+    "School name",
+    "Business School",
+    "University",
+    "Programme name",
+    "Master",
+    "Country",
+    "Location (city)",
+    "City",
+    "Weighted salary (US$)",
+    "Overall score",
+    "Index",
+    "Notes",
+    "Website",
+    "Programme",
+    "Course length",
+    "",
+    "None",
+    "  SCHOOL  ",
+]
+
+
+def _linear_match(aliases: Dict[str, List[str]], header: str) -> Optional[str]:
+    """The original per-call scan the index replaces."""
+
+    def normalize(value: str) -> str:
+        return re.sub(r"\s+", " ", re.sub(r"[^a-z0-9#]+", " ", value.lower())).strip()
+
+    normalized = normalize(header)
+    for canonical, field_aliases in aliases.items():
+        for alias in field_aliases:
+            alias_norm = normalize(alias)
+            if normalized == alias_norm or normalized.startswith(alias_norm):
+                return canonical
+    return None
+
+
+@pytest.mark.parametrize("module", [html_adapter, ft_xlsx_converter])
+def test_index_matches_linear_scan(module) -> None:
+    for header in HEADERS:
+        assert module.HEADER_INDEX.match(header) == _linear_match(module.HEADER_ALIASES, header), header
+
+
+def test_earlier_field_wins_over_longer_alias() -> None:
+    index = HeaderIndex({"rank": ["pos"], "score": ["position score"]})
+    assert index.match("Position score") == "rank"
+
+
+def test_extension_is_consulted_first_without_touching_base() -> None:
+    base = HeaderIndex({"rank": ["rank"], "school_name": ["school"]})
+    extended = base.extend({"school_name": ["ecole"], "notes": ["rank note"]})
+    assert extended.match("Ecole") == "school_name"
+    assert extended.match("Rank note") == "notes"
+    assert extended.match("Rank") == "rank"
+    assert base.match("Ecole") is None
+    assert base.match("Rank note") == "rank"
+
+
+def test_unknown_fields_are_rejected() -> None:
+    with pytest.raises(ValueError):
+        HeaderIndex({"ranking": ["rank"]})
+
+
+def test_user_aliases_are_validated() -> None:
+    assert normalize_header_aliases({"school_name": ["institution name"]}) == {"school_name": ["institution name"]}
+    for bad in (["school"], {"school_name": "institution name"}, {"school_name": [1]}):
+        with pytest.raises(ValueError, match="lists of strings"):
+            normalize_header_aliases(bad)
+    with pytest.raises(ValueError, match="Unknown header fields: ranking"):
+        normalize_header_aliases({"ranking": ["rank"]})
+
+
+def test_build_header_map_skips_unknown_headers() -> None:
+    assert html_adapter.HEADER_INDEX.build_header_map(["Rank", "Logo", "School"]) == {0: "rank", 2: "school_name"}
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import pytest
+
+from scripts.rankings_scraper.canonical import CANONICAL_ID_KEY
+from scripts.rankings_scraper.delta import EntryDelta, delta_path, write_delta
+from scripts.rankings_scraper.history import HistoryStore, main
+from scripts.rankings_scraper.models import LeaderboardPayload, RankingEntry
+from scripts.rankings_scraper.serialization import dump_payload
+
+
+def _payload(year: int, schools: List[str], master_type: str = "mim", scores: Optional[List[float]] = None) -> LeaderboardPayload:
+    entries = [
+        RankingEntry(rank=rank, school_name=name, program_name="MiM", score=scores[rank - 1] if scores else None)
+        for rank, name in enumerate(schools, start=1)
+    ]
+    return LeaderboardPayload(
+        master_type=master_type,
+        source="Financial Times",
+        category="Masters in Management",
+        year=year,
+        source_url="https://example.com/ranking",
+        entries=entries,
+    )
+
+
+def test_trajectory_follows_a_school_across_name_variants(tmp_path: Path) -> None:
+    with HistoryStore(tmp_path / "history.sqlite") as store:
+        store.add(_payload(2023, ["HEC Paris", "ESSEC", "ESCP"], scores=[97.0, 95.0, 94.0]))
+        store.add(_payload(2024, ["ESSEC Business School", "HEC Paris Business School", "ESCP"]))
+        store.add(_payload(2025, ["HEC - Paris", "ESCP", "ESSEC"]))
+        store.add(_payload(2025, ["ESSEC", "HEC Paris"], master_type="msf"))
+
+        points = store.trajectory("HEC Paris", master_type="mim")
+        assert [(point.year, point.rank) for point in points] == [(2023, 1), (2024, 2), (2025, 1)]
+        assert points[0].score == 97.0 and points[1].school_name == "HEC Paris Business School"
+        assert [point.year for point in store.trajectory("hec paris", master_type="mim", years=(2024, 2025))] == [2024, 2025]
+        assert len(store.trajectory("HEC Paris")) == 4
+        assert store.trajectory("EDHEC") == []
+
+
+def test_readding_a_leaderboard_replaces_it(tmp_path: Path) -> None:
+    with HistoryStore(tmp_path / "history.sqlite") as store:
+        store.add(_payload(2025, ["HEC Paris", "ESSEC"]))
+        assert store.add(_payload(2025, ["ESSEC", "HEC Paris", "ESCP"])) == 3
+        assert store.summary() == "1 leaderboards, 3 entries"
+        assert [point.rank for point in store.trajectory("HEC Paris")] == [2]
+
+
+def test_movers_compare_best_rank_year_over_year(tmp_path: Path) -> None:
+    with HistoryStore(tmp_path / "history.sqlite") as store:
+        store.add(_payload(2024, ["HEC Paris", "ESSEC", "ESCP", "EDHEC", "EM Lyon"]))
+        store.add(_payload(2025, ["ESCP", "HEC Paris", "ESSEC", "EM Lyon", "EDHEC", "ESCP"]))
+        risers, fallers = store.movers(master_type="mim", year=2025)
+        assert [(m.school_name, m.previous_rank, m.rank, m.change) for m in risers] == [
+            ("ESCP", 3, 1, 2),
+            ("EM Lyon", 5, 4, 1),
+        ]
+        assert [(m.school_name, m.change) for m in fallers] == [("HEC Paris", -1), ("ESSEC", -1), ("EDHEC", -1)]
+        assert store.movers(master_type="mim", year=2025, limit=1)[0][0].school_name == "ESCP"
+        assert store.movers(master_type="mim", year=2026) == ([], [])
+
+
+def test_canonical_ids_take_precedence_over_names(tmp_path: Path) -> None:
+    first = _payload(2024, ["Grande Ecole X"])
+    second = _payload(2025, ["Completely Renamed School"])
+    for payload in (first, second):
+        payload.entries[0].metadata[CANONICAL_ID_KEY] = "x"
+    with HistoryStore(tmp_path / "history.sqlite") as store:
+        store.add(first)
+        store.add(second)
+        assert [point.year for point in store.trajectory("id:x")] == [2024, 2025]
+
+
+def test_canonicalised_and_plain_imports_share_a_trajectory(tmp_path: Path) -> None:
+    plain = _payload(2024, ["HEC Paris", "ESSEC"])
+    canonicalised = _payload(2025, ["ESSEC", "HEC Paris"])
+    canonicalised.entries[1].metadata[CANONICAL_ID_KEY] = "hec"
+    renamed = _payload(2026, ["HEC Paris Business School", "ESSEC"])
+    renamed.entries[0].metadata[CANONICAL_ID_KEY] = "hec"
+    with HistoryStore(tmp_path / "history.sqlite") as store:
+        for payload in (plain, canonicalised, renamed):
+            store.add(payload)
+        for query in ("HEC Paris", "id:hec", "HEC Paris Business School"):
+            assert [(point.year, point.rank) for point in store.trajectory(query)] == [(2024, 1), (2025, 2), (2026, 1)]
+        assert [point.year for point in store.trajectory("ESSEC")] == [2024, 2025, 2026]
+        _risers, fallers = store.movers(master_type="mim", year=2025)
+        assert [(m.school_name, m.change) for m in fallers] == [("HEC Paris", -1)]
+
+
+def test_older_layouts_are_rebuilt(tmp_path: Path) -> None:
+    database = tmp_path / "history.sqlite"
+    with sqlite3.connect(str(database)) as connection:
+        connection.execute("CREATE TABLE entries (leaderboard_id INTEGER, school TEXT)")
+    with HistoryStore(database) as store:
+        store.add(_payload(2025, ["HEC Paris"]))
+        assert [point.year for point in store.trajectory("HEC Paris")] == [2025]
+
+
+def test_import_dir_reads_json_and_ndjson_and_skips_unchanged(tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    rankings = tmp_path / "rankings"
+    dump_payload(_payload(2024, ["HEC Paris", "ESSEC"]), rankings / "ft-mim-2024.json")
+    dump_payload(_payload(2025, ["ESSEC", "HEC Paris"]), rankings / "ft-mim-2025.ndjson", output_format="ndjson")
+    compact = json.dumps(_payload(2023, ["ESSEC", "HEC Paris"]).to_dict())
+    (rankings / "ft-mim-2023.json").write_text(compact, encoding="utf-8")
+    write_delta(delta_path(rankings / "ft-mim-2025.ndjson"), EntryDelta())
+    (rankings / "notes.json").write_text("[]", encoding="utf-8")
+
+    database = tmp_path / "history.sqlite"
+    with HistoryStore(database) as store:
+        imported, unchanged, errors = store.import_dir(rankings)
+        assert (imported, unchanged) == (3, 0)
+        assert len(errors) == 1 and errors[0].startswith("notes.json")
+        assert store.import_dir(rankings)[:2] == (0, 3)
+        assert store.import_dir(rankings, force=True)[:2] == (3, 0)
+        assert store.summary() == "3 leaderboards, 6 entries"
+
+    main(["--db", str(database), "trajectory", "HEC Paris", "--type", "mim", "--from", "2024"])
+    out = capsys.readouterr().out
+    assert "2024  1" in out and "2025  2" in out
+    main(["--db", str(database), "movers", "--type", "mim", "--year", "2025"])
+    out = capsys.readouterr().out
+    assert "+1" in out and "ESSEC" in out and "-1" in out
+
+
+def test_trajectory_over_many_leaderboards_is_indexed(tmp_path: Path) -> None:
+    schools = [f"School {index}" for index in range(1000)]
+    with HistoryStore(tmp_path / "history.sqlite") as store:
+        for year in range(2000, 2025):
+            for master_type in ("mim", "msf", "mba", "emba"):
+                store.add(_payload(year, schools[year % 7 :] + schools[: year % 7], master_type=master_type))
+        plan = " ".join(
+            str(row[-1])
+            for row in store.connection.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM entries WHERE school_key = ? AND master_type = ?", ("x", "mim")
+            )
+        )
+        assert "entries_school_type_year" in plan
+        started = time.perf_counter()
+        points = store.trajectory("School 3", master_type="mim")
+        assert time.perf_counter() - started < 0.05
+        assert len(points) == 25
@@ -157,6 +157,29 @@ class HtmlTableAdapterTest(unittest.TestCase):
         self.assertEqual(second.rank, 2)
         self.assertEqual(second.link, "https://www.escp.eu")
 
+    def test_per_source_header_aliases(self) -> None:
+        html = SAMPLE_HTML.replace("<th>School</th>", "<th>Ecole</th>")
+        with self.assertRaises(ValueError):
+            self.adapter.scrape(
+                master_type="mim",
+                year=2025,
+                source="Demo Source",
+                url="https://example.com/ranking",
+                category="Master in Management",
+                html_override=html,
+            )
+
+        adapter = HtmlTableAdapter(header_aliases={"school_name": ["ecole"]})
+        payload = adapter.scrape(
+            master_type="mim",
+            year=2025,
+            source="Demo Source",
+            url="https://example.com/ranking",
+            category="Master in Management",
+            html_override=html,
+        )
+        self.assertEqual(payload.entries[0].school_name, "HEC Paris")
+
 
 if __name__ == "__main__":
     unittest.main()
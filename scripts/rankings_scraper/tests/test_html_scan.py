@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from scripts.rankings_scraper.benchmarks.table_parsing import build_page
+from scripts.rankings_scraper.html_adapter import HtmlTableAdapter
+from scripts.rankings_scraper.html_scan import iter_header_tables, locate_header_table
+
+
+def test_skips_tables_without_headers_and_stops_at_match() -> None:
+    html = (
+        "<table><tr><td>layout</td></tr></table>"
+        "<table id='ranking'><tr><th>Rank</th></tr></table>"
+        "<table><tr><th>Other</th></tr></table>"
+    )
+    assert locate_header_table(html) == "<table id='ranking'><tr><th>Rank</th></tr></table>"
+
+
+def test_ignores_tables_in_scripts_and_comments() -> None:
+    html = (
+        "<script>document.write('<table><th>x</th></table>')</script>"
+        "<!-- <table><th>old</th></table> -->"
+        "<TABLE><TR><TH>Rank</TH></TR></TABLE>"
+    )
+    assert locate_header_table(html) == "<TABLE><TR><TH>Rank</TH></TR></TABLE>"
+
+
+def test_nested_header_selects_outer_table() -> None:
+    html = "<table><tr><td><table><tr><th>Rank</th></tr></table></td></tr></table><p>after</p>"
+    assert locate_header_table(html) == html[: html.index("<p>")]
+
+
+def test_thead_is_not_a_header_cell() -> None:
+    assert locate_header_table("<table><thead><tr><td>Rank</td></tr></thead></table>") is None
+
+
+def test_table_only_matches_full_parse() -> None:
+    html = build_page(rows=50, noise_kb=20)
+    full = HtmlTableAdapter(table_only=False)._parse_table(html)
+    partial = HtmlTableAdapter(table_only=True)._parse_table(html)
+    assert partial == full
+    assert len(partial) == 50
+
+
+def test_iter_header_tables_yields_every_ranking_table() -> None:
+    html = (
+        "<table><tr><th>Rank</th></tr><tr><td>1</td></tr></table>"
+        "<table><tr><td>layout</td></tr></table>"
+        "<table><tr><td><table><tr><th>Nested</th></tr></table></td></tr></table>"
+        "<table><tr><th>Rank</th></tr>"
+    )
+    assert list(iter_header_tables(html)) == [
+        "<table><tr><th>Rank</th></tr><tr><td>1</td></tr></table>",
+        "<table><tr><td><table><tr><th>Nested</th></tr></table></td></tr></table>",
+        "<table><tr><th>Rank</th></tr>",
+    ]
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import List
+
+import requests
+
+from scripts.rankings_scraper.html_adapter import HtmlTableAdapter
+from scripts.rankings_scraper.http_cache import HttpCache
+from scripts.rankings_scraper.http_client import build_session
+
+PAGE = "<html><body><p>Classement école</p></body></html>".encode("utf-8")
+ETAG = '"v1"'
+
+
+class _EtagHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    statuses: List[int] = []
+
+    def do_GET(self) -> None:  # noqa: N802
+        if self.headers.get("If-None-Match") == ETAG:
+            self.statuses.append(304)
+            self.send_response(304)
+            self.send_header("ETag", ETAG)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.statuses.append(200)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("ETag", ETAG)
+        self.send_header("Content-Length", str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+    def log_message(self, *_args: object) -> None:
+        pass
+
+
+def _response(body: bytes, etag: str) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response._content = body
+    response.encoding = "utf-8"
+    response.headers["ETag"] = etag
+    return response
+
+
+def test_second_fetch_is_served_from_cache_on_304(tmp_path: Path) -> None:
+    _EtagHandler.statuses.clear()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _EtagHandler)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/ranking"
+    try:
+        with build_session() as session:
+            first = HtmlTableAdapter(session=session, cache=HttpCache(tmp_path))._fetch_html(url)
+            # A fresh cache instance reloads the index from disk.
+            cache = HttpCache(tmp_path)
+            second = HtmlTableAdapter(session=session, cache=cache)._fetch_html(url)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert first == second == PAGE.decode("utf-8")
+    assert _EtagHandler.statuses == [200, 304]
+    assert (cache.hits, cache.misses) == (1, 0)
+
+
+def test_lru_eviction_keeps_recently_used_pages(tmp_path: Path) -> None:
+    cache = HttpCache(tmp_path, max_bytes=25)
+    cache.store("https://a.example/1", _response(b"a" * 10, '"a"'))
+    cache.store("https://a.example/2", _response(b"b" * 10, '"b"'))
+    assert cache.get("https://a.example/1") is not None
+    cache.store("https://a.example/3", _response(b"c" * 10, '"c"'))
+
+    assert cache.get("https://a.example/2") is None
+    assert cache.get("https://a.example/1") is not None
+    assert cache.get("https://a.example/3") is not None
+    assert cache.evictions == 1
+    assert cache.total_bytes == 20
+
+
+def test_responses_without_validators_are_not_cached(tmp_path: Path) -> None:
+    cache = HttpCache(tmp_path)
+    response = _response(b"body", '"x"')
+    del response.headers["ETag"]
+    cache.store("https://a.example/1", response)
+    assert cache.get("https://a.example/1") is None
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List
+from unittest import TestCase
+
+from scripts.rankings_scraper.html_adapter import HtmlTableAdapter
+from scripts.rankings_scraper.http_client import build_session
+
+PAGE = b"<html><body><table><tr><th>Rank</th><th>School</th></tr><tr><td>1</td><td>HEC Paris</td></tr></table></body></html>"
+
+
+class _FlakyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    failures_left: List[int] = [0]
+    ports: List[int] = []
+
+    def do_GET(self) -> None:  # noqa: N802
+        self.ports.append(self.client_address[1])
+        if self.failures_left[0] > 0:
+            self.failures_left[0] -= 1
+            self.send_response(503)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+    def log_message(self, *_args: object) -> None:
+        pass
+
+
+class HttpClientTest(TestCase):
+    def setUp(self) -> None:
+        _FlakyHandler.failures_left[0] = 0
+        _FlakyHandler.ports.clear()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _FlakyHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+        self.thread.start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/ranking"
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_retries_transient_errors(self) -> None:
+        _FlakyHandler.failures_left[0] = 2
+        with build_session(retries=3, backoff_factor=0, backoff_jitter=0) as session:
+            adapter = HtmlTableAdapter(timeout=2.0, session=session)
+            html = adapter._fetch_html(self.url)
+        self.assertIn("HEC Paris", html)
+        self.assertEqual(len(_FlakyHandler.ports), 3)
+
+    def test_gives_up_after_retries(self) -> None:
+        _FlakyHandler.failures_left[0] = 5
+        with build_session(retries=1, backoff_factor=0, backoff_jitter=0) as session:
+            adapter = HtmlTableAdapter(timeout=2.0, session=session)
+            with self.assertRaises(Exception):
+                adapter._fetch_html(self.url)
+        self.assertEqual(len(_FlakyHandler.ports), 2)
+
+    def test_reuses_keep_alive_connection(self) -> None:
+        with build_session() as session:
+            adapter = HtmlTableAdapter(timeout=2.0, session=session)
+            for _ in range(3):
+                adapter._fetch_html(self.url)
+        self.assertEqual(len(set(_FlakyHandler.ports)), 1)
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import scripts.rankings_scraper as package
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+HEAVY_MODULES = {"requests", "urllib3", "bs4", "openpyxl"}
+
+
+def _imported_modules(module: str) -> set:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    names = set()
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            name = line.rsplit("|", 1)[1].strip()
+            names.add(name.split(".", 1)[0])
+    return names
+
+
+@pytest.mark.parametrize(
+    "module",
+    ["scripts.rankings_scraper", "scripts.rankings_scraper.main", "scripts.rankings_scraper.ft_xlsx_converter"],
+)
+def test_cli_modules_defer_heavy_dependencies(module: str) -> None:
+    assert not _imported_modules(module) & HEAVY_MODULES
+
+
+def test_package_exports_resolve_lazily() -> None:
+    from scripts.rankings_scraper.html_adapter import HtmlTableAdapter
+    from scripts.rankings_scraper.models import LeaderboardPayload, RankingEntry
+
+    assert package.HtmlTableAdapter is HtmlTableAdapter
+    assert package.LeaderboardPayload is LeaderboardPayload
+    assert package.RankingEntry is RankingEntry
+    assert set(package.__all__) <= set(dir(package))
+    with pytest.raises(AttributeError):
+        package.NotAnExport  # noqa: B018
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from scripts.rankings_scraper.json_adapter import EmbeddedJsonAdapter, JsonExtraction, resolve_path
+from scripts.rankings_scraper.main import _normalize_config, run
+from scripts.rankings_scraper.pagination import PaginationConfig
+
+NEXT_DATA = {
+    "props": {
+        "pageProps": {
+            "navigation": [{"label": "Home", "href": "/"}],
+            "ranking": {
+                "rows": [
+                    {
+                        "position": "1",
+                        "rankChange": 2,
+                        "school": {"name": "HEC Paris", "country": "France"},
+                        "programme": "MiM",
+                        "scores": {"overall": 97.3},
+                    },
+                    {"position": 2, "school": {"name": "ESSEC"}, "programme": "MiM", "scores": {"overall": "95,1"}},
+                    {"position": None, "school": {"name": "Unranked"}},
+                ]
+            },
+        }
+    }
+}
+
+
+def _page(script: str) -> str:
+    return f"<html><head><title>Ranking</title></head><body><div id='__next'></div>{script}</body></html>"
+
+
+def _next_data_page(data=NEXT_DATA) -> str:
+    return _page(f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(data)}</script>')
+
+
+def _scrape(adapter: EmbeddedJsonAdapter, html: str):
+    return adapter.scrape(
+        master_type="mim", year=2025, source="Demo", url="https://example.com/r", category="MiM", html_override=html
+    )
+
+
+def test_resolve_path() -> None:
+    assert resolve_path(NEXT_DATA, ("props", "pageProps", "ranking", "rows", "1", "school", "name")) == "ESSEC"
+    assert resolve_path(NEXT_DATA, ("props", "pageProps", "ranking", "rows", "-1", "position")) is None
+    assert resolve_path(NEXT_DATA, ("props", "missing", "rows")) is None
+    assert resolve_path([1, 2], ("5",)) is None
+
+
+def test_next_data_with_configured_paths() -> None:
+    adapter = EmbeddedJsonAdapter(
+        extraction=JsonExtraction(
+            script="__NEXT_DATA__",
+            entries="props.pageProps.ranking.rows",
+            fields={"school_name": "school.name", "country": "school.country", "score": "scores.overall"},
+        )
+    )
+    payload = _scrape(adapter, _next_data_page())
+    assert [(e.rank, e.school_name, e.program_name, e.country, e.score) for e in payload.entries] == [
+        (1, "HEC Paris", "MiM", "France", 97.3),
+        (2, "ESSEC", "MiM", None, 95.1),
+    ]
+
+
+def test_rows_are_found_without_an_entries_path() -> None:
+    rows = [{"rank": 1, "rankChange": -3, "schoolName": "HEC Paris", "score": 97}, {"rank": 2, "schoolName": "ESSEC"}]
+    html = _page(
+        "<script>var analytics = {\"id\": 1};</script>"
+        f"<script>window.__INITIAL_STATE__ = {{\"list\": {{\"items\": {json.dumps(rows)}}}}};</script>"
+    )
+    payload = _scrape(EmbeddedJsonAdapter(), html)
+    assert [(e.rank, e.school_name, e.score) for e in payload.entries] == [(1, "HEC Paris", 97.0), (2, "ESSEC", None)]
+
+    only_state = EmbeddedJsonAdapter(extraction=JsonExtraction(script="__OTHER__"))
+    with pytest.raises(ValueError, match="No embedded JSON '__OTHER__'"):
+        _scrape(only_state, html)
+
+
+def test_pages_without_usable_json_raise() -> None:
+    with pytest.raises(ValueError, match="No embedded JSON"):
+        _scrape(EmbeddedJsonAdapter(), "<table><tr><th>Rank</th></tr></table>")
+    with pytest.raises(ValueError, match="at 'props.pageProps.missing'"):
+        _scrape(EmbeddedJsonAdapter(extraction=JsonExtraction(entries="props.pageProps.missing")), _next_data_page())
+    with pytest.raises(ValueError, match="No entries parsed"):
+        html = _next_data_page({"rows": [{"rank": None, "school": "HEC"}]})
+        _scrape(EmbeddedJsonAdapter(), html)
+    with pytest.raises(ValueError, match="Unknown json fields"):
+        JsonExtraction(fields={"ranking": "position"})
+
+
+def test_pagination_reuses_the_html_adapter_walk() -> None:
+    pages = {
+        f"https://example.com/r?page={page}": _next_data_page({"rows": [{"rank": rank, "school": f"School {rank}"} for rank in ranks]})
+        for page, ranks in ((1, (1, 2)), (2, (3, 4)))
+    }
+    adapter = EmbeddedJsonAdapter()
+    with mock.patch.object(EmbeddedJsonAdapter, "_fetch_html", side_effect=lambda url: pages.get(url, "<html></html>")):
+        stream = adapter.stream_pages(
+            master_type="mim",
+            year=2025,
+            source="Demo",
+            category="MiM",
+            pagination=PaginationConfig(url_template="https://example.com/r?page={page}"),
+        )
+        assert [entry.rank for entry in stream.collect().entries] == [1, 2, 3, 4]
+
+
+def test_config_selects_the_adapter(tmp_path: Path) -> None:
+    base = {"url": "https://example.com/r", "master_type": "mim", "year": 2025, "source": "Demo", "category": "MiM"}
+    with pytest.raises(ValueError, match="requires adapter"):
+        _normalize_config({**base, "json_extraction": {"entries": "rows"}})
+    with pytest.raises(ValueError, match="json_extraction.entries"):
+        _normalize_config({**base, "adapter": "json-embedded", "json_extraction": {"entries": ""}})
+    with pytest.raises(ValueError, match="json_extraction: Unknown json fields"):
+        _normalize_config({**base, "adapter": "json-embedded", "json_extraction": {"fields": {"x": "y"}}})
+
+    output = tmp_path / "ranking.json"
+    config = tmp_path / "config.json"
+    config.write_text(
+        json.dumps(
+            {
+                **base,
+                "adapter": "json-embedded",
+                "output_path": str(output),
+                "json_extraction": {
+                    "entries": "props.pageProps.ranking.rows",
+                    "fields": {"school_name": "school.name", "score": "scores.overall"},
+                },
+            }
+        ),
+        encoding="utf-8",
+    )
+    with mock.patch.object(sys, "argv", ["prog", "--input", str(config)]), mock.patch.object(
+        EmbeddedJsonAdapter, "_fetch_html", return_value=_next_data_page()
+    ):
+        run()
+    entries = json.loads(output.read_text(encoding="utf-8"))["entries"]
+    assert [entry["school_name"] for entry in entries] == ["HEC Paris", "ESSEC"]
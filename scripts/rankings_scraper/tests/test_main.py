@@ -3,12 +3,20 @@ from __future__ import annotations
 import json
 import sys
 import tempfile
+import threading
+import time
 from pathlib import Path
 from typing import Dict
 from unittest import TestCase, mock
 
 from scripts.rankings_scraper.html_adapter import HtmlTableAdapter
-from scripts.rankings_scraper.main import _normalize_config, run, scrape_from_config
+from scripts.rankings_scraper.main import (
+    _load_batch_configs,
+    _normalize_config,
+    run,
+    run_batch,
+    scrape_from_config,
+)
 
 
 SAMPLE_HTML: str = """
@@ -78,4 +86,87 @@ class MainCliTest(TestCase):
             self.assertEqual(content["entries"][0]["rank"], 1)
             self.assertEqual(content["entries"][0]["school_name"], "HEC Paris")
 
+    def test_run_batch_caps_per_host_and_reports_failures(self) -> None:
+        lock = threading.Lock()
+        active: Dict[str, int] = {}
+        peak: Dict[str, int] = {}
 
+        def fake_fetch(_adapter: HtmlTableAdapter, url: str) -> str:
+            host = url.split("/")[2]
+            with lock:
+                active[host] = active.get(host, 0) + 1
+                peak[host] = max(peak.get(host, 0), active[host])
+            time.sleep(0.02)
+            with lock:
+                active[host] -= 1
+            if "broken" in url:
+                raise RuntimeError("boom")
+            return SAMPLE_HTML
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            raw = []
+            for idx in range(4):
+                cfg = self._base_config(Path(tmpdir) / f"a-{idx}.json")
+                cfg["url"] = f"https://a.example.com/ranking/{idx}"
+                raw.append(cfg)
+            broken = self._base_config(Path(tmpdir) / "b.json")
+            broken["url"] = "https://b.example.com/broken"
+            raw.append(broken)
+            batch_path = Path(tmpdir) / "batch.json"
+            batch_path.write_text(json.dumps(raw), encoding="utf-8")
+
+            configs = _load_batch_configs(str(batch_path))
+            with mock.patch.object(HtmlTableAdapter, "_fetch_html", autospec=True, side_effect=fake_fetch):
+                results = run_batch(configs, timeout=1.0, workers=4, per_host=2)
+
+            self.assertEqual([r.config.url for r in results], [c.url for c in configs])
+            self.assertEqual(sum(1 for r in results if r.ok), 4)
+            self.assertIn("boom", results[-1].error or "")
+            self.assertLessEqual(peak["a.example.com"], 2)
+            for idx in range(4):
+                self.assertTrue((Path(tmpdir) / f"a-{idx}.json").exists())
+            self.assertFalse((Path(tmpdir) / "b.json").exists())
+
+    def test_run_batch_counts_page_fetches_against_per_host_cap(self) -> None:
+        lock = threading.Lock()
+        active: Dict[str, int] = {}
+        peak: Dict[str, int] = {}
+
+        def fake_fetch(_adapter: HtmlTableAdapter, url: str) -> str:
+            host = url.split("/")[2]
+            with lock:
+                active[host] = active.get(host, 0) + 1
+                peak[host] = max(peak.get(host, 0), active[host])
+            time.sleep(0.02)
+            with lock:
+                active[host] -= 1
+            return SAMPLE_HTML.replace("HEC Paris", f"School {url}")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            raw = []
+            for idx in range(3):
+                cfg = self._base_config(Path(tmpdir) / f"a-{idx}.json")
+                cfg["url"] = f"https://a.example.com/ranking/{idx}"
+                cfg["pagination"] = {"url_template": f"https://a.example.com/ranking/{idx}?page={{page}}", "pages": 3}
+                raw.append(cfg)
+            batch_path = Path(tmpdir) / "batch.json"
+            batch_path.write_text(json.dumps(raw), encoding="utf-8")
+
+            configs = _load_batch_configs(str(batch_path))
+            with mock.patch.object(HtmlTableAdapter, "_fetch_html", autospec=True, side_effect=fake_fetch):
+                results = run_batch(configs, timeout=1.0, workers=4, per_host=2)
+
+            self.assertTrue(all(r.ok for r in results))
+            self.assertEqual([r.config for r in results], configs)
+            self.assertEqual(peak["a.example.com"], 2)
+            for idx in range(3):
+                content = json.loads((Path(tmpdir) / f"a-{idx}.json").read_text(encoding="utf-8"))
+                self.assertEqual(len(content["entries"]), 3)
+
+    def test_load_batch_configs_rejects_duplicate_outputs(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cfg = self._base_config(Path(tmpdir) / "same.json")
+            (Path(tmpdir) / "one.json").write_text(json.dumps(cfg), encoding="utf-8")
+            (Path(tmpdir) / "two.json").write_text(json.dumps(cfg), encoding="utf-8")
+            with self.assertRaises(ValueError):
+                _load_batch_configs(tmpdir)
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from unittest import mock
+
+import pytest
+
+from scripts.rankings_scraper.html_adapter import HtmlTableAdapter
+from scripts.rankings_scraper.main import _normalize_config, stream_from_config
+from scripts.rankings_scraper.models import LeaderboardPayload
+from scripts.rankings_scraper.pagination import PaginationConfig
+
+TEMPLATE = "https://example.com/ranking?page={page}"
+
+
+def _table(rows: List[Tuple[int, str]]) -> str:
+    body = "".join(f"<tr><td>{rank}</td><td>{school}</td></tr>" for rank, school in rows)
+    return f"<table><tr><th>Rank</th><th>School</th></tr>{body}</table>"
+
+
+def _page(rows: List[Tuple[int, str]]) -> str:
+    return f"<html><body>{_table(rows)}</body></html>"
+
+
+class NotFound(RuntimeError):
+    """Stands in for requests.HTTPError: the adapter only looks at `response.status_code`."""
+
+    def __init__(self) -> None:
+        super().__init__("404 Client Error")
+        self.response = mock.Mock(status_code=404)
+
+
+class FakeSite:
+    def __init__(self, pages: Dict[int, str], delay: float = 0.0) -> None:
+        self.pages = pages
+        self.delay = delay
+        self.fetched: List[int] = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def fetch(self, _adapter: HtmlTableAdapter, url: str) -> str:
+        page = int(url.rsplit("=", 1)[1])
+        with self._lock:
+            self.fetched.append(page)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        if page not in self.pages:
+            raise NotFound()
+        return self.pages[page]
+
+
+def _stream(site: FakeSite, pagination: PaginationConfig, adapter: Optional[HtmlTableAdapter] = None) -> LeaderboardPayload:
+    adapter = adapter or HtmlTableAdapter()
+    with mock.patch.object(HtmlTableAdapter, "_fetch_html", autospec=True, side_effect=site.fetch):
+        return adapter.stream_pages(
+            master_type="mim", year=2025, source="Demo", category="MiM", pagination=pagination
+        ).collect()
+
+
+def test_pages_are_merged_in_rank_order_without_boundary_duplicates() -> None:
+    site = FakeSite(
+        {
+            1: _page([(1, "A"), (2, "B"), (3, "C")]),
+            2: _page([(3, "C"), (4, "D"), (5, "E")]),  # page 1's last row repeated
+            3: _page([(6, "F")]),
+            4: _page([]),
+        },
+        delay=0.01,
+    )
+    payload = _stream(site, PaginationConfig(url_template=TEMPLATE, workers=3))
+    assert [(entry.rank, entry.school_name) for entry in payload.entries] == [
+        (1, "A"), (2, "B"), (3, "C"), (4, "D"), (5, "E"), (6, "F"),
+    ]
+    assert payload.source_url == "https://example.com/ranking?page=1"
+    assert site.peak > 1
+    assert max(site.fetched) <= 4 + 2  # at most workers - 1 fetches past the empty page
+
+
+def test_stops_at_404_and_at_pages_repeating_the_last_one() -> None:
+    missing = FakeSite({1: _page([(1, "A")]), 2: _page([(2, "B")])})
+    assert [entry.rank for entry in _stream(missing, PaginationConfig(url_template=TEMPLATE)).entries] == [1, 2]
+
+    clamped = FakeSite({page: _page([(1, "A"), (2, "B")]) for page in range(1, 60)})
+    payload = _stream(clamped, PaginationConfig(url_template=TEMPLATE, workers=2))
+    assert [entry.rank for entry in payload.entries] == [1, 2]
+    assert max(clamped.fetched) <= 3
+
+
+def test_fixed_page_count_requires_every_page() -> None:
+    site = FakeSite({1: _page([(1, "A")]), 2: _page([(2, "B")])})
+    payload = _stream(site, PaginationConfig(url_template=TEMPLATE, pages=2))
+    assert [entry.rank for entry in payload.entries] == [1, 2]
+    assert sorted(site.fetched) == [1, 2]
+
+    with pytest.raises(RuntimeError, match="404"):
+        _stream(FakeSite({1: _page([(1, "A")])}), PaginationConfig(url_template=TEMPLATE, pages=2))
+
+
+def test_first_page_without_ranking_raises() -> None:
+    site = FakeSite({1: "<html><body><p>Nothing</p></body></html>"})
+    with pytest.raises(ValueError):
+        _stream(site, PaginationConfig(url_template=TEMPLATE))
+
+
+def test_all_tables_merges_every_ranking_table_on_a_page() -> None:
+    html = (
+        "<html><body>"
+        + _table([(3, "C"), (4, "D")])
+        + "<table><tr><th>Partner</th></tr><tr><td>Sponsor</td></tr></table>"
+        + _table([(1, "A"), (2, "B"), (3, "C")])
+        + "</body></html>"
+    )
+    payload = HtmlTableAdapter(all_tables=True).scrape(
+        master_type="mim", year=2025, source="Demo", url="https://example.com", category="MiM", html_override=html
+    )
+    assert [(entry.rank, entry.school_name) for entry in payload.entries] == [(1, "A"), (2, "B"), (3, "C"), (4, "D")]
+
+
+def test_config_pagination_is_validated_and_used() -> None:
+    base = {"url": "https://example.com/ranking", "master_type": "mim", "year": 2025, "source": "Demo", "category": "MiM"}
+    config = _normalize_config({**base, "pagination": {"url_template": TEMPLATE, "pages": 2}, "all_tables": True})
+    assert config.pagination == PaginationConfig(url_template=TEMPLATE, pages=2)
+    assert config.all_tables
+
+    site = FakeSite({1: _page([(1, "A")]), 2: _page([(2, "B")])})
+    with mock.patch.object(HtmlTableAdapter, "_fetch_html", autospec=True, side_effect=site.fetch):
+        payload = stream_from_config(config, timeout=1.0).collect()
+    assert [entry.rank for entry in payload.entries] == [1, 2]
+    assert payload.source_url == "https://example.com/ranking"
+
+    for bad in ({"url_template": "https://example.com/ranking"}, {"url_template": TEMPLATE, "workers": 0}, "page"):
+        with pytest.raises(ValueError, match="pagination"):
+            _normalize_config({**base, "pagination": bad})
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import importlib.util
+from typing import List
+
+import pytest
+
+from scripts.rankings_scraper.benchmarks.table_parsing import build_page
+from scripts.rankings_scraper.html_adapter import HtmlTableAdapter
+from scripts.rankings_scraper.models import RankingEntry
+from scripts.rankings_scraper.parser_backends import ParserBackend, get_parser_backend
+from scripts.rankings_scraper.tests.test_html_adapter import (
+    EMPTY_BODY_HTML,
+    MISSING_TABLE_HTML,
+    SAMPLE_HTML,
+    TIE_AND_LINK_HTML,
+)
+from scripts.rankings_scraper.tests.test_main import SAMPLE_HTML as MAIN_SAMPLE_HTML
+
+MESSY_HTML = """
+<table class="layout"><tr><td>menu</td><td>search</td></tr></table>
+<table>
+  <tr><th>Rank</th><th>Business School</th><th>Location</th><th>Website</th><th>Index</th><th>Remarks</th></tr>
+  <tr>
+    <td> 1<sup>=</sup> </td>
+    <td><a href="/hec"> HEC <b>Paris</b> </a><!-- promoted --><script>track("hec")</script></td>
+    <td>Jouy-en-Josas,&nbsp;France</td>
+    <td><a>no href</a></td>
+    <td>97,3</td>
+    <td>
+      Strong   alumni
+      network
+    </td>
+  </tr>
+  <tr><th>Sub-header</th><td>ignored</td></tr>
+  <tr><td>2</td><td><a href="">Empty href</a></td><td>UK</td><td><a href="https://lbs.edu">LBS site</a></td><td>n/a</td><td></td></tr>
+  <tr><td>n/a</td><td>Unranked</td></tr>
+</table>
+"""
+
+# Markup where tree semantics matter: unclosed cells nest, stray end tags
+# close everything opened after their start tag, hidden text is skipped.
+QUIRKS_HTML = """
+<div><table>
+  <tr><th>#</th><th>School</th><th>City</th></tr>
+  <tr><td>1<td><a href="/a">A <script>var x = "<b>";</script>school</a></td><td>Paris<br>Nord</td></tr>
+  <tr><td>2</td><td>B&amp;C <!-- note --> 5<6</td><td><table><tr><th>x</th><td>Lyon</td></tr></table></td></tr>
+  <tr><td>3</td><td><a href="/d"><b>D</b>&nbsp;school</a><a href="/e">E</a></td><td>Lille</div></td></tr>
+</table>
+"""
+
+FIXTURES = [SAMPLE_HTML, TIE_AND_LINK_HTML, MAIN_SAMPLE_HTML, MESSY_HTML, build_page(rows=30, noise_kb=10)]
+ERROR_FIXTURES = [MISSING_TABLE_HTML, EMPTY_BODY_HTML, "", "<table><tr><td>1</td><td>x</td></tr></table>"]
+
+BACKENDS = [
+    "html.parser",
+    "bs4",
+    pytest.param("lxml", marks=pytest.mark.skipif(importlib.util.find_spec("lxml") is None, reason="lxml not installed")),
+    pytest.param(
+        "selectolax",
+        marks=pytest.mark.skipif(importlib.util.find_spec("selectolax") is None, reason="selectolax not installed"),
+    ),
+]
+
+
+def _entries(parser: str, html: str, table_only: bool = True) -> List[RankingEntry]:
+    return HtmlTableAdapter(parser=parser, table_only=table_only)._parse_table(html)
+
+
+@pytest.mark.parametrize("parser", BACKENDS)
+@pytest.mark.parametrize("fixture", range(len(FIXTURES)))
+@pytest.mark.parametrize("table_only", [True, False])
+def test_backends_match_reference(parser: str, fixture: int, table_only: bool) -> None:
+    html = FIXTURES[fixture]
+    assert _entries(parser, html, table_only) == _entries("bs4", html, table_only=False)
+
+
+@pytest.mark.parametrize("parser", BACKENDS)
+@pytest.mark.parametrize("fixture", range(len(ERROR_FIXTURES)))
+def test_backends_raise_same_errors(parser: str, fixture: int) -> None:
+    html = ERROR_FIXTURES[fixture]
+    with pytest.raises(ValueError) as expected:
+        _entries("bs4", html)
+    with pytest.raises(ValueError) as actual:
+        _entries(parser, html)
+    assert str(actual.value) == str(expected.value)
+
+
+def test_messy_fixture_values() -> None:
+    first, second = _entries("html.parser", MESSY_HTML)
+    assert (first.rank, first.school_name, first.country, first.link) == (1, "HEC Paris", "Jouy-en-Josas, France", "no href")
+    assert (first.score, first.notes) == (97.3, "Strong alumni network")
+    assert (second.school_name, second.link, second.score, second.notes) == ("Empty href", "https://lbs.edu", None, None)
+
+
+def test_unknown_backend_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        get_parser_backend("html5lib")
+
+
+def test_backend_without_parse_table_cannot_be_created() -> None:
+    class Incomplete(ParserBackend):
+        name = "incomplete"
+
+    with pytest.raises(TypeError, match="parse_table"):
+        Incomplete()
+
+
+def test_auto_picks_an_installed_backend() -> None:
+    assert get_parser_backend("auto").name in {"html.parser", "lxml", "selectolax"}
+
+
+@pytest.mark.parametrize("table_only", [True, False])
+def test_html_parser_engine_follows_soup_tree_on_quirks(table_only: bool) -> None:
+    # lxml and selectolax repair malformed tables per the HTML5 spec instead.
+    entries = _entries("html.parser", QUIRKS_HTML, table_only)
+    assert entries == _entries("bs4", QUIRKS_HTML, table_only=False)
+    assert [entry.school_name for entry in entries] == ["A school", "B&C 5<6", "D school"]
+    assert entries[2].link == "/d"
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Iterator, List
+
+import pytest
+
+from scripts.rankings_scraper.html_adapter import HtmlTableAdapter
+from scripts.rankings_scraper.models import RankingEntry
+from scripts.rankings_scraper.pipeline import LeaderboardStream
+from scripts.rankings_scraper.serialization import dump_payload
+
+TABLE_HTML = """
+<table>
+  <tr><th>Rank</th><th>School</th></tr>
+  <tr><td>1</td><td>HEC Paris</td></tr>
+  <tr><td>2</td><td>ESCP</td></tr>
+  <tr><td>3</td><td>LBS</td></tr>
+</table>
+"""
+
+
+def _stream(entries) -> LeaderboardStream:
+    return LeaderboardStream(
+        master_type="mim",
+        source="Financial Times",
+        category="Master in Management",
+        year=2024,
+        source_url="https://rankings.ft.com",
+        entries=entries,
+    )
+
+
+def test_entries_are_validated_as_they_are_pulled() -> None:
+    pulled: List[int] = []
+
+    def entries() -> Iterator[RankingEntry]:
+        for rank in (1, 2, 0, 4):
+            pulled.append(rank)
+            yield RankingEntry(rank=rank, school_name=f"School {rank}")
+
+    stream = _stream(entries())
+    iterator = stream.entries
+    assert next(iterator).rank == 1
+    assert pulled == [1]
+    next(iterator)
+    with pytest.raises(ValueError, match="rank must be >= 1"):
+        next(iterator)
+    assert stream.count == 2
+
+
+def test_summary_check_and_single_use() -> None:
+    with pytest.raises(ValueError, match="entries must not be empty"):
+        _stream([]).collect()
+
+    stream = _stream([RankingEntry(rank=1, school_name="HEC Paris")])
+    assert len(stream.collect().entries) == 1
+    with pytest.raises(ValueError, match="only be consumed once"):
+        stream.collect()
+
+    with pytest.raises(ValueError, match="year must be >= 1900"):
+        LeaderboardStream("mim", "FT", "MiM", 1800, "https://rankings.ft.com", entries=[])
+
+
+def test_failed_stream_leaves_no_output(tmp_path: Path) -> None:
+    entries = [RankingEntry(rank=1, school_name="HEC Paris"), RankingEntry(rank=2, school_name="  ")]
+    output = tmp_path / "ranking.json"
+    with pytest.raises(ValueError, match="school_name is required"):
+        dump_payload(_stream(entries), output)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_html_adapter_stream_matches_scrape(tmp_path: Path) -> None:
+    adapter = HtmlTableAdapter()
+    kwargs = dict(
+        master_type="mim",
+        year=2024,
+        source="Test",
+        url="https://example.com",
+        category="MiM",
+        html_override=TABLE_HTML,
+    )
+    stream = adapter.stream(**kwargs)
+    output = dump_payload(stream, tmp_path / "ranking.json")
+    assert stream.count == 3
+
+    data = json.loads(output.read_text(encoding="utf-8"))
+    payload = adapter.scrape(**kwargs)
+    data["scraped_at"] = payload.scraped_at
+    assert data == payload.to_dict()
+
+
+def test_html_adapter_checks_headers_before_streaming() -> None:
+    with pytest.raises(ValueError, match="rank and school"):
+        HtmlTableAdapter().stream(
+            master_type="mim",
+            year=2024,
+            source="Test",
+            url="https://example.com",
+            category="MiM",
+            html_override="<table><tr><th>Name</th><th>City</th></tr></table>",
+        )
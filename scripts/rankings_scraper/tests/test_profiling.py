@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import io
+import time
+from pathlib import Path
+
+import pytest
+
+from scripts.rankings_scraper import profiling
+from scripts.rankings_scraper.html_adapter import HtmlTableAdapter
+from scripts.rankings_scraper.profiling import StageStats, profiled, span, timed_iter
+from scripts.rankings_scraper.serialization import dump_payload
+
+TABLE_HTML = "<table><tr><th>Rank</th><th>School</th></tr>" + "".join(
+    f"<tr><td>{rank}</td><td>School {rank}</td></tr>" for rank in range(1, 51)
+) + "</table>"
+
+
+def test_disabled_profiling_is_a_no_op() -> None:
+    assert profiling.active() is None
+    items = [1, 2, 3]
+    assert type(timed_iter("rows", items)) is type(iter(items))
+    with span("fetch") as stage:
+        stage.add(rows=1, bytes=10)
+    assert profiling.active() is None
+
+
+def test_nested_stages_record_self_time() -> None:
+    def slow_items():
+        for item in range(3):
+            time.sleep(0.01)
+            yield item
+
+    out = io.StringIO()
+    with profiled(True, out=out) as profiler:
+        assert profiler is not None
+        with span("write") as stage:
+            stage.add(bytes=5)
+            assert list(timed_iter("rows", slow_items())) == [0, 1, 2]
+
+    assert profiling.active() is None
+    rows, write = profiler.stages["rows"], profiler.stages["write"]
+    assert rows.rows == 3 and rows.wall >= 0.03
+    assert write.bytes == 5 and write.wall < rows.wall
+    assert "rows" in out.getvalue() and "instrumented" in out.getvalue()
+
+
+def test_scrape_pipeline_stages(tmp_path: Path) -> None:
+    out = io.StringIO()
+    pstats_path = tmp_path / "scrape.pstats"
+    with profiled(True, str(pstats_path), out=out) as profiler:
+        stream = HtmlTableAdapter().stream(
+            master_type="mim",
+            year=2024,
+            source="Test",
+            url="https://example.com",
+            category="MiM",
+            html_override=TABLE_HTML,
+        )
+        dump_payload(stream, tmp_path / "ranking.json")
+
+    assert profiler is not None
+    assert {"locate_table", "parse_table", "header_map", "build_entries", "validate", "serialize", "write"} <= set(
+        profiler.stages
+    )
+    assert profiler.stages["build_entries"].rows == 50
+    assert profiler.stages["parse_table"].rows == 50
+    assert pstats_path.exists()
+
+
+def test_merge_adds_worker_stages() -> None:
+    profiler = profiling.StageProfiler()
+    profiler.merge({"build_entries": StageStats(calls=2, wall=0.5, cpu=0.4, rows=10)})
+    profiler.merge({"build_entries": StageStats(calls=1, wall=0.25, cpu=0.2, rows=5)})
+    merged = profiler.stages["build_entries"]
+    assert (merged.calls, merged.rows) == (3, 15)
+    assert merged.wall == pytest.approx(0.75) and merged.cpu == pytest.approx(0.6)
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import json
+import sys
+import time
+from pathlib import Path
+from unittest import mock
+
+import pytest
+import requests
+
+from scripts.rankings_scraper.html_adapter import HtmlTableAdapter
+from scripts.rankings_scraper.http_cache import HttpCache
+from scripts.rankings_scraper.http_client import build_session
+from scripts.rankings_scraper.main import run
+from scripts.rankings_scraper.replay import Cassette, ReplayServer
+
+URL = "https://rankings.example.com/mim?year=2025&page=1"
+PAGE = (
+    "<html><body><table><tr><th>Rank</th><th>School</th></tr>"
+    "<tr><td>1</td><td>HEC Paris</td></tr><tr><td>2</td><td>ESSEC</td></tr></table></body></html>"
+)
+
+
+@pytest.fixture
+def cassette(tmp_path: Path) -> Cassette:
+    cassette = Cassette(tmp_path / "cassette")
+    cassette.add(URL, PAGE.encode("utf-8"), headers={"Content-Type": "text/html; charset=utf-8", "ETag": '"v1"'})
+    return cassette
+
+
+def test_scraper_runs_unchanged_against_replay(cassette: Cassette) -> None:
+    with ReplayServer(cassette) as server, build_session(retries=0) as session:
+        server.attach(session)
+        payload = HtmlTableAdapter(session=session).scrape(
+            master_type="mim", year=2025, source="Demo", url=URL, category="MiM"
+        )
+        missing = session.get("https://rankings.example.com/unknown", timeout=5)
+    assert [entry.school_name for entry in payload.entries] == ["HEC Paris", "ESSEC"]
+    assert payload.source_url == URL
+    assert missing.status_code == 404
+    assert server.stats.requests == 2
+    assert server.stats.misses == 1
+
+
+def test_record_saves_every_response(cassette: Cassette, tmp_path: Path) -> None:
+    recorded = Cassette(tmp_path / "recorded")
+    with ReplayServer(cassette) as origin, build_session(retries=0) as session:
+        recorded.attach(session)
+        local_url = origin.url_for(URL)
+        session.get(local_url, timeout=5)
+        session.get(origin.url_for("https://rankings.example.com/gone"), timeout=5)
+    saved = recorded.get(local_url)
+    assert saved is not None
+    assert saved.status == 200
+    assert saved.body == PAGE.encode("utf-8")
+    assert saved.headers["ETag"] == '"v1"'
+    assert recorded.recorded == 2
+    assert len(recorded.urls()) == 2
+
+
+def test_conditional_requests_are_answered_with_304(cassette: Cassette, tmp_path: Path) -> None:
+    cache = HttpCache(tmp_path / "cache")
+    with ReplayServer(cassette) as server, build_session(retries=0) as session:
+        server.attach(session)
+        adapter = HtmlTableAdapter(session=session, cache=cache)
+        first = adapter.scrape(master_type="mim", year=2025, source="Demo", url=URL, category="MiM")
+        second = adapter.scrape(master_type="mim", year=2025, source="Demo", url=URL, category="MiM")
+    assert first.entries == second.entries
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert server.stats.not_modified == 1
+
+
+def test_injected_errors_are_seeded_and_retried(cassette: Cassette) -> None:
+    with ReplayServer(cassette, error_rate=1.0) as server, build_session(retries=0) as session:
+        server.attach(session)
+        with pytest.raises(requests.HTTPError, match="503"):
+            HtmlTableAdapter(session=session).scrape(master_type="mim", year=2025, source="Demo", url=URL, category="MiM")
+
+    def injected(seed: int) -> int:
+        with ReplayServer(cassette, error_rate=0.5, seed=seed) as server:
+            with build_session(retries=10, backoff_factor=0.0, backoff_jitter=0.0) as session:
+                server.attach(session)
+                for _ in range(5):
+                    assert session.get(URL, timeout=5).status_code == 200
+        return server.stats.injected_errors
+
+    assert injected(seed=1) == injected(seed=1) > 0
+
+
+def test_latency_and_bandwidth_slow_responses_down(tmp_path: Path) -> None:
+    cassette = Cassette(tmp_path / "cassette")
+    cassette.add(URL, b"x" * 20_000)
+    with ReplayServer(cassette, latency=0.05, bandwidth=100_000) as server, build_session(retries=0) as session:
+        server.attach(session)
+        started = time.perf_counter()
+        response = session.get(URL, timeout=5)
+        elapsed = time.perf_counter() - started
+    assert len(response.content) == 20_000
+    assert elapsed >= 0.05 + 0.15
+    assert server.stats.bytes_sent == 20_000
+
+
+def test_invalid_replay_settings_raise(cassette: Cassette) -> None:
+    with pytest.raises(ValueError):
+        ReplayServer(cassette, error_rate=1.5)
+    with pytest.raises(ValueError):
+        ReplayServer(cassette, bandwidth=0)
+
+
+def test_cli_replays_a_cassette(cassette: Cassette, tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    output = tmp_path / "out.json"
+    config = tmp_path / "config.json"
+    config.write_text(
+        json.dumps(
+            {"url": URL, "master_type": "mim", "year": 2025, "source": "Demo", "category": "MiM", "output_path": str(output)}
+        ),
+        encoding="utf-8",
+    )
+    argv = ["prog", "--input", str(config), "--replay", str(cassette.directory), "--replay-latency", "0.01"]
+    with mock.patch.object(sys, "argv", argv):
+        run()
+    assert len(json.loads(output.read_text(encoding="utf-8"))["entries"]) == 2
+    assert "Replay: 1 requests" in capsys.readouterr().out
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from scripts.rankings_scraper import serialization
+from scripts.rankings_scraper.columnar import ColumnarLeaderboard
+from scripts.rankings_scraper.models import (
+    LeaderboardPayload,
+    NdjsonLeaderboardReader,
+    RankingEntry,
+    leaderboard_format,
+    load_leaderboard,
+)
+from scripts.rankings_scraper.pipeline import LeaderboardStream
+from scripts.rankings_scraper.serialization import dump_payload, iter_payload_ndjson, payload_json
+
+ACCELERATED = [False] + ([True] if serialization.orjson is not None else [])
+
+TRICKY_SCORES = [None, 97.5, 0.0, -0.0, 1e16, 1e-5, 123456789.125, float("nan"), float("inf"), 3]
+TRICKY_TEXT = ["HEC Paris", "École   \"quoted\" \\ back", "tab\tand\x1fcontrol", "lone \ud800 surrogate", "中文"]
+
+
+def _payload(count: int) -> LeaderboardPayload:
+    entries = []
+    for index in range(count):
+        entries.append(
+            RankingEntry(
+                rank=index + 1,
+                school_name=TRICKY_TEXT[index % len(TRICKY_TEXT)],
+                program_name=None if index % 3 else "MiM",
+                country="France",
+                score=TRICKY_SCORES[index % len(TRICKY_SCORES)],
+                link=f"https://example.com/{index}",
+                metadata={"canonical": {"id": index, "aliases": ["a", "é"]}} if index % 7 == 0 else {},
+            )
+        )
+    return LeaderboardPayload(
+        master_type="mim",
+        source="Financial Times",
+        category="Master in Management",
+        year=2024,
+        source_url="https://rankings.ft.com",
+        region="Europe",
+        entries=entries,
+        scraped_at="2024-01-01T00:00:00Z",
+    )
+
+
+@pytest.mark.parametrize("accelerated", ACCELERATED)
+def test_output_matches_json_dumps(accelerated: bool) -> None:
+    payload = _payload(1200)
+    expected = json.dumps(payload.to_dict(), indent=2, ensure_ascii=False)
+    assert payload_json(payload, accelerated=accelerated) == expected
+
+
+@pytest.mark.parametrize("accelerated", ACCELERATED)
+def test_columnar_and_empty_payloads(accelerated: bool) -> None:
+    board = ColumnarLeaderboard.from_payload(_payload(50))
+    assert payload_json(board, accelerated=accelerated) == json.dumps(board.to_dict(), indent=2, ensure_ascii=False)
+
+    empty = _payload(0)
+    assert payload_json(empty, accelerated=accelerated) == json.dumps(empty.to_dict(), indent=2, ensure_ascii=False)
+
+
+def test_dump_payload_writes_atomically(tmp_path: Path) -> None:
+    payload = _payload(20)
+    # Lone surrogates cannot be written as UTF-8 at all; keep them out of the file test.
+    payload.entries = [entry for entry in payload.entries if "\ud800" not in entry.school_name]
+    output = dump_payload(payload, tmp_path / "nested" / "ranking.json")
+    assert output.read_text(encoding="utf-8") == json.dumps(payload.to_dict(), indent=2, ensure_ascii=False)
+    assert [path.name for path in output.parent.iterdir()] == ["ranking.json"]
+
+
+def test_to_dict_copies_metadata() -> None:
+    entry = RankingEntry(rank=1, school_name="HEC Paris", metadata={"nested": {"id": 1}})
+    data = entry.to_dict()
+    data["metadata"]["nested"]["id"] = 2
+    assert entry.metadata == {"nested": {"id": 1}}
+
+
+@pytest.mark.parametrize("accelerated", ACCELERATED)
+def test_ndjson_round_trip(tmp_path: Path, accelerated: bool) -> None:
+    payload = _payload(60)
+    payload.entries = [entry for entry in payload.entries if "\ud800" not in entry.school_name]
+    output = dump_payload(payload, tmp_path / "ranking.ndjson", output_format="ndjson", accelerated=accelerated)
+
+    lines = output.read_text(encoding="utf-8").rstrip("\n").split("\n")
+    assert len(lines) == len(payload.entries) + 1
+    assert json.loads(lines[1]) == payload.entries[0].to_dict()
+
+    with NdjsonLeaderboardReader(output) as reader:
+        assert (reader.source, reader.year, reader.region) == ("Financial Times", 2024, "Europe")
+        restored = reader.read_payload()
+    assert json.dumps(restored.to_dict(), sort_keys=True) == json.dumps(payload.to_dict(), sort_keys=True)
+
+
+def test_ndjson_consumes_entries_lazily() -> None:
+    produced = []
+
+    def entries():
+        for index in range(3):
+            produced.append(index)
+            yield RankingEntry(rank=index + 1, school_name=f"School {index}")
+
+    stream = LeaderboardStream(
+        master_type="mim", source="Financial Times", category="Master in Management", year=2024,
+        source_url="https://rankings.ft.com", entries=entries(),
+    )
+    lines = iter_payload_ndjson(stream)
+    next(lines)
+    assert produced == []
+    next(lines)
+    assert produced == [0]
+
+
+def test_ndjson_reader_rejects_json_documents(tmp_path: Path) -> None:
+    output = tmp_path / "ranking.json"
+    output.write_text(json.dumps(_payload(2).to_dict()), encoding="utf-8")
+    with pytest.raises(ValueError, match="Not an NDJSON leaderboard"):
+        NdjsonLeaderboardReader(output)
+
+
+@pytest.mark.parametrize("layout", ["pretty", "compact", "ndjson"])
+def test_load_leaderboard_detects_the_format(tmp_path: Path, layout: str) -> None:
+    payload = _payload(3)
+    output = tmp_path / "ranking.out"
+    if layout == "compact":
+        output.write_text(json.dumps(payload.to_dict()), encoding="utf-8")
+    else:
+        dump_payload(payload, output, output_format="json" if layout == "pretty" else "ndjson")
+    assert leaderboard_format(output) == ("ndjson" if layout == "ndjson" else "json")
+    loaded = load_leaderboard(output)
+    assert loaded.to_dict() == payload.to_dict()
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import zipfile
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+
+from openpyxl import Workbook, load_workbook
+
+from scripts.rankings_scraper.ft_xlsx_converter import HEADER_INDEX, _parse_rows, _read_entries
+from scripts.rankings_scraper.xlsx_stream import XlsxSheetReader
+
+Row = List[Tuple[Any, Optional[str]]]
+
+
+def _trim(row: Row) -> Row:
+    while row and row[-1] == (None, None):
+        row = row[:-1]
+    return row
+
+
+def _openpyxl_rows(path: Path) -> List[Row]:
+    ws = load_workbook(path, data_only=True).active
+    rows = []
+    for row in ws.iter_rows():
+        cells = [(cell.value, cell.hyperlink.target if cell.hyperlink else None) for cell in row]
+        if _trim(cells):
+            rows.append(_trim(cells))
+    return rows
+
+
+def _stream_rows(path: Path) -> List[Row]:
+    with XlsxSheetReader(path) as reader:
+        rows = [_trim([(cell.value, cell.link) for cell in cells]) for _number, cells in reader.iter_rows()]
+    return [row for row in rows if row]
+
+
+def _ranking_workbook(path: Path) -> Path:
+    wb = Workbook()
+    notes = wb.active
+    notes.title = "Notes"
+    notes.append(["Exported from rankings.ft.com"])
+    ws = wb.create_sheet("Ranking")
+    ws.append([])
+    ws.append([None, "Rank", "School name", "Programme name", "Country", "Weighted salary", "Score", "Website"])
+    ws.append([None, 1, "HEC Paris", "MiM", "France", 123456, 97.5, "hec.edu"])
+    ws.append([None, "2 (tie)", "ESCP", None, "France", 100000.0, "95,1", None])
+    ws.append([])
+    ws.append([None, 3, "  LBS  ", "MiM\nLondon", "UK", None, 90, "lbs.edu"])
+    ws.append([None, True, "=1+1", "Formula", None, None, None, None])
+    ws["C3"].hyperlink = "https://www.hec.edu/mim?x=1&y=2"
+    ws["H3"].hyperlink = "https://www.hec.edu"
+    ws["C4"].hyperlink = "https://escp.eu"
+    ws.cell(row=6, column=8).hyperlink = "https://london.edu"
+    wb.active = 1
+    wb.save(path)
+    return path
+
+
+def test_stream_matches_openpyxl_values_and_links(tmp_path: Path) -> None:
+    path = _ranking_workbook(tmp_path / "ranking.xlsx")
+    assert _stream_rows(path) == _openpyxl_rows(path)
+
+
+def test_read_entries_matches_openpyxl_path(tmp_path: Path) -> None:
+    path = _ranking_workbook(tmp_path / "ranking.xlsx")
+    ws = load_workbook(path, data_only=True).active
+    header_map = HEADER_INDEX.build_header_map([str(cell.value) for cell in ws[2]])
+    expected = _parse_rows(ws, 2, header_map)
+
+    entries = _read_entries(path, HEADER_INDEX)
+    assert entries == expected
+    assert [(entry.rank, entry.link) for entry in entries] == [
+        (1, "https://www.hec.edu"),
+        (2, None),
+        (3, "https://london.edu"),
+    ]
+
+
+SHEET_XML = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<x:worksheet xmlns:x="http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+  xmlns:rel="http://schemas.openxmlformats.org/officeDocument/2006/relationships">
+<x:sheetData>
+<x:row r="1"><x:c r="A1" t="inlineStr"><x:is><x:t>Rank</x:t></x:is></x:c><x:c t="s"><x:v>0</x:v></x:c></x:row>
+<x:row><x:c><x:v>1</x:v></x:c><x:c t="s"><x:v>1</x:v></x:c><x:c t="b"><x:v>0</x:v></x:c></x:row>
+<x:row r="4"><x:c r="B4" t="str"><x:v>Cached</x:v></x:c><x:c r="D4" t="e"><x:v>#N/A</x:v></x:c><x:c r="E4"><x:v>1.5E2</x:v></x:c></x:row>
+</x:sheetData>
+<x:hyperlinks><x:hyperlink ref="A2:B2" rel:id="rId7"/><x:hyperlink ref="D4" location="Sheet1!A1"/></x:hyperlinks>
+</x:worksheet>"""
+
+SHARED_STRINGS_XML = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" count="2" uniqueCount="2">
+<si><t>School</t></si>
+<si><r><t>HEC </t></r><r><rPr><b/></rPr><t xml:space="preserve">Paris</t></r><rPh sb="0" eb="1"><t>ignored</t></rPh></si>
+</sst>"""
+
+
+def _handmade_workbook(path: Path) -> Path:
+    rel_ns = "http://schemas.openxmlformats.org/package/2006/relationships"
+    doc_rel = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+    files = {
+        "[Content_Types].xml": (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/worksheets/sheet1.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            '<Override PartName="/xl/sharedStrings.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+            "</Types>"
+        ),
+        "_rels/.rels": (
+            f'<Relationships xmlns="{rel_ns}">'
+            f'<Relationship Id="rId1" Type="{doc_rel}/officeDocument" Target="xl/workbook.xml"/></Relationships>'
+        ),
+        "xl/workbook.xml": (
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            f'xmlns:r="{doc_rel}"><sheets><sheet name="Sheet1" sheetId="1" r:id="rId1"/></sheets></workbook>'
+        ),
+        "xl/_rels/workbook.xml.rels": (
+            f'<Relationships xmlns="{rel_ns}">'
+            f'<Relationship Id="rId1" Type="{doc_rel}/worksheet" Target="/xl/worksheets/sheet1.xml"/>'
+            f'<Relationship Id="rId2" Type="{doc_rel}/sharedStrings" Target="sharedStrings.xml"/></Relationships>'
+        ),
+        "xl/worksheets/sheet1.xml": SHEET_XML,
+        "xl/worksheets/_rels/sheet1.xml.rels": (
+            f'<Relationships xmlns="{rel_ns}">'
+            f'<Relationship Id="rId7" Type="{doc_rel}/hyperlink" Target="https://example.com/a?b=1&amp;c=2" '
+            'TargetMode="External"/></Relationships>'
+        ),
+        "xl/sharedStrings.xml": SHARED_STRINGS_XML,
+    }
+    with zipfile.ZipFile(path, "w") as archive:
+        for name, content in files.items():
+            archive.writestr(name, content)
+    return path
+
+
+def test_handmade_xml_variants(tmp_path: Path) -> None:
+    path = _handmade_workbook(tmp_path / "handmade.xlsx")
+    rows = _stream_rows(path)
+    assert rows == [
+        [("Rank", None), ("School", None)],
+        [(1, "https://example.com/a?b=1&c=2"), ("HEC Paris", "https://example.com/a?b=1&c=2"), (False, None)],
+        [(None, None), ("Cached", None), (None, None), ("#N/A", None), (150.0, None)],
+    ]
+    assert rows == _openpyxl_rows(path)
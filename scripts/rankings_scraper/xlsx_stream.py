@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import posixpath
+import re
+import zipfile
+from html import unescape
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+from xml.etree import ElementTree
+
+_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_OFFICE_DOCUMENT_REL = "/officeDocument"
+_SHARED_STRINGS_REL = "/sharedStrings"
+_CELL_REF_RE = re.compile(r"([A-Z]+)(\d+)")
+_HYPERLINKS_START_RE = re.compile(rb"<(?:\w+:)?hyperlinks[\s>]")
+_HYPERLINKS_END_RE = re.compile(rb"</(?:\w+:)?hyperlinks\s*>")
+_HYPERLINK_RE = re.compile(r"<(?:\w+:)?hyperlink\b([^>]*?)/?>")
+_ATTRIBUTE_RE = re.compile(r'([\w:]+)\s*=\s*"([^"]*)"')
+_SCAN_CHUNK = 1 << 20
+
+
+class SheetCell(NamedTuple):
+    """Cell value (as openpyxl would return it with data_only=True) and hyperlink target."""
+
+    value: Any
+    link: Optional[str] = None
+
+
+EMPTY_CELL = SheetCell(None, None)
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _column_index(letters: str) -> int:
+    index = 0
+    for char in letters:
+        index = index * 26 + ord(char) - 64
+    return index
+
+
+def _cast_number(value: str) -> Any:
+    if "." in value or "E" in value or "e" in value:
+        return float(value)
+    return int(value)
+
+
+def _resolve(base_dir: str, target: str) -> str:
+    if target.startswith("/"):
+        return target.lstrip("/")
+    return posixpath.normpath(posixpath.join(base_dir, target))
+
+
+def _rels_path(part: str) -> str:
+    directory, name = posixpath.split(part)
+    return posixpath.join(directory, "_rels", f"{name}.rels")
+
+
+class XlsxSheetReader:
+    """
+    Streams the active worksheet of an .xlsx file row by row.
+
+    Unlike openpyxl's read-only mode, hyperlink targets are kept: the
+    `<hyperlinks>` block (stored after the cell data) is located with a byte
+    scan of the decompressed sheet and resolved through the sheet's
+    relationships part before rows are parsed. Rows are then produced lazily
+    from a single iterparse pass whose elements are cleared as they are
+    consumed, so memory stays flat regardless of row count. Only the shared
+    strings table and hyperlink map are held in memory.
+
+    Values follow openpyxl's `data_only=True` casting (ints, floats, bools,
+    strings, cached formula results), except that date-formatted numbers
+    stay numeric since number formats are not read.
+
+    Example:
+        with XlsxSheetReader(Path("ft-mim-2024.xlsx")) as reader:
+            for row_number, cells in reader.iter_rows():
+                print(row_number, [cell.value for cell in cells])
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._zip = zipfile.ZipFile(self.path)
+        try:
+            self._workbook_part = self._find_workbook_part()
+            self.sheet_part = self._find_active_sheet_part()
+            self._shared_strings = self._load_shared_strings()
+        except Exception:
+            self._zip.close()
+            raise
+
+    def __enter__(self) -> "XlsxSheetReader":
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._zip.close()
+
+    def _read_rels(self, part: str) -> Dict[str, Tuple[str, str]]:
+        """Map relationship ids of `part` to (type, target)."""
+        path = _rels_path(part)
+        try:
+            data = self._zip.read(path)
+        except KeyError:
+            return {}
+        rels: Dict[str, Tuple[str, str]] = {}
+        for rel in ElementTree.fromstring(data).iter(f"{{{_REL_NS}}}Relationship"):
+            rels[rel.get("Id", "")] = (rel.get("Type", ""), rel.get("Target", ""))
+        return rels
+
+    def _find_workbook_part(self) -> str:
+        for rel_type, target in self._read_rels("").values():
+            if rel_type.endswith(_OFFICE_DOCUMENT_REL):
+                return _resolve("", target)
+        return "xl/workbook.xml"
+
+    def _find_active_sheet_part(self) -> str:
+        try:
+            root = ElementTree.fromstring(self._zip.read(self._workbook_part))
+        except KeyError as exc:
+            raise ValueError(f"Not a valid workbook: {self.path.name}") from exc
+        active_tab = 0
+        sheet_ids: List[str] = []
+        for elem in root.iter():
+            name = _local(elem.tag)
+            if name == "workbookView" and not sheet_ids:
+                active_tab = int(elem.get("activeTab", 0))
+            elif name == "sheet":
+                rel_id = next((value for key, value in elem.attrib.items() if _local(key) == "id"), "")
+                sheet_ids.append(rel_id)
+        if not sheet_ids:
+            raise ValueError(f"Workbook has no sheets: {self.path.name}")
+
+        rels = self._read_rels(self._workbook_part)
+        rel_id = sheet_ids[active_tab] if active_tab < len(sheet_ids) else sheet_ids[0]
+        rel_type, target = rels.get(rel_id, ("", ""))
+        if not rel_type.endswith("/worksheet"):
+            raise ValueError(f"Active sheet is not a worksheet: {self.path.name}")
+        return _resolve(posixpath.dirname(self._workbook_part), target)
+
+    @staticmethod
+    def _rich_text(element: ElementTree.Element) -> str:
+        # Plain <t> plus <r><t> runs; phonetic <rPh> runs are ignored like openpyxl does.
+        snippets: List[str] = []
+        for child in element:
+            name = _local(child.tag)
+            if name == "t":
+                snippets.append(child.text or "")
+            elif name == "r":
+                for grandchild in child:
+                    if _local(grandchild.tag) == "t":
+                        snippets.append(grandchild.text or "")
+        return "".join(snippets)
+
+    def _load_shared_strings(self) -> List[str]:
+        part = None
+        for rel_type, target in self._read_rels(self._workbook_part).values():
+            if rel_type.endswith(_SHARED_STRINGS_REL):
+                part = _resolve(posixpath.dirname(self._workbook_part), target)
+        if part is None or part not in self._zip.namelist():
+            return []
+        strings: List[str] = []
+        with self._zip.open(part) as handle:
+            for _event, elem in ElementTree.iterparse(handle):
+                if _local(elem.tag) == "si":
+                    strings.append(self._rich_text(elem).replace("x005F_", ""))
+                    elem.clear()
+        return strings
+
+    def _scan_hyperlinks(self) -> bytes:
+        """Return the raw `<hyperlinks>` block of the sheet without parsing cell data."""
+        buffer = b""
+        started = False
+        with self._zip.open(self.sheet_part) as handle:
+            while True:
+                chunk = handle.read(_SCAN_CHUNK)
+                if not chunk:
+                    return b""
+                buffer += chunk
+                if not started:
+                    start = _HYPERLINKS_START_RE.search(buffer)
+                    if start is None:
+                        # Keep enough bytes to match a start tag split across chunks.
+                        buffer = buffer[-64:]
+                        continue
+                    buffer = buffer[start.start() :]
+                    started = True
+                end = _HYPERLINKS_END_RE.search(buffer)
+                if end is not None:
+                    return buffer[: end.end()]
+
+    def _load_hyperlinks(self) -> Tuple[Dict[Tuple[int, int], str], List[Tuple[int, int, int, int, str]]]:
+        rels = self._read_rels(self.sheet_part)
+        single: Dict[Tuple[int, int], str] = {}
+        ranges: List[Tuple[int, int, int, int, str]] = []
+        block = self._scan_hyperlinks().decode("utf-8", errors="replace")
+        for match in _HYPERLINK_RE.finditer(block):
+            attrs = {_local_attr(key): unescape(value) for key, value in _ATTRIBUTE_RE.findall(match.group(1))}
+            rel_id = attrs.get("id")
+            if not rel_id or rel_id not in rels:
+                continue
+            target = rels[rel_id][1]
+            refs = [_CELL_REF_RE.fullmatch(ref) for ref in attrs.get("ref", "").upper().replace("$", "").split(":")]
+            if not refs or any(ref is None for ref in refs):
+                continue
+            coords = [(int(ref.group(2)), _column_index(ref.group(1))) for ref in refs if ref is not None]
+            if len(coords) == 1:
+                single.setdefault(coords[0], target)
+            else:
+                (row_a, col_a), (row_b, col_b) = coords[0], coords[-1]
+                ranges.append((min(row_a, row_b), max(row_a, row_b), min(col_a, col_b), max(col_a, col_b), target))
+        return single, ranges
+
+    def iter_rows(self) -> Iterator[Tuple[int, List[SheetCell]]]:
+        """
+        Yield `(row_number, cells)` for every row that has cells in the sheet XML.
+
+        `cells` starts at column A; gaps are filled with `EMPTY_CELL`.
+        """
+        single_links, range_links = self._load_hyperlinks()
+        strings = self._shared_strings
+        row_number = 0
+        with self._zip.open(self.sheet_part) as handle:
+            context = ElementTree.iterparse(handle, events=("start", "end"))
+            _event, root = next(context)
+            ns = root.tag[: root.tag.index("}") + 1] if root.tag.startswith("{") else ""
+            row_tag, cell_tag, value_tag, inline_tag = f"{ns}row", f"{ns}c", f"{ns}v", f"{ns}is"
+            sheet_data_tag = f"{ns}sheetData"
+            sheet_data: Optional[ElementTree.Element] = None
+            cells: List[SheetCell] = []
+            column = 0
+
+            for event, elem in context:
+                tag = elem.tag
+                if event == "start":
+                    if tag == row_tag:
+                        row_attr = elem.get("r")
+                        row_number = int(row_attr) if row_attr else row_number + 1
+                        cells = []
+                        column = 0
+                    elif tag == sheet_data_tag:
+                        sheet_data = elem
+                    continue
+
+                if tag == cell_tag:
+                    ref = elem.get("r")
+                    if ref:
+                        match = _CELL_REF_RE.match(ref)
+                        column = _column_index(match.group(1)) if match else column + 1
+                    else:
+                        column += 1
+                    data_type = elem.get("t", "n")
+                    value: Any = None
+                    if data_type == "inlineStr":
+                        inline = elem.find(inline_tag)
+                        if inline is not None:
+                            value = self._rich_text(inline)
+                    else:
+                        raw = elem.findtext(value_tag) or None
+                        if raw is not None:
+                            if data_type == "n":
+                                value = _cast_number(raw)
+                            elif data_type == "s":
+                                value = strings[int(raw)]
+                            elif data_type == "b":
+                                value = bool(int(raw))
+                            else:
+                                value = raw
+
+                    link = single_links.get((row_number, column))
+                    if link is None and range_links:
+                        for top, bottom, left, right, target in range_links:
+                            if top <= row_number <= bottom and left <= column <= right:
+                                link = target
+                                break
+                    if len(cells) < column - 1:
+                        cells.extend([EMPTY_CELL] * (column - 1 - len(cells)))
+                    if len(cells) >= column:
+                        cells[column - 1] = SheetCell(value, link)
+                    else:
+                        cells.append(SheetCell(value, link))
+                elif tag == row_tag:
+                    yield row_number, cells
+                    elem.clear()
+                    if sheet_data is not None:
+                        sheet_data.remove(elem)
+
+
+def _local_attr(name: str) -> str:
+    return name.rsplit(":", 1)[-1]